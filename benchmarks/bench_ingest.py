@@ -0,0 +1,94 @@
+"""Benchmark server-side /notify ingest throughput.
+
+Drives the ASGI app directly (no sockets, no HTTP client) so the numbers
+reflect the server's own per-request cost on one core. Delivery is
+replaced with a no-op so speech does not factor in.
+
+    python benchmarks/bench_ingest.py --requests 20000 --auth
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from llm_notify_mcp.config import Config
+from llm_notify_mcp.server import NotificationServer
+
+
+async def _noop_delivery(request):
+    """Stand-in for speech so only ingest is measured."""
+
+
+def _make_scope(token: str | None) -> dict:
+    headers = [(b"content-type", b"application/json")]
+    if token:
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/notify",
+        "raw_path": b"/notify",
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 8765),
+    }
+
+
+async def run(requests: int, auth: bool) -> float:
+    """Send `requests` notifications through the app and return requests/sec."""
+    token = "bench-token" if auth else None
+    config = Config(
+        visual_notifications=False,
+        rate_limit=requests * 2,
+        auth_token=token,
+        digest_enabled=False,
+        latency_slo=0
+    )
+    server = NotificationServer(config)
+    server.dispatcher.deliver = _noop_delivery
+    app = server.app
+    body = json.dumps(
+        {"message": "Build finished", "priority": "normal", "source": "bench"}
+    ).encode()
+    scope = _make_scope(token)
+    statuses = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    # Warm up routing and validator caches
+    for _ in range(200):
+        await app(dict(scope), receive, send)
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    elapsed = time.perf_counter() - started
+
+    await server.dispatcher.stop()
+    assert all(code == 200 for code in statuses), set(statuses)
+    return requests / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--auth", action="store_true", help="Require a bearer token")
+    args = parser.parse_args()
+
+    rate = asyncio.run(run(args.requests, args.auth))
+    print(f"{rate:,.0f} requests/sec ({args.requests} requests, auth={args.auth})")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,22 +9,42 @@ from pathlib import Path
 import uvicorn
 
 from .config import Config
+from .daemon import DAEMON_LOG, AlreadyRunningError, ServerFiles, daemonize
+from .handoff import CONTROL_SOCKET, Handoff, take_over
 from .server import NotificationServer
 
 
-def setup_logging(config: Config):
+class ReadyServer(uvicorn.Server):
+    """Uvicorn server that announces readiness once it accepts connections.
+
+    The app's lifespan startup runs before uvicorn listens on its socket, so
+    the ready file is only written after uvicorn's own startup completes.
+    """
+
+    def __init__(self, config: uvicorn.Config, files: ServerFiles):
+        super().__init__(config)
+        self.files = files
+
+    async def startup(self, sockets=None):
+        await super().startup(sockets=sockets)
+        if self.started:
+            self.files.mark_ready(self.config.host, self.config.port)
+
+
+def setup_logging(config: Config, console: bool = True):
     """Set up logging configuration."""
 
     log_dir = config.get_log_dir()
     log_dir.mkdir(parents=True, exist_ok=True)
 
+    handlers: list[logging.Handler] = [logging.FileHandler(log_dir / "mcp-notify.log")]
+    if console:
+        handlers.append(logging.StreamHandler(sys.stdout))
+
     logging.basicConfig(
         level=getattr(logging, config.log_level.upper()),
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.FileHandler(log_dir / "mcp-notify.log"),
-            logging.StreamHandler(sys.stdout)
-        ]
+        handlers=handlers
     )
 
 
@@ -39,36 +59,106 @@ async def run_demo(config: Config):
         sys.exit(1)
 
 
-def start_server(config: Config, daemon: bool = False):
+def run_replay(config: Config, trace: Path, speed: float, virtual: bool):
+    """Replay a recorded trace against simulated backends and print a report."""
+    from .replay import format_report, replay_trace
+
+    try:
+        report = replay_trace(trace, config, speed=speed, virtual=virtual)
+    except (OSError, ValueError) as e:
+        print(f"Replay failed: {e}")
+        sys.exit(1)
+    print(format_report(report))
+
+
+def run_load(config: Config, args: argparse.Namespace):
+    """Run simulated agents against the running server and print a summary."""
+    from .loadgen import format_summary, run_load_test
+
+    print(
+        f"Load test: {args.agents} agents x {args.rate}/s ({args.arrival}) "
+        f"over {args.transport} for {args.duration:.0f}s "
+        f"against {config.host}:{config.port}"
+    )
+    summary = asyncio.run(run_load_test(
+        host=config.host,
+        port=config.port,
+        auth_token=config.auth_token,
+        transport=args.transport,
+        agents=args.agents,
+        rate=args.rate,
+        duration=args.duration,
+        arrival=args.arrival,
+        burst_size=args.burst_size
+    ))
+    print(format_summary(summary))
+
+
+def start_server(config: Config, daemon: bool = False, restart: bool = False):
     """Start the notification server."""
 
-    setup_logging(config)
+    files = ServerFiles(config.get_run_dir())
+    running = files.running_pid()
+    if running is not None and not restart:
+        print(f"Server already running (pid {running})")
+        sys.exit(1)
+
+    if daemon:
+        # Returns only in the detached server process
+        daemonize(
+            files, config.get_log_dir() / DAEMON_LOG, config.daemon_start_timeout
+        )
+
+    # A daemon's stdout already goes to the log directory
+    setup_logging(config, console=not daemon)
     logger = logging.getLogger(__name__)
 
     logger.info(f"Starting LLM Notify MCP server on {config.host}:{config.port}")
 
     server = NotificationServer(config)
 
-    uvicorn_config = {
-        "app": server.app,
-        "host": config.host,
-        "port": config.port,
-        "log_config": None,  # Use our own logging
-        "access_log": False,
-    }
-
-    if daemon:
-        # For daemon mode, we might want to add additional setup
-        # like pid file management, but for now just run normally
-        pass
+    uvicorn_server = ReadyServer(uvicorn.Config(
+        app=server.app,
+        host=config.host,
+        port=config.port,
+        log_config=None,  # Use our own logging
+        access_log=False,
+    ), files)
+
+    control_path = config.get_run_dir() / CONTROL_SOCKET
+    listener = predecessor = None
+    if restart:
+        try:
+            listener, predecessor = take_over(control_path)
+            logger.info("Took over the listening socket from the running server")
+        except OSError as e:
+            logger.warning(f"No running server to take over ({e}), starting fresh")
+
+    # Only a successful takeover may replace a live server's pid file
+    try:
+        files.claim(takeover=listener is not None)
+    except AlreadyRunningError as e:
+        logger.error(str(e))
+        sys.exit(1)
 
     try:
-        uvicorn.run(**uvicorn_config)
+        if listener is None:
+            listener = uvicorn_server.config.bind_socket()
+
+        def request_exit():
+            uvicorn_server.should_exit = True
+
+        server.handoff = Handoff(control_path, listener, request_exit, predecessor)
+        server.server_files = files
+        uvicorn_server.run(sockets=[listener])
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
     except Exception as e:
         logger.error(f"Server failed: {e}")
         sys.exit(1)
+    finally:
+        # Normally released at shutdown; this covers failing before startup
+        files.release()
 
 
 def create_config_template():
@@ -119,7 +209,13 @@ def main():
     parser.add_argument(
         "--start-daemon",
         action="store_true",
-        help="Start server in daemon mode"
+        help="Start server in the background (logs go to ~/.llm-notify-mcp/logs)"
+    )
+
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Take over from a running server without dropping connections"
     )
 
     parser.add_argument(
@@ -134,6 +230,87 @@ def main():
         help="Run as MCP server for Claude Desktop integration"
     )
 
+    parser.add_argument(
+        "--forward",
+        action="store_true",
+        help="With --mcp-server, forward notifications to the shared daemon"
+    )
+
+    parser.add_argument(
+        "--record-trace",
+        type=Path,
+        metavar="PATH",
+        help="Record incoming notifications to a trace file for --replay"
+    )
+
+    parser.add_argument(
+        "--replay",
+        type=Path,
+        metavar="TRACE",
+        help="Replay a recorded trace against simulated backends and report"
+    )
+
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Replay speed multiplier (default: 1.0)"
+    )
+
+    parser.add_argument(
+        "--virtual-clock",
+        action="store_true",
+        help="Replay on a virtual clock, as fast as possible"
+    )
+
+    parser.add_argument(
+        "--load-test",
+        action="store_true",
+        help="Send load from simulated agents to a running server"
+    )
+
+    parser.add_argument(
+        "--agents",
+        type=int,
+        default=10,
+        help="Number of simulated agents for --load-test (default: 10)"
+    )
+
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=1.0,
+        help="Notifications per second per agent for --load-test (default: 1.0)"
+    )
+
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=30.0,
+        help="Seconds to run --load-test for (default: 30)"
+    )
+
+    parser.add_argument(
+        "--arrival",
+        choices=["constant", "poisson", "burst"],
+        default="poisson",
+        help="Arrival pattern for --load-test (default: poisson)"
+    )
+
+    parser.add_argument(
+        "--burst-size",
+        type=int,
+        default=10,
+        help="Notifications per burst with --arrival burst (default: 10)"
+    )
+
+    parser.add_argument(
+        "--transport",
+        choices=["http", "websocket"],
+        default="http",
+        help="Client transport for --load-test (default: http)"
+    )
+
     parser.add_argument(
         "--version",
         action="version",
@@ -150,7 +327,7 @@ def main():
     # Handle MCP server mode
     if args.mcp_server:
         from .mcp_server import main as mcp_main
-        mcp_main()
+        mcp_main(forward=True if args.forward else None)
         return
 
     # Load configuration
@@ -161,6 +338,22 @@ def main():
         config.host = args.host
     if args.port != 8765:
         config.port = args.port
+    if args.record_trace:
+        config.trace_file = str(args.record_trace)
+
+    # Handle load testing
+    if args.load_test:
+        if args.agents < 1 or args.rate <= 0 or args.burst_size < 1:
+            parser.error("--agents, --rate and --burst-size must be positive")
+        run_load(config, args)
+        return
+
+    # Handle trace replay
+    if args.replay:
+        if args.speed <= 0:
+            parser.error("--speed must be positive")
+        run_replay(config, args.replay, args.speed, args.virtual_clock)
+        return
 
     # Handle demo mode
     if args.demo:
@@ -168,7 +361,7 @@ def main():
         return
 
     # Start server
-    start_server(config, daemon=args.start_daemon)
+    start_server(config, daemon=args.start_daemon, restart=args.restart)
 
 
 if __name__ == "__main__":
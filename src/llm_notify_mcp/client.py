@@ -1,34 +1,216 @@
 """LLM Notify MCP client SDK."""
 
 import asyncio
+import itertools
 import logging
+from pathlib import Path
 
 import aiohttp
 
+from .daemon import READY, STARTING, ServerFiles
+from .tracking import TERMINAL_STATES
+
 logger = logging.getLogger(__name__)
 
 
 class NotificationClient:
-    """Client for sending notifications to LLM Notify MCP server."""
+    """Client for sending notifications to LLM Notify MCP server.
+
+    With `run_dir`, the local server's run directory, its ready file is
+    checked before the first request: a stopped server fails fast and one
+    that is still starting is waited for, instead of a connect timeout.
+    """
 
     def __init__(
         self,
         host: str = "127.0.0.1",
         port: int = 8765,
         auth_token: str | None = None,
-        timeout: float = 5.0
+        timeout: float = 5.0,
+        transport: str = "http",
+        reconnect_attempts: int = 3,
+        run_dir: Path | None = None
     ):
+        if transport not in ("http", "websocket"):
+            raise ValueError("Transport must be 'http' or 'websocket'")
+
         self.base_url = f"http://{host}:{port}"
+        self.ws_url = f"ws://{host}:{port}/ws"
         self.auth_token = auth_token
         self.timeout = timeout
+        self.transport = transport
+        self.reconnect_attempts = reconnect_attempts
+        self.port = port
+        self.server_files = ServerFiles(run_dir) if run_dir is not None else None
+        self._seen_ready = False
+        self._session: aiohttp.ClientSession | None = None
+        self._session_loop: asyncio.AbstractEventLoop | None = None
+        self._reset_ws()
+
+    def _reset_ws(self):
+        """Forget any WebSocket connection state."""
+        self._ws: aiohttp.ClientWebSocketResponse | None = None
+        self._ws_reader: asyncio.Task | None = None
+        self._ws_lock: asyncio.Lock | None = None
+        self._ws_pending: dict[int, asyncio.Future] = {}
+        self._ws_seq = itertools.count(1)
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the pooled HTTP session, creating it for the running loop."""
+        loop = asyncio.get_running_loop()
+        if (
+            self._session is None
+            or self._session.closed
+            or self._session_loop is not loop
+        ):
+            # Keep-alive connections are reused across notifications
+            connector = aiohttp.TCPConnector(limit=8, keepalive_timeout=30)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._session_loop = loop
+            self._reset_ws()
+        return self._session
+
+    async def close(self):
+        """Close the WebSocket connection and pooled HTTP session."""
+        if self._ws_reader is not None:
+            self._ws_reader.cancel()
+        if self._ws is not None and not self._ws.closed:
+            await self._ws.close()
+        self._reset_ws()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
+    async def _get_ws(self) -> aiohttp.ClientWebSocketResponse:
+        """Get the ingest WebSocket, reconnecting with backoff if needed."""
+        session = await self._get_session()
+        if self._ws_lock is None:
+            self._ws_lock = asyncio.Lock()
+
+        async with self._ws_lock:
+            if self._ws is not None and not self._ws.closed:
+                return self._ws
+
+            headers = {}
+            if self.auth_token:
+                headers["Authorization"] = f"Bearer {self.auth_token}"
+
+            delay = 0.1
+            for attempt in range(self.reconnect_attempts):
+                try:
+                    self._ws = await session.ws_connect(
+                        self.ws_url, headers=headers, heartbeat=30
+                    )
+                    break
+                except (aiohttp.ClientError, TimeoutError) as e:
+                    if attempt == self.reconnect_attempts - 1:
+                        raise ConnectionError(f"WebSocket connect failed: {e}")
+                    await asyncio.sleep(delay)
+                    delay *= 2
+
+            self._ws_reader = asyncio.create_task(self._read_ws(self._ws))
+            return self._ws
+
+    async def _read_ws(self, ws: aiohttp.ClientWebSocketResponse):
+        """Route replies from the server to their waiting senders."""
+        try:
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    continue
+                reply = msg.json()
+                future = self._ws_pending.pop(reply.get("seq"), None)
+                if future is not None and not future.done():
+                    future.set_result(reply)
+        finally:
+            # Fail anything still in flight so callers can retry
+            pending, self._ws_pending = self._ws_pending, {}
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("WebSocket closed"))
+
+    async def _send_ws(self, payload: dict) -> dict:
+        """Send one notification frame and wait for its reply."""
+        for attempt in range(2):
+            ws = await self._get_ws()
+            seq = next(self._ws_seq)
+            future = asyncio.get_running_loop().create_future()
+            self._ws_pending[seq] = future
+            try:
+                await ws.send_json({**payload, "seq": seq})
+                return await asyncio.wait_for(future, self.timeout)
+            except (ConnectionError, aiohttp.ClientError):
+                # The connection dropped; reconnect and resend once
+                self._ws_pending.pop(seq, None)
+                if attempt == 1:
+                    raise
+        raise ConnectionError("WebSocket unavailable")
+
+    def is_ready(self) -> bool:
+        """Check the run directory for a ready server, without any network I/O.
+
+        Always True when the client was created without a run directory.
+        """
+        if self.server_files is None:
+            return True
+        return self.server_files.state(self.port) == READY
+
+    async def _wait_ready(self) -> bool:
+        """Wait for a starting server; False at once if it is not running."""
+        if self.server_files is None or self._seen_ready:
+            return True
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        while True:
+            state = self.server_files.state(self.port)
+            if state == READY:
+                self._seen_ready = True
+                return True
+            if state != STARTING or loop.time() >= deadline:
+                return False
+            await asyncio.sleep(0.05)
+
+    def _headers(self) -> dict:
+        """Build request headers, including auth if configured."""
+        headers = {"Content-Type": "application/json"}
+        if self.auth_token:
+            headers["Authorization"] = f"Bearer {self.auth_token}"
+        return headers
 
-    async def send_notification(
+    async def submit(
         self,
         message: str,
         priority: str = "normal",
-        source: str | None = None
-    ) -> bool:
-        """Send a notification to the server."""
+        source: str | None = None,
+        *,
+        deliver_at: float | None = None,
+        expires_at: float | None = None
+    ) -> str | None:
+        """Queue a notification on the server and return its id."""
+        _, notification_id = await self.submit_with_status(
+            message, priority, source, deliver_at=deliver_at, expires_at=expires_at
+        )
+        return notification_id
+
+    async def submit_with_status(
+        self,
+        message: str,
+        priority: str = "normal",
+        source: str | None = None,
+        *,
+        deliver_at: float | None = None,
+        expires_at: float | None = None
+    ) -> tuple[int, str | None]:
+        """Queue a notification and return the response status and its id.
+
+        The status is 200 when accepted, the server's error status (e.g. 429)
+        when refused, or 0 when the server could not be reached. `deliver_at`
+        and `expires_at` are Unix times.
+        """
 
         if len(message) > 140:
             raise ValueError("Message must be 140 characters or less")
@@ -40,42 +222,136 @@ class NotificationClient:
 
         if source:
             payload["source"] = source
+        if deliver_at is not None:
+            payload["deliver_at"] = deliver_at
+        if expires_at is not None:
+            payload["expires_at"] = expires_at
 
-        headers = {"Content-Type": "application/json"}
-        if self.auth_token:
-            headers["Authorization"] = f"Bearer {self.auth_token}"
+        if not await self._wait_ready():
+            logger.error("Notification failed: server is not running")
+            return 0, None
 
         try:
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(
-                    f"{self.base_url}/notify",
-                    json=payload,
-                    headers=headers
-                ) as response:
-                    if response.status == 200:
-                        return True
-                    elif response.status == 429:
-                        logger.warning("Rate limit exceeded")
-                        return False
-                    else:
-                        logger.error(f"Notification failed: {response.status}")
-                        return False
+            if self.transport == "websocket":
+                reply = await self._send_ws(payload)
+                if reply.get("type") == "ack":
+                    return 200, reply.get("id") or ""
+                status = reply.get("status", 0)
+                if status == 429:
+                    logger.warning("Rate limit exceeded")
+                elif status == 503:
+                    logger.warning(f"Notification rejected: {reply.get('detail')}")
+                else:
+                    logger.error(f"Notification failed: {status}")
+                return status, None
+
+            session = await self._get_session()
+            async with session.post(
+                f"{self.base_url}/notify",
+                json=payload,
+                headers=self._headers()
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return 200, data.get("id") or ""
+                elif response.status == 429:
+                    logger.warning("Rate limit exceeded")
+                elif response.status == 503:
+                    data = await response.json()
+                    logger.warning(f"Notification rejected: {data.get('detail')}")
+                else:
+                    logger.error(f"Notification failed: {response.status}")
+                return response.status, None
 
         except TimeoutError:
             logger.error("Notification timed out")
-            return False
         except Exception as e:
             logger.error(f"Notification failed: {e}")
-            return False
+        # Check the run directory again before the next attempt
+        self._seen_ready = False
+        return 0, None
+
+    async def send_notification(
+        self,
+        message: str,
+        priority: str = "normal",
+        source: str | None = None
+    ) -> bool:
+        """Send a notification to the server."""
+        return await self.submit(message, priority, source) is not None
+
+    async def get_status(
+        self, notification_id: str, wait: float = 0
+    ) -> dict | None:
+        """Get a notification's delivery status, long-polling up to `wait`."""
+        try:
+            session = await self._get_session()
+            async with session.get(
+                f"{self.base_url}/notify/{notification_id}",
+                params={"wait": str(wait)},
+                headers=self._headers(),
+                timeout=aiohttp.ClientTimeout(total=wait + self.timeout)
+            ) as response:
+                if response.status == 200:
+                    return await response.json()
+                logger.error(f"Status lookup failed: {response.status}")
+                return None
+        except Exception as e:
+            logger.error(f"Status lookup failed: {e}")
+            return None
+
+    async def get_stats(
+        self, window: str | None = None, top: int = 10
+    ) -> dict | None:
+        """Get per-source usage statistics for one window or all of them."""
+        params = {"top": str(top)}
+        if window:
+            params["window"] = window
+        try:
+            session = await self._get_session()
+            async with session.get(
+                f"{self.base_url}/stats",
+                params=params,
+                headers=self._headers()
+            ) as response:
+                if response.status == 200:
+                    return await response.json()
+                logger.error(f"Stats lookup failed: {response.status}")
+                return None
+        except Exception as e:
+            logger.error(f"Stats lookup failed: {e}")
+            return None
+
+    async def wait_for_delivery(
+        self, notification_id: str, timeout: float = 30.0
+    ) -> dict | None:
+        """Wait until a notification is delivered, failed or dropped.
+
+        Returns the final status record, the last known record if the
+        timeout expires first, or None if the id is unknown.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        record = None
+        while True:
+            remaining = deadline - loop.time()
+            # The server caps each long-poll, so keep asking until the deadline
+            record = await self.get_status(
+                notification_id, wait=max(0.0, min(remaining, 30.0))
+            )
+            if record is None or record["state"] in TERMINAL_STATES:
+                return record
+            if remaining <= 0:
+                return record
 
     async def health_check(self) -> bool:
         """Check if the server is healthy."""
+        if not await self._wait_ready():
+            return False
         try:
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(f"{self.base_url}/health") as response:
-                    return response.status == 200
+            session = await self._get_session()
+            async with session.get(f"{self.base_url}/health") as response:
+                return response.status == 200
         except Exception:
             return False
 
@@ -88,11 +364,12 @@ def configure_client(
     host: str = "127.0.0.1",
     port: int = 8765,
     auth_token: str | None = None,
-    timeout: float = 5.0
+    timeout: float = 5.0,
+    transport: str = "http"
 ):
     """Configure the global notification client."""
     global _client
-    _client = NotificationClient(host, port, auth_token, timeout)
+    _client = NotificationClient(host, port, auth_token, timeout, transport)
 
 
 def get_client() -> NotificationClient:
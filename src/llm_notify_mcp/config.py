@@ -1,9 +1,22 @@
 """Configuration management for LLM Notify MCP."""
 
 from pathlib import Path
+from typing import Literal
 
 import yaml
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
+
+from .scheduler import parse_quiet_hours
+
+Channel = Literal["audio", "visual", "sound", "history"]
+
+
+class Route(BaseModel):
+    """A routing rule: notifications matching source and priority globs."""
+
+    source: str = "*"
+    priority: str = "*"
+    channels: list[Channel]
 
 
 class Config(BaseModel):
@@ -17,17 +30,88 @@ class Config(BaseModel):
     voice: str = ""  # Empty string uses system default voice
     volume: float = 0.8
     speech_rate: int = 180  # words per minute
+    adaptive_rate: bool = True  # Speak faster while a backlog is queued
+    adaptive_rate_step: int = 15  # words per minute added per queued message
+    speech_rate_min: int = 120
+    speech_rate_max: int = 260
+    adaptive_rate_priorities: list[str] = ["low", "normal"]
+    speech_compaction: bool = True  # Shorten paths, hashes, ids before speaking
+    speech_compaction_rules: list[str] | None = None  # None enables every rule
+    speech_replacements: dict[str, str] = {}  # extra regex -> replacement
+    speech_lock: bool = True  # Serialize speech across processes
+    speech_lease_timeout: float = 30.0  # seconds before a held lease is stale
+    speech_lock_wait: float = 60.0  # seconds to wait for the lease
+    speech_timeout: float = 10.0  # seconds allowed beyond the estimated duration
+    # Alternate speech command, e.g. ["espeak", "-s", "{rate}", "{message}"]
+    speech_fallback_command: list[str] = []
+    speech_failover_visual: bool = True  # Show visually if no speech backend works
+    circuit_failure_threshold: int = 3  # consecutive failures that disable a backend
+    circuit_reset_timeout: float = 30.0  # seconds before a disabled backend is probed
 
     # Notification settings
     visual_notifications: bool = True
     rate_limit: int = 10  # messages per minute
+    event_buffer_size: int = 100  # events buffered per /events subscriber
+    status_table_size: int = 1000  # delivery states kept for GET /notify/{id}
+    trace_file: str | None = None  # Record incoming notifications for replay
+    alert_sound: str = "/System/Library/Sounds/Glass.aiff"  # "sound" channel
+    history_file: str | None = None  # "history" channel, default in log dir
+
+    # Routing rules, first match wins; unmatched notifications are spoken and
+    # shown (with a sound for high priority) as before
+    routes: list[Route] = []
+
+    # Digest settings (fold low/normal bursts per source into one utterance)
+    digest_enabled: bool = True
+    digest_backlog: int = 5  # pending low/normal notifications that trigger it
+    digest_rate: int = 20  # accepted notifications per minute that trigger it
+    digest_min_group: int = 2  # smallest per-source group worth folding
+
+    # Latency SLO for low/normal notifications (0 disables admission control)
+    latency_slo: float = 60.0  # seconds until a new notification is spoken
+    # "digest" defers notifications no digest would absorb, and everything
+    # while digest_enabled is off
+    slo_action: Literal["digest", "defer", "reject"] = "digest"
+
+    # Quiet hours (local "HH:MM-HH:MM"): only high priority is delivered, the
+    # rest is held and delivered as digests once they end
+    quiet_hours: str | None = None
+
+    # Relay settings (forward accepted notifications to other machines)
+    relay_targets: list[str] = []  # e.g. ["http://laptop.local:8765"]
+    relay_auth_token: str | None = None  # token expected by the downstreams
+    relay_local_delivery: bool = True  # Also speak on this machine
+    relay_queue_size: int = 1000  # pending notifications kept per target
+    relay_batch_size: int = 20
+    relay_max_retries: int = 3
+    relay_retry_delay: float = 0.5  # seconds, doubled on each retry
+    relay_timeout: float = 5.0
+
+    # Usage statistics
+    stats_sources: int = 32  # sources tracked per time bucket on /stats
+
+    # Shutdown settings
+    drain_timeout: float = 10.0  # seconds to keep speaking the queue on shutdown
+    persist_pending: bool = True  # Save what is left for the next server process
 
     # Security settings
     auth_token: str | None = None
 
+    # MCP settings
+    mcp_forward: bool = False  # Forward MCP notify calls to the shared daemon
+    daemon_autostart: bool = True  # Start the daemon if it is not running
+    daemon_start_timeout: float = 10.0  # seconds to wait for a started daemon
+
     # Logging settings
     log_level: str = "INFO"
 
+    @field_validator("quiet_hours")
+    @classmethod
+    def validate_quiet_hours(cls, v):
+        if v is not None:
+            parse_quiet_hours(v)
+        return v
+
     @classmethod
     def load(cls, config_path: Path | None = None) -> "Config":
         """Load configuration from file or use defaults."""
@@ -68,3 +152,13 @@ class Config(BaseModel):
     def get_log_dir(self) -> Path:
         """Get the log directory."""
         return self.get_config_dir() / "logs"
+
+    def get_history_file(self) -> Path:
+        """Get the file the "history" channel appends to."""
+        if self.history_file:
+            return Path(self.history_file).expanduser()
+        return self.get_log_dir() / "history.jsonl"
+
+    def get_run_dir(self) -> Path:
+        """Get the runtime state directory (locks, sockets)."""
+        return self.get_config_dir() / "run"
@@ -0,0 +1,206 @@
+"""Background daemon support: pid and readiness files, detaching.
+
+The server keeps two files in the run directory. The pid file holds the pid
+of the running server and enforces a single instance. The ready file is
+written once the server accepts notifications and names its pid, host and
+port, so clients can tell "not running" and "still starting" apart from a
+stat and a small read instead of waiting on a connect timeout.
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+PID_FILE = "server.pid"
+READY_FILE = "server.ready"
+DAEMON_LOG = "daemon.log"
+
+# Server states as seen through the run directory
+STOPPED = "stopped"
+STARTING = "starting"
+READY = "ready"
+
+
+class AlreadyRunningError(RuntimeError):
+    """Raised when another live server holds the pid file."""
+
+    def __init__(self, pid: int):
+        super().__init__(f"Server already running (pid {pid})")
+        self.pid = pid
+
+
+def pid_alive(pid: int) -> bool:
+    """Check whether a process with the given pid exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists, but belongs to another user
+        return True
+    return True
+
+
+def _write_atomic(path: Path, text: str):
+    """Write a file via rename so readers never see it half written."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}")
+    tmp.write_text(text)
+    os.replace(tmp, path)
+
+
+class ServerFiles:
+    """Pid and ready files of the server in a run directory.
+
+    Both files name the process that wrote them, so files left behind by a
+    killed server are recognized as stale and a process only ever removes
+    its own (after a restart they belong to the successor).
+    """
+
+    def __init__(self, run_dir: Path):
+        self.pid_path = run_dir / PID_FILE
+        self.ready_path = run_dir / READY_FILE
+
+    def _pid_file_pid(self) -> int | None:
+        try:
+            return int(self.pid_path.read_text().strip())
+        except (OSError, ValueError):
+            return None
+
+    def _ready_file_info(self) -> dict | None:
+        try:
+            info = json.loads(self.ready_path.read_text())
+        except (OSError, ValueError):
+            return None
+        return info if isinstance(info, dict) else None
+
+    def running_pid(self) -> int | None:
+        """Pid of the live server recorded in the pid file, if any."""
+        pid = self._pid_file_pid()
+        return pid if pid is not None and pid_alive(pid) else None
+
+    def ready_info(self) -> dict | None:
+        """The ready file's contents, if a live server wrote it."""
+        info = self._ready_file_info()
+        pid = info.get("pid") if info else None
+        if not isinstance(pid, int) or not pid_alive(pid):
+            return None
+        return info
+
+    def state(self, port: int | None = None) -> str:
+        """READY, STARTING or STOPPED; a server on another port is STOPPED."""
+        info = self.ready_info()
+        if info is not None:
+            return READY if port is None or info.get("port") == port else STOPPED
+        return STARTING if self.running_pid() is not None else STOPPED
+
+    def claim(self, takeover: bool = False):
+        """Record this process as the running server.
+
+        Raises AlreadyRunningError if another live server holds the pid file,
+        unless this process is taking over from it with --restart.
+        """
+        pid = os.getpid()
+        if takeover:
+            _write_atomic(self.pid_path, f"{pid}\n")
+            return
+
+        self.pid_path.parent.mkdir(parents=True, exist_ok=True)
+        for _ in range(2):
+            try:
+                # Exclusive create, so two servers starting at once cannot
+                # both win
+                fd = os.open(self.pid_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            except FileExistsError:
+                running = self.running_pid()
+                if running is not None and running != pid:
+                    raise AlreadyRunningError(running) from None
+                # Left behind by a server that was killed
+                self.pid_path.unlink(missing_ok=True)
+                continue
+            with os.fdopen(fd, "w") as f:
+                f.write(f"{pid}\n")
+            return
+        raise AlreadyRunningError(self.running_pid() or 0)
+
+    def mark_ready(self, host: str, port: int):
+        """Announce that this process accepts notifications."""
+        _write_atomic(self.ready_path, json.dumps({
+            "pid": os.getpid(),
+            "host": host,
+            "port": port,
+            "started": time.time(),
+        }))
+
+    def clear_ready(self):
+        """Withdraw this process's ready announcement."""
+        info = self._ready_file_info()
+        if info is not None and info.get("pid") == os.getpid():
+            self.ready_path.unlink(missing_ok=True)
+
+    def release(self):
+        """Remove this process's ready and pid files."""
+        self.clear_ready()
+        if self._pid_file_pid() == os.getpid():
+            self.pid_path.unlink(missing_ok=True)
+
+
+def _wait_ready(files: ServerFiles, pid: int, timeout: float) -> bool:
+    """Wait until the daemon with `pid` is ready, or exits, or time runs out."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        info = files.ready_info()
+        if info is not None and info.get("pid") == pid:
+            return True
+        if not pid_alive(pid):
+            return False
+        time.sleep(0.05)
+    return False
+
+
+def daemonize(files: ServerFiles, log_path: Path, timeout: float):
+    """Detach into the background, returning only in the daemon process.
+
+    Uses the usual double fork, so the daemon is in its own session and can
+    never reacquire a terminal. Standard output and error go to `log_path`.
+    The original process waits until the daemon is ready and exits 0, or
+    exits 1 if the daemon died or was not ready within `timeout`.
+    """
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    # The daemon reports its pid through a pipe, since it is not our child
+    read_fd, write_fd = os.pipe()
+    child = os.fork()
+    if child > 0:
+        os.close(write_fd)
+        with os.fdopen(read_fd) as pipe:
+            reported = pipe.read().strip()
+        os.waitpid(child, 0)
+
+        pid = int(reported) if reported.isdigit() else None
+        if pid is not None and _wait_ready(files, pid, timeout):
+            print(f"Server running in the background (pid {pid})")
+            sys.exit(0)
+        print(f"Server did not start, see {log_path}")
+        sys.exit(1)
+
+    os.close(read_fd)
+    os.setsid()
+    if os.fork() > 0:
+        os._exit(0)
+
+    os.write(write_fd, str(os.getpid()).encode())
+    os.close(write_fd)
+    os.umask(0o022)
+
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, sys.stdin.fileno())
+    os.close(devnull)
+    log = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    os.dup2(log, sys.stdout.fileno())
+    os.dup2(log, sys.stderr.fileno())
+    os.close(log)
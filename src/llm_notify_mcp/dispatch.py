@@ -0,0 +1,518 @@
+"""Notification dispatch queue and digest stage for LLM Notify MCP."""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import deque
+from collections.abc import Awaitable, Callable
+
+from .config import Config
+from .estimator import SpeechEstimator
+from .events import EventBroadcaster
+from .models import NotificationRequest
+from .scheduler import TimerHeap, parse_quiet_hours, quiet_until
+from .tracking import (
+    DELIVERED,
+    DROPPED,
+    FAILED,
+    QUEUED,
+    SCHEDULED,
+    SPEAKING,
+    DeliveryTracker,
+)
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES = ("high", "normal", "low")
+
+# Delivery order; deferred entries only speak once everything else is done
+LANES = (*PRIORITIES, "deferred")
+
+# Lanes delivered before (or alongside) a new entry in the given lane
+LANES_AHEAD = {lane: LANES[:LANES.index(lane) + 1] for lane in LANES}
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when a notification would miss the latency SLO."""
+
+    def __init__(self, projected_delay: float):
+        super().__init__(
+            f"Projected delivery in {projected_delay:.0f}s exceeds the latency SLO"
+        )
+        self.projected_delay = projected_delay
+
+
+class PendingNotification:
+    """A queued notification, or a digest standing in for several."""
+
+    __slots__ = (
+        "id", "request", "enqueued_at", "members", "estimate", "admission"
+    )
+
+    def __init__(
+        self,
+        request: NotificationRequest,
+        members: list | None = None,
+        estimate: float = 0.0
+    ):
+        self.id = uuid.uuid4().hex
+        self.request = request
+        self.enqueued_at = time.time()
+        self.estimate = estimate  # projected seconds of speech
+        # "queued", "deferred" / "digested" under SLO pressure, "scheduled" for
+        # a future deliver_at, "held" for quiet hours or "expired"
+        self.admission = "queued"
+        # Notifications folded into this digest (empty for plain entries)
+        self.members: list[PendingNotification] = members or []
+
+    def ids(self) -> list[str]:
+        """Ids of every notification this entry delivers."""
+        return [self.id] + [member.id for member in self.members]
+
+
+def format_digest(source: str | None, entries: list[PendingNotification]) -> str:
+    """Summarize several notifications from one source as one utterance."""
+    origin = f" from {source}" if source else ""
+    text = f"{len(entries)} updates{origin}, latest: {entries[-1].request.message}"
+    if len(text) > 140:
+        text = text[:137].rstrip() + "..."
+    return text
+
+
+class NotificationDispatcher:
+    """Priority queue of pending notifications with a single delivery worker."""
+
+    def __init__(
+        self,
+        deliver: Callable[[NotificationRequest], Awaitable[None]],
+        config: Config,
+        events: EventBroadcaster | None = None,
+        tracker: DeliveryTracker | None = None,
+        estimator: SpeechEstimator | None = None,
+        speaks: Callable[[NotificationRequest], bool] | None = None
+    ):
+        self.deliver = deliver
+        self.config = config
+        self.events = events
+        self.tracker = tracker
+        self.estimator = estimator or SpeechEstimator()
+        # Whether a notification is routed to speech; others cost no queue time
+        self.speaks = speaks
+        self.queues: dict[str, deque[PendingNotification]] = {
+            lane: deque() for lane in LANES
+        }
+        # Projected speech seconds per lane, kept in step with the queues
+        self.lane_seconds: dict[str, float] = dict.fromkeys(LANES, 0.0)
+        self._current: PendingNotification | None = None
+        self._current_started = 0.0
+        self._arrivals: deque[float] = deque()
+        # Quiet hours as start and end minutes, parsed once
+        self.quiet_hours = (
+            parse_quiet_hours(config.quiet_hours) if config.quiet_hours else None
+        )
+        # Scheduled and quiet-hours entries wait here until they are due
+        self.timers = TimerHeap(self._release)
+        self._wakeup: asyncio.Event | None = None
+        self._worker: asyncio.Task | None = None
+        self._worker_loop: asyncio.AbstractEventLoop | None = None
+        self._paused = False  # set while draining for shutdown
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self.queues.values())
+
+    def _estimate(self, request: NotificationRequest) -> float:
+        """Projected seconds to speak a notification."""
+        if self.speaks is not None and not self.speaks(request):
+            return 0.0
+        return self.estimator.estimate(request.message, self.config.speech_rate)
+
+    def _push(self, lane: str, entry: PendingNotification, first: bool = False):
+        """Add an entry to a lane, keeping the lane total in step."""
+        if first:
+            self.queues[lane].appendleft(entry)
+        else:
+            self.queues[lane].append(entry)
+        self.lane_seconds[lane] += entry.estimate
+
+    def _pop(self, lane: str) -> PendingNotification:
+        """Take the next entry from a lane."""
+        entry = self.queues[lane].popleft()
+        self.lane_seconds[lane] = max(0.0, self.lane_seconds[lane] - entry.estimate)
+        return entry
+
+    def projected_delay(self, lane: str = "deferred") -> float:
+        """Projected seconds until a new entry in `lane` starts speaking."""
+        delay = 0.0
+        if self._current is not None:
+            elapsed = time.monotonic() - self._current_started
+            delay = max(0.0, self._current.estimate - elapsed)
+        return delay + sum(self.lane_seconds[ahead] for ahead in LANES_AHEAD[lane])
+
+    def enqueue(self, request: NotificationRequest) -> PendingNotification:
+        """Queue a notification for delivery and return its entry.
+
+        Raises AdmissionRejectedError if the latency SLO would be missed and the
+        configured SLO action is "reject".
+        """
+        return self._admit(
+            PendingNotification(request, estimate=self._estimate(request))
+        )
+
+    def restore(self, saved: list[dict]):
+        """Queue entries saved by snapshot(), keeping their ids.
+
+        Restored entries skip admission control; they were admitted already.
+        """
+        for item in saved:
+            request = NotificationRequest.model_validate(item["request"])
+            entry = PendingNotification(request, estimate=self._estimate(request))
+            entry.id = item["id"]
+            entry.enqueued_at = item["enqueued_at"]
+            self._admit(entry, restored=True)
+
+    def snapshot(self) -> list[dict]:
+        """Undelivered entries, oldest first, in a form restore() accepts.
+
+        Digests are saved as their members so they can be digested again.
+        """
+        entries = [
+            entry for lane in LANES for entry in self.queues[lane]
+        ] + [entry for _, entry in self.timers.items()]
+        saved = [
+            {
+                "id": member.id,
+                "enqueued_at": member.enqueued_at,
+                "request": member.request.model_dump(exclude_none=True),
+            }
+            for entry in entries
+            for member in (entry.members or [entry])
+        ]
+        saved.sort(key=lambda item: item["enqueued_at"])
+        return saved
+
+    def _admit(
+        self, entry: PendingNotification, restored: bool = False
+    ) -> PendingNotification:
+        """Hold, drop or queue an entry, applying the SLO to new arrivals."""
+        request = entry.request
+        now = time.time()
+
+        release = self._hold_until(request, now)
+        if request.expires_at is not None and request.expires_at <= (release or now):
+            entry.admission = "expired"
+            self._track(entry, DROPPED)
+            self._drop(entry, "Expired before it could be delivered")
+            return entry
+
+        # Entries due later skip admission control until they are released
+        if release is not None:
+            if request.deliver_at is None or request.deliver_at < release:
+                entry.admission = "held"
+            else:
+                entry.admission = "scheduled"
+            self._track(entry, SCHEDULED)
+            self.timers.push(release, entry)
+            return entry
+
+        lane = request.priority
+
+        # High priority is never held back; everything else must fit the SLO
+        slo = self.config.latency_slo
+        if lane != "high" and slo > 0 and not restored:
+            projected = self.projected_delay(lane) + entry.estimate
+            if projected > slo:
+                action = self.config.slo_action
+                logger.info(
+                    f"Projected delivery {projected:.1f}s exceeds {slo:.0f}s SLO, "
+                    f"applying '{action}'"
+                )
+                if action == "reject":
+                    raise AdmissionRejectedError(projected)
+                elif action == "digest" and self._can_fold(request.source):
+                    entry.admission = "digested"
+                else:
+                    # "digest" defers whatever a digest would not absorb
+                    lane = "deferred"
+                    entry.admission = "deferred"
+
+        # Tracked first, so a digest it triggers can record its digest_id
+        self._track(entry, QUEUED)
+        self._push(lane, entry)
+        if entry.admission == "digested":
+            self._digest()
+
+        if not restored:
+            self._arrivals.append(now)
+            self._prune_arrivals(now)
+
+        self._ensure_worker()
+        self._wakeup.set()
+        return entry
+
+    def _can_fold(self, source: str | None) -> bool:
+        """Check whether a new entry from `source` would be digested."""
+        if not self.config.digest_enabled:
+            return False
+        group = 1 + sum(
+            1
+            for lane in ("normal", "low")
+            for queued in self.queues[lane]
+            if not queued.members and queued.request.source == source
+        )
+        return group >= self.config.digest_min_group
+
+    def _track(self, entry: PendingNotification, state: str):
+        """Start tracking a newly accepted entry."""
+        if self.tracker is not None:
+            request = entry.request
+            self.tracker.add(
+                entry.id, request.message, request.priority, request.source, state
+            )
+
+    def _hold_until(self, request: NotificationRequest, now: float) -> float | None:
+        """When a notification may be delivered, or None if it may be now."""
+        release = None
+        if request.deliver_at is not None and request.deliver_at > now:
+            release = request.deliver_at
+
+        # Quiet hours hold everything but high priority until they end
+        if self.quiet_hours is not None and request.priority != "high":
+            quiet_end = quiet_until(self.quiet_hours, release or now)
+            if quiet_end is not None:
+                release = quiet_end
+        return release
+
+    def _drop(self, entry: PendingNotification, reason: str):
+        """Give up on an entry that can no longer be delivered in time."""
+        logger.info(f"Dropping notification {entry.id}: {reason}")
+        self._set_state(entry, DROPPED, error=reason)
+        if self.events is not None:
+            self.events.publish(
+                "dropped",
+                message=entry.request.message,
+                priority=entry.request.priority,
+                source=entry.request.source,
+                error=reason
+            )
+
+    def _release(self, entries: list[PendingNotification]):
+        """Queue held entries that have fallen due."""
+        now = time.time()
+        released_quiet = False
+        for entry in entries:
+            request = entry.request
+            if request.expires_at is not None and request.expires_at <= now:
+                self._drop(entry, "Expired before it could be delivered")
+                continue
+
+            # A scheduled time may itself fall within quiet hours
+            release = self._hold_until(request, now)
+            if release is not None:
+                entry.admission = "held"
+                self.timers.push(release, entry)
+                continue
+
+            released_quiet |= entry.admission == "held"
+            self._push(request.priority, entry)
+            self._set_state(entry, QUEUED)
+
+        # Whatever piled up during quiet hours is summarized, not read out
+        if released_quiet and self.config.digest_enabled:
+            self._digest()
+        if len(self):
+            self._ensure_worker()
+            self._wakeup.set()
+
+    def position(self, notification_id: str) -> int | None:
+        """Count the entries ahead of a queued notification, or None."""
+        ahead = 0
+        for lane in LANES:
+            for entry in self.queues[lane]:
+                if notification_id in entry.ids():
+                    return ahead
+                ahead += 1
+        return None
+
+    def _ensure_worker(self):
+        """Start the delivery worker on the running loop if needed."""
+        loop = asyncio.get_running_loop()
+        if (
+            self._worker is None
+            or self._worker.done()
+            or self._worker_loop is not loop
+        ):
+            self._wakeup = asyncio.Event()
+            self._worker = loop.create_task(self._run())
+            self._worker_loop = loop
+
+    async def drain(self, timeout: float):
+        """Deliver queued entries for up to `timeout` seconds, then stop.
+
+        The utterance in progress is given a grace period to finish; if it
+        does not, it is queued again. Anything still pending stays queued
+        for snapshot().
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while len(self) and loop.time() < deadline:
+            await asyncio.sleep(0.1)
+
+        self._paused = True
+        if self._current is not None:
+            # The speech backend's own hard timeout bounds this wait
+            grace = self.config.speech_timeout + 2 * self._current.estimate
+            deadline = max(deadline, loop.time()) + grace
+            while self._current is not None and loop.time() < deadline:
+                await asyncio.sleep(0.05)
+        await self.stop()
+
+    async def stop(self):
+        """Stop the delivery worker, leaving pending entries queued."""
+        await self.timers.stop()
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+
+    def _prune_arrivals(self, now: float):
+        """Forget arrivals older than the one-minute rate window."""
+        while self._arrivals and now - self._arrivals[0] > 60:
+            self._arrivals.popleft()
+
+    def _should_digest(self) -> bool:
+        """Check whether the backlog or arrival rate calls for digesting."""
+        if not self.config.digest_enabled:
+            return False
+        backlog = len(self.queues["normal"]) + len(self.queues["low"])
+        if backlog >= self.config.digest_backlog:
+            return True
+        # A burst long past must not keep digesting after a quiet spell
+        self._prune_arrivals(time.time())
+        return len(self._arrivals) >= self.config.digest_rate
+
+    def _digest(self):
+        """Fold pending low and normal notifications per source."""
+        by_source: dict[str | None, list[PendingNotification]] = {}
+        for priority in ("normal", "low"):
+            for entry in self.queues[priority]:
+                if entry.members:
+                    continue  # Already a digest
+                by_source.setdefault(entry.request.source, []).append(entry)
+
+        for source, entries in by_source.items():
+            if len(entries) < self.config.digest_min_group:
+                continue
+
+            priority = "normal" if any(
+                e.request.priority == "normal" for e in entries
+            ) else "low"
+            request = NotificationRequest(
+                message=format_digest(source, entries),
+                priority=priority,
+                source=source
+            )
+            digest = PendingNotification(
+                request, members=entries, estimate=self._estimate(request)
+            )
+
+            folded = {id(e) for e in entries}
+            placed = False
+            for lane in ("normal", "low"):
+                kept = deque()
+                for e in self.queues[lane]:
+                    if id(e) not in folded:
+                        kept.append(e)
+                    elif lane == priority and not placed:
+                        # The digest takes its oldest member's place, so it
+                        # never overtakes older entries from other sources
+                        kept.append(digest)
+                        placed = True
+                self.queues[lane] = kept
+                self.lane_seconds[lane] = sum(e.estimate for e in kept)
+
+            logger.info(f"Digested {len(entries)} notifications from {source}")
+            if self.tracker is not None:
+                for entry in entries:
+                    self.tracker.update(entry.id, QUEUED, digest_id=digest.id)
+            if self.events is not None:
+                for entry in entries:
+                    self.events.publish(
+                        "digested",
+                        message=entry.request.message,
+                        priority=entry.request.priority,
+                        source=source,
+                        digest_id=digest.id
+                    )
+
+    def _next(self) -> PendingNotification | None:
+        """Pop the next live entry to deliver, dropping or holding the rest."""
+        now = time.time()
+        while True:
+            entry = self._pop_next()
+            if entry is None:
+                return None
+
+            # Expired entries are only noticed here, so dropping costs O(1)
+            expires_at = entry.request.expires_at
+            if expires_at is not None and expires_at <= now:
+                self._drop(entry, "Expired before it could be delivered")
+                continue
+
+            # Quiet hours may have started after the entry was queued
+            release = self._hold_until(entry.request, now)
+            if release is not None:
+                entry.admission = "held"
+                self._set_state(entry, SCHEDULED)
+                self.timers.push(release, entry)
+                continue
+            return entry
+
+    def _pop_next(self) -> PendingNotification | None:
+        """Pop the next entry, highest priority first."""
+        if self.queues["high"]:
+            return self._pop("high")
+        if self._should_digest():
+            self._digest()
+        for lane in ("normal", "low", "deferred"):
+            if self.queues[lane]:
+                return self._pop(lane)
+        return None
+
+    async def _run(self):
+        """Deliver queued notifications one at a time."""
+        while True:
+            entry = None if self._paused else self._next()
+            if entry is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            self._current = entry
+            self._current_started = time.monotonic()
+            self._set_state(entry, SPEAKING)
+            try:
+                await self.deliver(entry.request)
+            except asyncio.CancelledError:
+                # Stopped mid-utterance: keep the entry, first in line, so
+                # snapshot() saves it
+                self._push(entry.request.priority, entry, first=True)
+                self._set_state(entry, QUEUED)
+                raise
+            except Exception as e:
+                logger.error(f"Failed to send notification: {e}")
+                self._set_state(entry, FAILED, error=str(e))
+            else:
+                self._set_state(entry, DELIVERED)
+            finally:
+                self._current = None
+
+    def _set_state(self, entry: PendingNotification, state: str, **fields):
+        """Record a state change for an entry and any digested members."""
+        if self.tracker is None:
+            return
+        for notification_id in entry.ids():
+            self.tracker.update(notification_id, state, **fields)
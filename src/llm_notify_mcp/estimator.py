@@ -0,0 +1,43 @@
+"""Speech duration estimation for LLM Notify MCP."""
+
+# Average characters per spoken word, including the trailing space
+CHARS_PER_WORD = 6.0
+
+
+class SpeechEstimator:
+    """Estimates how long `say` takes to speak a message.
+
+    The estimate starts from the word count and speech rate, then is scaled
+    by an exponentially weighted average of observed/estimated run times so
+    it tracks the actual voice, startup overhead and machine.
+    """
+
+    def __init__(
+        self,
+        overhead: float = 0.3,
+        alpha: float = 0.2,
+        min_scale: float = 0.25,
+        max_scale: float = 4.0
+    ):
+        self.overhead = overhead  # process startup and audio device latency
+        self.alpha = alpha
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.scale = 1.0
+        self.samples = 0
+
+    def _naive(self, message: str, rate: int) -> float:
+        """Estimate from word count alone."""
+        words = max(len(message.split()), len(message) / CHARS_PER_WORD, 1.0)
+        return self.overhead + words * 60.0 / max(rate, 1)
+
+    def estimate(self, message: str, rate: int) -> float:
+        """Estimated seconds to speak a message at the given rate."""
+        return self._naive(message, rate) * self.scale
+
+    def observe(self, message: str, rate: int, seconds: float):
+        """Calibrate against an observed run time."""
+        ratio = seconds / self._naive(message, rate)
+        ratio = min(max(ratio, self.min_scale), self.max_scale)
+        self.scale += self.alpha * (ratio - self.scale)
+        self.samples += 1
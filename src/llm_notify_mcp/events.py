@@ -0,0 +1,119 @@
+"""Live notification event stream for LLM Notify MCP."""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """A single event stream subscriber with a bounded buffer."""
+
+    def __init__(
+        self,
+        buffer_size: int,
+        sources: set[str] | None = None,
+        priorities: set[str] | None = None
+    ):
+        # deque(maxlen) drops the oldest event when a slow consumer falls behind
+        self.buffer: deque[dict] = deque(maxlen=buffer_size)
+        self.sources = sources
+        self.priorities = priorities
+        self.dropped = 0
+        self._ready = asyncio.Event()
+
+    def matches(self, event: dict) -> bool:
+        """Check whether an event passes this subscriber's filters."""
+        if self.sources is not None and event.get("source") not in self.sources:
+            return False
+        if self.priorities is not None and event.get("priority") not in self.priorities:
+            return False
+        return True
+
+    def push(self, event: dict):
+        """Buffer an event without ever blocking the publisher."""
+        if len(self.buffer) == self.buffer.maxlen:
+            self.dropped += 1
+        self.buffer.append(event)
+        self._ready.set()
+
+    async def wait(self, timeout: float) -> list[dict]:
+        """Wait for buffered events and return them all."""
+        if not self.buffer:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except TimeoutError:
+                return []
+        events = list(self.buffer)
+        self.buffer.clear()
+        return events
+
+
+class EventBroadcaster:
+    """Fan-out of notification events to many live subscribers."""
+
+    def __init__(self, buffer_size: int = 100):
+        self.buffer_size = buffer_size
+        self.subscribers: set[Subscription] = set()
+        self._next_id = 0
+
+    def subscribe(
+        self,
+        sources: set[str] | None = None,
+        priorities: set[str] | None = None
+    ) -> Subscription:
+        """Register a new subscriber."""
+        subscription = Subscription(self.buffer_size, sources, priorities)
+        self.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a subscriber."""
+        self.subscribers.discard(subscription)
+
+    def publish(self, event_type: str, **fields):
+        """Broadcast an event to every matching subscriber."""
+        if not self.subscribers:
+            return
+
+        self._next_id += 1
+        event = {
+            "id": self._next_id,
+            "type": event_type,
+            "timestamp": time.time(),
+            **fields,
+        }
+        for subscription in self.subscribers:
+            if subscription.matches(event):
+                subscription.push(event)
+
+    async def stream(
+        self,
+        subscription: Subscription,
+        is_disconnected: Callable[[], Awaitable[bool]],
+        keepalive: float = 15.0
+    ) -> AsyncIterator[str]:
+        """Yield Server-Sent Events for a subscription until the client leaves."""
+        reported_drops = 0
+        try:
+            while not await is_disconnected():
+                events = await subscription.wait(keepalive)
+                if not events:
+                    yield ": keepalive\n\n"
+                    continue
+
+                if subscription.dropped > reported_drops:
+                    lost = subscription.dropped - reported_drops
+                    reported_drops = subscription.dropped
+                    yield f"event: dropped\ndata: {json.dumps({'count': lost})}\n\n"
+
+                for event in events:
+                    data = json.dumps(event)
+                    yield f"id: {event['id']}\nevent: {event['type']}\ndata: {data}\n\n"
+        finally:
+            self.unsubscribe(subscription)
@@ -0,0 +1,181 @@
+"""Listening socket handoff between server processes for restarts.
+
+A running server listens on a unix control socket in the run directory. A
+replacement started with --restart takes over as follows, one JSON line per
+message:
+
+    new -> old  {"op": "handoff"}
+    old -> new  {"op": "socket"}, with the listening socket attached
+    new -> old  {"op": "release"}, once the new process is serving
+    old -> new  {"op": "done"}, after the old process saved its queue
+
+Both processes accept connections on the shared socket in between, so
+clients never see it closed.
+"""
+
+import asyncio
+import json
+import logging
+import socket
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+CONTROL_SOCKET = "control.sock"
+
+
+def _message(op: str) -> bytes:
+    return json.dumps({"op": op}).encode() + b"\n"
+
+
+async def _read_op(conn: socket.socket, buffer: bytearray) -> str | None:
+    """Read the next message's op from a non-blocking socket, or None at EOF."""
+    loop = asyncio.get_running_loop()
+    while b"\n" not in buffer:
+        data = await loop.sock_recv(conn, 1024)
+        if not data:
+            return None
+        buffer += data
+    line, _, rest = bytes(buffer).partition(b"\n")
+    buffer[:] = rest
+    try:
+        return json.loads(line).get("op")
+    except (ValueError, AttributeError):
+        return None
+
+
+def take_over(path: Path, timeout: float = 5.0) -> tuple[socket.socket, socket.socket]:
+    """Ask the running server for its listening socket.
+
+    Returns the listening socket and the control connection, which must be
+    passed to Handoff so the old server is told when to let go. Raises
+    OSError if no server answers.
+    """
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.settimeout(timeout)
+        conn.connect(str(path))
+        conn.sendall(_message("handoff"))
+        _, fds, _, _ = socket.recv_fds(conn, 1024, 1)
+        if not fds:
+            raise ConnectionError("Running server did not send its socket")
+    except BaseException:
+        conn.close()
+        raise
+    return socket.socket(fileno=fds[0]), conn
+
+
+class Handoff:
+    """Control socket through which a replacement process takes over.
+
+    `request_exit` is called when a successor is serving and this process
+    should shut down; `released` is then True, so shutdown can skip draining
+    and save the queue for the successor instead.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        listener: socket.socket,
+        request_exit: Callable[[], None],
+        predecessor: socket.socket | None = None
+    ):
+        self.path = path
+        self.listener = listener
+        self.request_exit = request_exit
+        self.predecessor = predecessor
+        self.released = False
+        self._control: socket.socket | None = None
+        self._successor: socket.socket | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def start(self, on_predecessor_done: Callable[[], Awaitable[None]]):
+        """Listen for successors, and release the predecessor if any.
+
+        `on_predecessor_done` runs once the predecessor has saved its queue.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # A predecessor's control socket file is replaced; its open
+        # connection to us is unaffected
+        self.path.unlink(missing_ok=True)
+        self._control = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._control.bind(str(self.path))
+        self._control.listen()
+        self._control.setblocking(False)
+        self._spawn(self._serve())
+
+        if self.predecessor is not None:
+            self._spawn(self._release_predecessor(on_predecessor_done))
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _serve(self):
+        """Accept successors on the control socket."""
+        loop = asyncio.get_running_loop()
+        while True:
+            conn, _ = await loop.sock_accept(self._control)
+            self._spawn(self._hand_over(conn))
+
+    async def _hand_over(self, conn: socket.socket):
+        """Give a successor the listening socket, then wait to be released."""
+        buffer = bytearray()
+        try:
+            if await _read_op(conn, buffer) != "handoff" or self.released:
+                conn.close()
+                return
+            socket.send_fds(conn, [_message("socket")], [self.listener.fileno()])
+            logger.info("Listening socket handed to a new server process")
+
+            if await _read_op(conn, buffer) != "release":
+                # The successor failed to start; keep serving
+                conn.close()
+                return
+        except OSError as e:
+            logger.warning(f"Handoff failed: {e}")
+            conn.close()
+            return
+
+        logger.info("New server process is serving, shutting down")
+        self.released = True
+        self._successor = conn
+        self.request_exit()
+
+    async def _release_predecessor(
+        self, on_done: Callable[[], Awaitable[None]]
+    ):
+        """Tell the old process to exit and pick up its queue once it has."""
+        conn = self.predecessor
+        conn.setblocking(False)
+        try:
+            await asyncio.get_running_loop().sock_sendall(conn, _message("release"))
+            if await _read_op(conn, bytearray()) != "done":
+                logger.warning("Previous server exited without confirming handoff")
+        except OSError as e:
+            logger.warning(f"Lost contact with previous server: {e}")
+        finally:
+            conn.close()
+            self.predecessor = None
+        await on_done()
+
+    async def finish(self):
+        """Stop listening and tell a successor this process is done."""
+        for task in list(self._tasks):
+            if task is not asyncio.current_task():
+                task.cancel()
+        if self._control is not None:
+            self._control.close()
+            # After a handoff the path belongs to the successor
+            if not self.released:
+                self.path.unlink(missing_ok=True)
+        if self._successor is not None:
+            try:
+                self._successor.setblocking(True)
+                self._successor.sendall(_message("done"))
+            except OSError as e:
+                logger.warning(f"Could not confirm handoff: {e}")
+            self._successor.close()
+            self._successor = None
@@ -0,0 +1,88 @@
+"""Backend health tracking and circuit breaking for LLM Notify MCP."""
+
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Circuit states: closed (in use) -> open (skipped) -> half_open (one probe)
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class BackendHealth:
+    """Latency, failure counts and a circuit breaker for one speech backend.
+
+    After `failure_threshold` consecutive failures the circuit opens and the
+    backend is skipped. Once `reset_timeout` has passed, one request is let
+    through as a probe: success closes the circuit, failure reopens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        alpha: float = 0.2
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.alpha = alpha
+        self.state = CLOSED
+        self.latency: float | None = None  # EWMA of successful run times
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+
+    def allow(self) -> bool:
+        """Check whether the backend should be tried now."""
+        if self.state == CLOSED:
+            return True
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return False
+
+        # Let one probe through; restart the timer in case it never reports
+        self.state = HALF_OPEN
+        self._opened_at = time.monotonic()
+        logger.info(f"Probing speech backend {self.name}")
+        return True
+
+    def record_success(self, latency: float):
+        """Record a successful run."""
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += self.alpha * (latency - self.latency)
+        self.successes += 1
+        self.consecutive_failures = 0
+        if self.state != CLOSED:
+            logger.info(f"Speech backend {self.name} recovered")
+            self.state = CLOSED
+
+    def record_failure(self):
+        """Record a failed or timed out run."""
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or (
+            self.state == CLOSED
+            and self.consecutive_failures >= self.failure_threshold
+        ):
+            logger.warning(
+                f"Speech backend {self.name} disabled for {self.reset_timeout:.0f}s "
+                f"after {self.consecutive_failures} failures"
+            )
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+
+    def snapshot(self) -> dict:
+        """Current health as a JSON-serializable dict."""
+        return {
+            "state": self.state,
+            "latency": self.latency,
+            "successes": self.successes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+        }
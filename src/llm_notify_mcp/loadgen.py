@@ -0,0 +1,225 @@
+"""Multi-agent load generator for a running LLM Notify MCP server."""
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Iterator
+
+from .client import NotificationClient
+from .metrics import percentile
+
+ARRIVALS = ("constant", "poisson", "burst")
+
+# Share of notifications per priority, roughly what an agent fleet sends
+PRIORITY_WEIGHTS = {"high": 1, "normal": 6, "low": 3}
+
+
+def arrival_intervals(
+    arrival: str,
+    rate: float,
+    burst_size: int = 10,
+    rng: random.Random | None = None
+) -> Iterator[float]:
+    """Seconds to wait before each notification, averaging `rate` per second.
+
+    "constant" spaces notifications evenly, "poisson" draws exponential gaps
+    and "burst" sends `burst_size` back to back, then pauses.
+    """
+    rng = rng or random.Random()
+    while True:
+        if arrival == "constant":
+            yield 1 / rate
+        elif arrival == "poisson":
+            yield rng.expovariate(rate)
+        elif arrival == "burst":
+            yield burst_size / rate
+            for _ in range(burst_size - 1):
+                yield 0.0
+        else:
+            raise ValueError(f"Unknown arrival pattern: {arrival}")
+
+
+class LoadStats:
+    """Client-observed outcomes, for the whole run and the current interval."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.sent = 0
+        self.statuses: dict[int, int] = {}
+        self.latencies: list[float] = []
+        self.window: list[float] = []
+        self.window_sent = 0
+        self.window_limited = 0
+        self.window_errors = 0
+
+    def record(self, status: int, latency: float):
+        """Record one submitted notification."""
+        self.sent += 1
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.window_sent += 1
+        if status == 200:
+            self.latencies.append(latency)
+            self.window.append(latency)
+        elif status == 429:
+            self.window_limited += 1
+        else:
+            self.window_errors += 1
+
+    def interval_line(self) -> str:
+        """Summarize the interval since the last call and start a new one."""
+        latencies = sorted(self.window)
+        sent = self.window_sent
+        line = (
+            f"[{time.monotonic() - self.started:6.1f}s] sent {sent:5d}  "
+            f"{_latency_summary(latencies)}  "
+            f"429 {_share(self.window_limited, sent)}  errors {self.window_errors}"
+        )
+        self.window = []
+        self.window_sent = self.window_limited = self.window_errors = 0
+        return line
+
+    def summary(self) -> dict:
+        """Totals for the whole run."""
+        latencies = sorted(self.latencies)
+        elapsed = time.monotonic() - self.started
+        return {
+            "sent": self.sent,
+            "accepted": self.statuses.get(200, 0),
+            "rate_limited": self.statuses.get(429, 0),
+            "rejected": self.statuses.get(503, 0),
+            "errors": self.sent - sum(
+                self.statuses.get(status, 0) for status in (200, 429, 503)
+            ),
+            "throughput": self.sent / elapsed if elapsed else 0.0,
+            "latency_p50": percentile(latencies, 50),
+            "latency_p95": percentile(latencies, 95),
+            "latency_p99": percentile(latencies, 99),
+            "latency_max": latencies[-1] if latencies else None,
+        }
+
+
+def _share(count: int, total: int) -> str:
+    return f"{100 * count / total:5.1f}%" if total else "    -"
+
+
+def _ms(value: float | None) -> str:
+    return "-" if value is None else f"{value * 1000:.1f}ms"
+
+
+def _latency_summary(latencies: list[float]) -> str:
+    return (
+        f"p50 {_ms(percentile(latencies, 50))}  "
+        f"p95 {_ms(percentile(latencies, 95))}  "
+        f"p99 {_ms(percentile(latencies, 99))}"
+    )
+
+
+def format_summary(summary: dict) -> str:
+    """Human-readable final summary."""
+    sent = summary["sent"]
+    return "\n".join([
+        f"Sent:       {sent} ({summary['throughput']:.1f}/s)",
+        f"Accepted:   {summary['accepted']}",
+        f"Limited:    {summary['rate_limited']} "
+        f"({_share(summary['rate_limited'], sent).strip()} got 429)",
+        f"Rejected:   {summary['rejected']} (503)",
+        f"Errors:     {summary['errors']}",
+        f"Latency:    p50 {_ms(summary['latency_p50'])}, "
+        f"p95 {_ms(summary['latency_p95'])}, "
+        f"p99 {_ms(summary['latency_p99'])}, "
+        f"max {_ms(summary['latency_max'])}",
+    ])
+
+
+async def _agent(
+    index: int,
+    client: NotificationClient,
+    stats: LoadStats,
+    intervals: Iterator[float],
+    rate: float,
+    deadline: float,
+    rng: random.Random
+):
+    """Send notifications from one simulated agent until the deadline."""
+    loop = asyncio.get_running_loop()
+    priorities, weights = zip(*PRIORITY_WEIGHTS.items(), strict=True)
+    # Stagger agents so constant arrivals do not all land at once
+    next_send = loop.time() + rng.uniform(0, 1 / rate)
+    step = 0
+    for interval in intervals:
+        next_send += interval
+        if next_send >= deadline:
+            return
+        # Scheduled sends stay on time even if a previous request was slow
+        await asyncio.sleep(max(0.0, next_send - loop.time()))
+
+        step += 1
+        priority = rng.choices(priorities, weights)[0]
+        started = time.perf_counter()
+        status, _ = await client.submit_with_status(
+            f"Agent {index} step {step} finished", priority, f"agent-{index}"
+        )
+        stats.record(status, time.perf_counter() - started)
+
+
+async def run_load_test(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    auth_token: str | None = None,
+    transport: str = "http",
+    agents: int = 10,
+    rate: float = 1.0,
+    duration: float = 30.0,
+    arrival: str = "poisson",
+    burst_size: int = 10,
+    report_interval: float | None = 1.0,
+    seed: int | None = None
+) -> dict:
+    """Run simulated agents against a server and return the final summary.
+
+    Every agent has its own client and connection and sends at `rate`
+    notifications per second on average. With `report_interval`, a line with
+    the interval's latency percentiles, 429 share and errors is printed.
+    """
+    if arrival not in ARRIVALS:
+        raise ValueError(f"Arrival must be one of {', '.join(ARRIVALS)}")
+
+    # Outcomes are counted, so per-request client warnings would only be noise
+    logging.getLogger("llm_notify_mcp.client").setLevel(logging.CRITICAL)
+
+    rng = random.Random(seed)
+    stats = LoadStats()
+    clients = [
+        NotificationClient(host, port, auth_token, transport=transport)
+        for _ in range(agents)
+    ]
+    deadline = asyncio.get_running_loop().time() + duration
+
+    async def report():
+        while True:
+            await asyncio.sleep(report_interval)
+            print(stats.interval_line(), flush=True)
+
+    reporter = asyncio.create_task(report()) if report_interval else None
+    try:
+        await asyncio.gather(*(
+            _agent(
+                index,
+                client,
+                stats,
+                arrival_intervals(
+                    arrival, rate, burst_size, random.Random(rng.random())
+                ),
+                rate,
+                deadline,
+                random.Random(rng.random())
+            )
+            for index, client in enumerate(clients)
+        ))
+    finally:
+        if reporter is not None:
+            reporter.cancel()
+        await asyncio.gather(*(client.close() for client in clients))
+
+    return stats.summary()
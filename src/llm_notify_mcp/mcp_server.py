@@ -2,14 +2,20 @@
 
 import asyncio
 import logging
+import subprocess
+import sys
+import time
 from typing import Any
 
 from mcp.server.fastmcp import FastMCP
 from mcp.server.models import InitializationOptions
 from mcp.types import Tool, TextContent
 
+from .client import NotificationClient
 from .config import Config
+from .dispatch import AdmissionRejectedError
 from .server import NotificationServer, NotificationRequest
+from .stats import WINDOWS, format_stats
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -21,6 +27,14 @@ mcp = FastMCP("LLM Notify MCP")
 # Global notification server instance
 _notification_server: NotificationServer | None = None
 
+# Longest a notify(wait=True) call blocks before returning the current state
+NOTIFY_WAIT_TIMEOUT = 60.0
+
+# Forwarding state (used when notify calls go to the shared daemon)
+_forward_override: bool | None = None
+_forward_client: NotificationClient | None = None
+_daemon_lock: asyncio.Lock | None = None
+
 
 def get_notification_server() -> NotificationServer:
     """Get or create the notification server instance."""
@@ -31,22 +45,170 @@ def get_notification_server() -> NotificationServer:
     return _notification_server
 
 
+def is_forwarding() -> bool:
+    """Check whether notify calls are forwarded to the shared daemon."""
+    if _forward_override is not None:
+        return _forward_override
+    return get_notification_server().config.mcp_forward
+
+
+def get_forward_client() -> NotificationClient:
+    """Get or create the pooled client used to reach the shared daemon."""
+    global _forward_client
+    if _forward_client is None:
+        config = get_notification_server().config
+        _forward_client = NotificationClient(
+            host=config.host,
+            port=config.port,
+            auth_token=config.auth_token,
+            run_dir=config.get_run_dir()
+        )
+    return _forward_client
+
+
+def _spawn_daemon(config: Config):
+    """Start the notification daemon as a detached background process."""
+    cmd = [
+        sys.executable, "-m", "llm_notify_mcp.cli",
+        "--start-daemon",
+        "--host", config.host,
+        "--port", str(config.port),
+    ]
+    subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+
+
+async def ensure_daemon() -> bool:
+    """Make sure the shared daemon is running, starting it if allowed."""
+    global _daemon_lock
+    client = get_forward_client()
+    # The ready file answers without a round trip to the daemon
+    if client.is_ready() or await client.health_check():
+        return True
+
+    config = get_notification_server().config
+    if not config.daemon_autostart:
+        return False
+
+    if _daemon_lock is None:
+        _daemon_lock = asyncio.Lock()
+
+    async with _daemon_lock:
+        # Another tool call may have started it while we waited
+        if client.is_ready() or await client.health_check():
+            return True
+
+        logger.info(f"Starting notification daemon on {config.host}:{config.port}")
+        _spawn_daemon(config)
+
+        deadline = time.monotonic() + config.daemon_start_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.2)
+            if client.is_ready() or await client.health_check():
+                return True
+
+    logger.error("Notification daemon did not become healthy in time")
+    return False
+
+
+def _describe_status(notification_id: str, record: dict | None) -> str:
+    """Render a delivery status record for the model."""
+    if record is None:
+        return (
+            f"Unknown notification id '{notification_id}' "
+            "(it may have expired from the status table)"
+        )
+
+    state = record["state"]
+    if state == "queued":
+        position = record.get("position")
+        if position is None:
+            return f"Notification {notification_id} is queued"
+        return f"Notification {notification_id} is queued ({position} ahead of it)"
+    if state == "speaking":
+        return f"Notification {notification_id} is being spoken now"
+    if state == "delivered":
+        return f"Notification {notification_id} was delivered: '{record['message']}'"
+    detail = f": {record['error']}" if record.get("error") else ""
+    return f"Notification {notification_id} {state}{detail}"
+
+
+async def _queue_locally(request: NotificationRequest, wait: bool) -> str:
+    """Queue a notification on the in-process server."""
+    server = get_notification_server()
+    try:
+        # Admitted like an HTTP notification: relayed, published and counted
+        entry = server._accept(request)
+    except AdmissionRejectedError as e:
+        server.stats.record(request.source, rejected=True)
+        return (
+            f"Error: Notification rejected, {e}. "
+            "Try again later or use high priority."
+        )
+    if entry is None:
+        return f"Notification relayed: '{request.message}'"
+    if wait:
+        record = await server.tracker.wait(entry.id, NOTIFY_WAIT_TIMEOUT)
+        return _describe_status(entry.id, record)
+    return f"Notification queued (id: {entry.id}): '{request.message}'"
+
+
+async def _forward_notification(request: NotificationRequest, wait: bool) -> str:
+    """Forward a notification to the shared daemon."""
+    if not await ensure_daemon():
+        # Fall back to in-process delivery so the user still hears it
+        logger.warning("Daemon unavailable, delivering notification locally")
+        result = await _queue_locally(request, wait)
+        return f"{result} (delivered locally, daemon unavailable)"
+
+    client = get_forward_client()
+    status_code, notification_id = await client.submit_with_status(
+        request.message, request.priority, request.source
+    )
+    if status_code == 503:
+        return (
+            "Error: Notification rejected, the daemon would miss its latency "
+            "SLO. Try again later or use high priority."
+        )
+    if status_code == 429:
+        return "Error: Notification rate limit exceeded. Try again later."
+    if notification_id is None:
+        return "Error: Notification daemon rejected the notification (see daemon log)"
+    if wait:
+        record = await client.wait_for_delivery(notification_id, NOTIFY_WAIT_TIMEOUT)
+        return _describe_status(notification_id, record)
+    return (
+        f"Notification queued via daemon (id: {notification_id}): "
+        f"'{request.message}'"
+    )
+
+
 @mcp.tool()
 async def notify(
     message: str,
     priority: str = "normal",
-    source: str | None = None
+    source: str | None = None,
+    wait: bool = False
 ) -> str:
     """
     Send a notification to the user via text-to-speech and visual notification.
-    
+
+    By default this returns as soon as the notification is queued, with an id
+    that can be passed to `notification_status`.
+
     Args:
         message: The message to speak and display (max 140 characters)
         priority: Priority level - "low", "normal", or "high" (default: "normal")
         source: Optional source identifier for the notification
-    
+        wait: Wait until the message has been spoken before returning
+
     Returns:
-        Success message or error details
+        Notification id and status, or error details
     """
     try:
         # Validate message length
@@ -64,11 +226,11 @@ async def notify(
             source=source
         )
         
-        # Send notification
-        server = get_notification_server()
-        await server._send_notification(request)
-        
-        return f"Notification sent successfully: '{message}'"
+        # Forward to the shared daemon when enabled
+        if is_forwarding():
+            return await _forward_notification(request, wait)
+
+        return await _queue_locally(request, wait)
         
     except Exception as e:
         error_msg = f"Failed to send notification: {str(e)}"
@@ -76,6 +238,68 @@ async def notify(
         return error_msg
 
 
+@mcp.tool()
+async def notification_status(notification_id: str) -> str:
+    """
+    Check the delivery status of a notification sent with `notify`.
+
+    Args:
+        notification_id: The id returned by `notify`
+
+    Returns:
+        Queue position, or whether it was delivered, failed or dropped
+    """
+    try:
+        if is_forwarding():
+            record = await get_forward_client().get_status(notification_id)
+            if record is not None:
+                return _describe_status(notification_id, record)
+            # It may have been delivered locally while the daemon was down
+
+        server = get_notification_server()
+        record = server.tracker.get(notification_id)
+        if record is not None:
+            position = server.dispatcher.position(notification_id)
+            record = {**record, "position": position}
+        return _describe_status(notification_id, record)
+
+    except Exception as e:
+        error_msg = f"Failed to get notification status: {str(e)}"
+        logger.error(error_msg)
+        return error_msg
+
+
+@mcp.tool()
+async def usage_stats(window: str = "", top: int = 10) -> str:
+    """
+    Show which sources send the most notifications and use the most speech time.
+
+    Args:
+        window: "1m", "1h" or "24h" (default: all three)
+        top: Number of sources to list per window (default: 10)
+
+    Returns:
+        Per-source counts, rejection rates and seconds spoken
+    """
+    try:
+        if window and window not in WINDOWS:
+            choices = ", ".join(WINDOWS)
+            return f"Error: Invalid window '{window}'. Must be one of {choices}."
+
+        snapshot = None
+        if is_forwarding():
+            snapshot = await get_forward_client().get_stats(window or None, top)
+        if snapshot is None:
+            # Not forwarding, or the daemon is down: report this process
+            snapshot = get_notification_server().stats.snapshot(window or None, top)
+        return format_stats(snapshot)
+
+    except Exception as e:
+        error_msg = f"Failed to get usage statistics: {str(e)}"
+        logger.error(error_msg)
+        return error_msg
+
+
 @mcp.tool()
 async def test_notification() -> str:
     """
@@ -157,8 +381,11 @@ async def configure_notifications(
         config.save()
         
         # Update global server instance
-        global _notification_server
+        global _notification_server, _forward_client
         _notification_server = NotificationServer(config)
+        if _forward_client is not None:
+            await _forward_client.close()
+            _forward_client = None
         
         voice_desc = "System default" if not voice else voice
         return (
@@ -175,10 +402,10 @@ async def configure_notifications(
         return error_msg
 
 
-def main():
+def main(forward: bool | None = None):
     """Main entry point for the MCP server."""
-    import sys
-    
+    global _forward_override
+
     # Log startup
     logger.info("Starting LLM Notify MCP server...")
     
@@ -186,6 +413,11 @@ def main():
         # Initialize notification server to validate configuration
         get_notification_server()
         logger.info("Notification server initialized successfully")
+
+        if forward is not None:
+            _forward_override = forward
+        if is_forwarding():
+            logger.info("Forwarding notifications to the shared daemon")
         
         # Run the MCP server
         mcp.run()
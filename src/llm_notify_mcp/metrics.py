@@ -0,0 +1,37 @@
+"""In-process metrics for LLM Notify MCP."""
+
+import time
+from collections import defaultdict
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile of a sorted list, or None if it is empty."""
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, round(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+class Metrics:
+    """Counters and gauges exposed on the /metrics endpoint."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.counters: dict[str, float] = defaultdict(float)
+        self.gauges: dict[str, float] = {}
+
+    def incr(self, name: str, value: float = 1):
+        """Increase a counter."""
+        self.counters[name] += value
+
+    def set(self, name: str, value: float):
+        """Set a gauge to its current value."""
+        self.gauges[name] = value
+
+    def snapshot(self) -> dict:
+        """Return all metrics as plain data."""
+        return {
+            "uptime": time.time() - self.started,
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+        }
@@ -0,0 +1,72 @@
+"""Request and response models for LLM Notify MCP."""
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+
+class NotificationRequest(BaseModel):
+    """Request model for notifications."""
+
+    message: str = Field(..., max_length=140, description="Notification message")
+    priority: str = Field("normal", description="Priority level")
+    source: str | None = Field(None, description="Source identifier")
+    deliver_at: float | None = Field(
+        None, description="Unix time before which it is not delivered"
+    )
+    expires_at: float | None = Field(
+        None, description="Unix time after which it is dropped undelivered"
+    )
+
+    @field_validator("message")
+    @classmethod
+    def validate_message(cls, v):
+        if len(v.strip()) == 0:
+            raise ValueError("Message cannot be empty")
+        return v.strip()
+
+    @field_validator("priority")
+    @classmethod
+    def validate_priority(cls, v):
+        if v not in ["low", "normal", "high"]:
+            raise ValueError("Priority must be 'low', 'normal', or 'high'")
+        return v
+
+    @model_validator(mode="after")
+    def validate_times(self):
+        if (
+            self.deliver_at is not None
+            and self.expires_at is not None
+            and self.expires_at <= self.deliver_at
+        ):
+            raise ValueError("expires_at must be after deliver_at")
+        return self
+
+
+class NotificationBatch(BaseModel):
+    """Request model for several notifications at once (used by relays)."""
+
+    notifications: list[NotificationRequest] = Field(..., max_length=100)
+
+
+class NotificationResponse(BaseModel):
+    """Response model for notifications."""
+
+    success: bool
+    message: str
+    timestamp: float
+    id: str | None = None
+    projected_delay: float | None = None  # seconds until it should be spoken
+
+
+class NotificationStatus(BaseModel):
+    """Delivery status of a single notification."""
+
+    id: str
+    state: str
+    message: str
+    priority: str
+    source: str | None = None
+    created: float
+    updated: float
+    error: str | None = None
+    digest_id: str | None = None
+    position: int | None = None  # Entries ahead of it while queued
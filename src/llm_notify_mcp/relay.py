@@ -0,0 +1,201 @@
+"""Relay of accepted notifications to downstream notifiers."""
+
+import asyncio
+import logging
+from collections import deque
+
+import aiohttp
+
+from .config import Config
+from .models import NotificationRequest
+
+logger = logging.getLogger(__name__)
+
+# Marks requests that already came through a relay, so they are not relayed again
+RELAY_HEADER = "X-LLM-Notify-Relayed"
+
+# Statuses worth retrying, for whole batches and single items alike
+RETRYABLE_STATUSES = (429, 502, 503, 504)
+
+
+async def _refused_items(
+    response: aiohttp.ClientResponse, batch: list[dict]
+) -> list[tuple[dict, int]]:
+    """Items of a batch the target refused, with their per-item status."""
+    try:
+        results = (await response.json()).get("results")
+    except (aiohttp.ClientError, ValueError, AttributeError):
+        results = None
+    if not isinstance(results, list) or len(results) != len(batch):
+        # No per-item results to go by; the batch as a whole was accepted
+        return []
+    return [
+        (item, result.get("status", 0))
+        for item, result in zip(batch, results, strict=True)
+        if isinstance(result, dict) and not result.get("success")
+    ]
+
+
+class RelayTarget:
+    """A downstream notifier with its own bounded queue and worker."""
+
+    def __init__(self, url: str, queue_size: int):
+        self.url = url.rstrip("/")
+        # deque(maxlen) drops the oldest pending notification when full
+        self.queue: deque[dict] = deque(maxlen=queue_size)
+        self.ready = asyncio.Event()
+        self.worker: asyncio.Task | None = None
+        self.sent = 0
+        self.dropped = 0
+        self.failures = 0
+
+
+class RelayForwarder:
+    """Forwards notifications to several downstream servers independently.
+
+    Every target has its own queue and worker, so a slow or dead downstream
+    only delays its own traffic. Workers share one pooled HTTP session and
+    send whatever has queued up as a single batch.
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.targets = [
+            RelayTarget(url, config.relay_queue_size) for url in config.relay_targets
+        ]
+        self._session: aiohttp.ClientSession | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def forward(self, request: NotificationRequest):
+        """Queue a notification for every downstream target."""
+        self._ensure_workers()
+        payload = request.model_dump(exclude_none=True)
+        for target in self.targets:
+            if len(target.queue) == target.queue.maxlen:
+                target.dropped += 1
+            target.queue.append(payload)
+            target.ready.set()
+
+    def _ensure_workers(self):
+        """Start one worker per target on the running loop if needed."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and all(
+            target.worker is not None and not target.worker.done()
+            for target in self.targets
+        ):
+            return
+
+        if self._loop is not loop:
+            self._session = None
+            for target in self.targets:
+                target.ready = asyncio.Event()
+                target.worker = None
+            self._loop = loop
+
+        for target in self.targets:
+            if target.worker is None or target.worker.done():
+                target.worker = loop.create_task(self._run(target))
+                if target.queue:
+                    target.ready.set()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the pooled session shared by all targets."""
+        if self._session is None or self._session.closed:
+            headers = {RELAY_HEADER: "1"}
+            if self.config.relay_auth_token:
+                headers["Authorization"] = f"Bearer {self.config.relay_auth_token}"
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=2),
+                timeout=aiohttp.ClientTimeout(total=self.config.relay_timeout),
+                headers=headers
+            )
+        return self._session
+
+    async def close(self):
+        """Stop the workers and close the pooled session."""
+        for target in self.targets:
+            if target.worker is not None:
+                target.worker.cancel()
+                try:
+                    await target.worker
+                except asyncio.CancelledError:
+                    pass
+                target.worker = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _run(self, target: RelayTarget):
+        """Send batches to one target until cancelled."""
+        while True:
+            if not target.queue:
+                target.ready.clear()
+                await target.ready.wait()
+                continue
+
+            batch = []
+            while target.queue and len(batch) < self.config.relay_batch_size:
+                batch.append(target.queue.popleft())
+
+            sent = await self._send(target, batch)
+            target.sent += sent
+            target.dropped += len(batch) - sent
+
+    async def _send(self, target: RelayTarget, batch: list[dict]) -> int:
+        """Send one batch with bounded retries and exponential backoff.
+
+        Items the target refuses individually (e.g. 503 from its own SLO
+        admission) are retried on their own. Returns how many it accepted.
+        """
+        delay = self.config.relay_retry_delay
+        accepted = 0
+        for attempt in range(self.config.relay_max_retries + 1):
+            try:
+                session = self._get_session()
+                async with session.post(
+                    f"{target.url}/notify/batch", json={"notifications": batch}
+                ) as response:
+                    if response.status < 400:
+                        refused = await _refused_items(response, batch)
+                        accepted += len(batch) - len(refused)
+                        batch = [
+                            item for item, status in refused
+                            if status in RETRYABLE_STATUSES
+                        ]
+                        if not batch:
+                            return accepted
+                        reason = f"{len(batch)} notifications refused"
+                    elif response.status not in RETRYABLE_STATUSES:
+                        # Auth or validation errors will not fix themselves
+                        logger.error(
+                            f"Relay to {target.url} rejected: {response.status}"
+                        )
+                        return accepted
+                    else:
+                        reason = f"HTTP {response.status}"
+            except (aiohttp.ClientError, TimeoutError) as e:
+                reason = str(e) or type(e).__name__
+
+            target.failures += 1
+            if attempt < self.config.relay_max_retries:
+                logger.warning(
+                    f"Relay to {target.url} failed ({reason}), retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+                delay *= 2
+
+        logger.error(f"Dropping {len(batch)} notifications for {target.url}")
+        return accepted
+
+    def stats(self) -> list[dict]:
+        """Per-target delivery counters."""
+        return [
+            {
+                "url": target.url,
+                "pending": len(target.queue),
+                "sent": target.sent,
+                "dropped": target.dropped,
+                "failures": target.failures,
+            }
+            for target in self.targets
+        ]
@@ -0,0 +1,218 @@
+"""Accelerated replay of recorded traffic traces against simulated backends."""
+
+import asyncio
+import selectors
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from .config import Config
+from .estimator import SpeechEstimator
+from .metrics import percentile
+from .models import NotificationRequest
+from .server import NotificationServer
+from .trace import read_trace
+from .tracking import DELIVERED, DROPPED, FAILED
+
+
+class ReplayClock:
+    """Trace time for a replay: real time scaled by `speed`, or virtual.
+
+    A virtual clock only moves when the event loop would otherwise sleep,
+    and then jumps straight to the next timer, so a replay runs as fast as
+    the CPU allows while every component sees consistent trace time.
+    """
+
+    def __init__(self, speed: float = 1.0, virtual: bool = False):
+        self.speed = speed
+        self.virtual = virtual
+        self._real_monotonic = time.monotonic
+        self._start = self._real_monotonic()
+        self._elapsed = 0.0
+
+    def now(self) -> float:
+        """Seconds of trace time since the replay started."""
+        if self.virtual:
+            return self._elapsed
+        return (self._real_monotonic() - self._start) * self.speed
+
+    def advance(self, seconds: float):
+        """Move a virtual clock forward."""
+        self._elapsed += seconds
+
+    @contextmanager
+    def installed(self, epoch: float) -> Iterator[None]:
+        """Make time.time() and time.monotonic() follow this clock.
+
+        The event loop, rate limiter, dispatcher and tracker all read these,
+        so they stay consistent with each other at any replay speed.
+        """
+        real_time, real_monotonic = time.time, time.monotonic
+        time.time = lambda: epoch + self.now()
+        time.monotonic = self.now
+        try:
+            yield
+        finally:
+            time.time, time.monotonic = real_time, real_monotonic
+
+
+class ReplaySelector(selectors.DefaultSelector):
+    """Selector that waits in trace time instead of real time."""
+
+    def __init__(self, clock: ReplayClock):
+        super().__init__()
+        self.clock = clock
+
+    def select(self, timeout: float | None = None):
+        if timeout is None or timeout <= 0:
+            return super().select(timeout)
+        if not self.clock.virtual:
+            return super().select(timeout / self.clock.speed)
+
+        ready = super().select(0)
+        if not ready:
+            self.clock.advance(timeout)
+        return ready
+
+
+class SimulatedServer(NotificationServer):
+    """Notification server whose backends only take time, without output."""
+
+    def __init__(self, config: Config):
+        super().__init__(config)
+        # An uncalibrated estimator stands in for the real `say` timing
+        self.speech_model = SpeechEstimator()
+
+    async def _run_speech(self, cmd: list[str], timeout: float):
+        rate = self.config.speech_rate
+        if "-r" in cmd:
+            rate = int(cmd[cmd.index("-r") + 1])
+        await asyncio.sleep(self.speech_model.estimate(cmd[-1], rate))
+
+    async def _send_visual_notification(self, message: str, priority: str):
+        pass
+
+    async def _play_sound(self):
+        pass
+
+    async def _record_history(self, request: NotificationRequest):
+        pass
+
+
+async def _replay(
+    server: NotificationServer,
+    rows: list[tuple[float, str, dict]]
+) -> dict:
+    """Feed trace rows into a server and wait for every delivery."""
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    arrivals: dict[str, float] = {}
+    statuses: dict[int, int] = {}
+
+    for offset, client, frame in rows:
+        delay = offset - (loop.time() - start)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        reply = server._admit_frame(frame, client)
+        if reply["type"] == "ack":
+            arrivals[reply["id"]] = time.time()
+        else:
+            statuses[reply["status"]] = statuses.get(reply["status"], 0) + 1
+
+    # Long enough for anything still queued; the queue cannot grow any more
+    for notification_id in arrivals:
+        await server.tracker.wait(notification_id, timeout=86400)
+
+    latencies = []
+    failed = digested = dropped = expired = 0
+    for notification_id, arrived in arrivals.items():
+        record = server.tracker.get(notification_id)
+        if record["digest_id"] is not None:
+            digested += 1
+        if record["state"] == DELIVERED:
+            latencies.append(record["updated"] - arrived)
+        elif record["state"] == FAILED:
+            failed += 1
+        elif record["state"] == DROPPED:
+            dropped += 1
+            if record["error"] and record["error"].startswith("Expired"):
+                expired += 1
+    latencies.sort()
+
+    counters = server.metrics.counters
+    return {
+        "notifications": len(rows),
+        "accepted": len(arrivals),
+        "delivered": len(latencies),
+        "digested": digested,
+        "failed": failed,
+        "dropped": dropped,
+        "expired": expired,
+        "rate_limited": statuses.get(429, 0),
+        "rejected": statuses.get(503, 0),
+        "invalid": statuses.get(422, 0),
+        "latency_p50": percentile(latencies, 50),
+        "latency_p95": percentile(latencies, 95),
+        "latency_p99": percentile(latencies, 99),
+        "latency_max": latencies[-1] if latencies else None,
+        "utterances": int(counters.get("utterances", 0)),
+        "speech_seconds": counters.get("speech_seconds", 0.0),
+        "duration": loop.time() - start,
+    }
+
+
+def replay_trace(
+    path: Path,
+    config: Config,
+    speed: float = 1.0,
+    virtual: bool = False
+) -> dict:
+    """Replay a trace against simulated backends and report what happened."""
+    epoch, rows = read_trace(path)
+
+    # Replays never speak, relay, record or contend with a running daemon
+    config = config.model_copy(update={
+        "speech_lock": False,
+        "relay_targets": [],
+        "trace_file": None,
+        "status_table_size": max(config.status_table_size, len(rows)),
+    })
+
+    clock = ReplayClock(speed, virtual)
+    loop = asyncio.SelectorEventLoop(ReplaySelector(clock))
+    wall_started = time.perf_counter()
+    try:
+        with clock.installed(epoch):
+            server = SimulatedServer(config)
+            report = loop.run_until_complete(_replay(server, rows))
+    finally:
+        loop.close()
+
+    report["wall_seconds"] = time.perf_counter() - wall_started
+    return report
+
+
+def format_report(report: dict) -> str:
+    """Human-readable replay summary."""
+
+    def seconds(value: float | None) -> str:
+        return "-" if value is None else f"{value:.2f}s"
+
+    return "\n".join([
+        f"Notifications: {report['notifications']} "
+        f"({report['accepted']} accepted, {report['rate_limited']} rate limited, "
+        f"{report['rejected']} rejected, {report['invalid']} invalid)",
+        f"Delivered:     {report['delivered']} "
+        f"({report['digested']} in digests, {report['failed']} failed, "
+        f"{report['dropped']} dropped of which {report['expired']} expired)",
+        f"Latency:       p50 {seconds(report['latency_p50'])}, "
+        f"p95 {seconds(report['latency_p95'])}, "
+        f"p99 {seconds(report['latency_p99'])}, "
+        f"max {seconds(report['latency_max'])}",
+        f"Speech:        {report['utterances']} utterances, "
+        f"{report['speech_seconds']:.1f}s",
+        f"Trace time:    {report['duration']:.1f}s "
+        f"(replayed in {report['wall_seconds']:.1f}s)",
+    ])
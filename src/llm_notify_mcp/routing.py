@@ -0,0 +1,79 @@
+"""Channel routing rules for LLM Notify MCP."""
+
+import fnmatch
+import logging
+import re
+from functools import lru_cache
+
+from .config import Route
+from .dispatch import PRIORITIES
+
+logger = logging.getLogger(__name__)
+
+CHANNELS = ("audio", "visual", "sound", "history")
+
+_GLOB_CHARS = re.compile(r"[*?\[]")
+
+
+class RouteMatch:
+    """The channels chosen for a notification and the rule that chose them."""
+
+    __slots__ = ("channels", "rule")
+
+    def __init__(self, channels: tuple[str, ...], rule: int | None):
+        self.channels = channels
+        self.rule = rule  # index into the configured routes, None for default
+
+    def __contains__(self, channel: str) -> bool:
+        return channel in self.channels
+
+    def __repr__(self) -> str:
+        return f"RouteMatch(channels={self.channels!r}, rule={self.rule!r})"
+
+
+class Router:
+    """Compiled routing table; the first matching rule in config order wins.
+
+    Rules with a literal source are indexed in a dict keyed by (source,
+    priority), and only glob sources are scanned, in order. Priority globs
+    are expanded against the known priorities at compile time. Results are
+    cached per (source, priority), since agents reuse a handful of sources.
+    """
+
+    def __init__(self, routes: list[Route], cache_size: int = 1024):
+        self.routes = routes
+        self.exact: dict[tuple[str, str], int] = {}
+        self.globs: dict[str, list[tuple[int, re.Pattern]]] = {
+            priority: [] for priority in PRIORITIES
+        }
+
+        for index, route in enumerate(routes):
+            priorities = fnmatch.filter(PRIORITIES, route.priority)
+            if not priorities:
+                logger.warning(
+                    f"Route {index} matches no priority: {route.priority!r}"
+                )
+            if _GLOB_CHARS.search(route.source):
+                pattern = re.compile(fnmatch.translate(route.source))
+                for priority in priorities:
+                    self.globs[priority].append((index, pattern))
+            else:
+                for priority in priorities:
+                    self.exact.setdefault((route.source, priority), index)
+
+        self.match = lru_cache(maxsize=cache_size)(self._match)
+
+    def _match(self, source: str | None, priority: str) -> RouteMatch | None:
+        """Find the first rule matching a notification, or None."""
+        source = source or ""
+        best = self.exact.get((source, priority))
+        for index, pattern in self.globs.get(priority, ()):
+            if best is not None and index > best:
+                break
+            if pattern.match(source):
+                best = index
+                break
+
+        if best is None:
+            return None
+        return RouteMatch(tuple(self.routes[best].channels), best)
@@ -0,0 +1,123 @@
+"""Timed release of held notifications for LLM Notify MCP."""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+# Longest single sleep, so wall-clock jumps (e.g. laptop sleep) are noticed
+MAX_TIMER_SLEEP = 60.0
+
+
+def parse_quiet_hours(spec: str) -> tuple[int, int]:
+    """Parse "HH:MM-HH:MM" into start and end minutes after midnight."""
+    try:
+        start, end = (
+            datetime.strptime(part.strip(), "%H:%M") for part in spec.split("-")
+        )
+    except ValueError:
+        raise ValueError(
+            f"Quiet hours must look like '22:00-07:00', not {spec!r}"
+        ) from None
+    return start.hour * 60 + start.minute, end.hour * 60 + end.minute
+
+
+def quiet_until(period: tuple[int, int], now: float) -> float | None:
+    """When the quiet period containing `now` ends, or None outside it.
+
+    `period` is start and end minutes as returned by parse_quiet_hours().
+    Times are local; a period whose end is before its start spans midnight.
+    """
+    start, end = period
+    local = datetime.fromtimestamp(now)
+    minutes = local.hour * 60 + local.minute
+    if start <= end:
+        inside = start <= minutes < end
+    else:
+        inside = minutes >= start or minutes < end
+    if not inside:
+        return None
+
+    ends = local.replace(hour=end // 60, minute=end % 60, second=0, microsecond=0)
+    if ends <= local:
+        ends += timedelta(days=1)
+    return ends.timestamp()
+
+
+class TimerHeap:
+    """Items released at wall-clock times by a single task.
+
+    Items sit in a binary heap ordered by release time, so holding many
+    thousands costs O(log n) per item. One task sleeps until the earliest
+    release and hands every due item to `release` at once.
+    """
+
+    def __init__(self, release: Callable[[list], None]):
+        self.release = release
+        self._heap: list[tuple[float, int, object]] = []
+        self._seq = itertools.count()  # keeps equal times in arrival order
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, when: float, item):
+        """Hold an item until the given Unix time."""
+        heapq.heappush(self._heap, (when, next(self._seq), item))
+        self._ensure_task()
+        if self._heap[0][2] is item:
+            # New earliest release; the sleeping task must recompute its wait
+            self._wakeup.set()
+
+    def items(self) -> list[tuple[float, object]]:
+        """Held items with their release times, earliest first."""
+        return [(when, item) for when, _, item in sorted(self._heap)]
+
+    def pop_due(self, now: float) -> list:
+        """Remove and return every item due at `now`."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap)[2])
+        return due
+
+    def _ensure_task(self):
+        """Start the timer task on the running loop if needed."""
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+            self._loop = loop
+
+    async def stop(self):
+        """Stop the timer task, leaving held items in place."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _run(self):
+        """Release items as they fall due."""
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), min(delay, MAX_TIMER_SLEEP)
+                    )
+                except TimeoutError:
+                    pass
+                continue
+
+            self.release(self.pop_due(time.time()))
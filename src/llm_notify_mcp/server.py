@@ -1,47 +1,81 @@
 """LLM Notify MCP server implementation."""
 
 import asyncio
+import hmac
+import json
 import logging
 import time
+from collections import deque
+from contextlib import asynccontextmanager
+from pathlib import Path
 
 import pync
-from fastapi import Depends, FastAPI, HTTPException, Request, status
+from fastapi import (
+    Depends,
+    FastAPI,
+    HTTPException,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import Response, StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from pydantic import BaseModel, Field, field_validator
+from pydantic import ValidationError
 
 from .config import Config
+from .daemon import ServerFiles
+from .dispatch import (
+    AdmissionRejectedError,
+    NotificationDispatcher,
+    PendingNotification,
+)
+from .estimator import SpeechEstimator
+from .events import EventBroadcaster
+from .handoff import Handoff
+from .health import OPEN, BackendHealth
+from .metrics import Metrics
+from .models import (
+    NotificationBatch,
+    NotificationRequest,
+    NotificationResponse,
+    NotificationStatus,
+)
+from .relay import RELAY_HEADER, RelayForwarder
+from .routing import RouteMatch, Router
+from .speech_lock import SpeechLock
+from .speech_text import SpeechTextPipeline
+from .stats import UsageStats
+from .trace import TraceRecorder
+from .tracking import DeliveryTracker
 
 logger = logging.getLogger(__name__)
 
-
-class NotificationRequest(BaseModel):
-    """Request model for notifications."""
-
-    message: str = Field(..., max_length=140, description="Notification message")
-    priority: str = Field("normal", description="Priority level")
-    source: str | None = Field(None, description="Source identifier")
-
-    @field_validator("message")
-    @classmethod
-    def validate_message(cls, v):
-        if len(v.strip()) == 0:
-            raise ValueError("Message cannot be empty")
-        return v.strip()
-
-    @field_validator("priority")
-    @classmethod
-    def validate_priority(cls, v):
-        if v not in ["low", "normal", "high"]:
-            raise ValueError("Priority must be 'low', 'normal', or 'high'")
-        return v
-
-
-class NotificationResponse(BaseModel):
-    """Response model for notifications."""
-
-    success: bool
-    message: str
-    timestamp: float
+# Longest a single GET /notify/{id} long-poll may block
+MAX_STATUS_WAIT = 60.0
+
+ADMISSION_MESSAGES = {
+    "queued": "Notification queued",
+    "deferred": "Notification deferred (latency SLO exceeded)",
+    "digested": "Notification queued for digest (latency SLO exceeded)",
+    "relayed": "Notification relayed",
+    "scheduled": "Notification scheduled",
+    "held": "Notification held until quiet hours end",
+    "expired": "Notification expired before it could be delivered",
+}
+
+# Compact JSON encoder for the /notify fast path
+_encode_json = json.JSONEncoder(separators=(",", ":")).encode
+
+# /notify parses its body by hand, so describe it for the OpenAPI docs
+_NOTIFY_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": NotificationRequest.model_json_schema()}
+        },
+    }
+}
 
 
 class RateLimiter:
@@ -50,27 +84,26 @@ class RateLimiter:
     def __init__(self, max_requests: int, window_seconds: int = 60):
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests: dict[str, list] = {}
+        self.requests: dict[str, deque] = {}
 
     def is_allowed(self, client_id: str) -> bool:
         """Check if client is allowed to make a request."""
         now = time.time()
 
-        if client_id not in self.requests:
-            self.requests[client_id] = []
+        requests = self.requests.get(client_id)
+        if requests is None:
+            requests = self.requests[client_id] = deque()
 
-        # Remove old requests outside the window
-        self.requests[client_id] = [
-            req_time for req_time in self.requests[client_id]
-            if now - req_time < self.window_seconds
-        ]
+        # Remove old requests outside the window (oldest are at the left)
+        while requests and now - requests[0] >= self.window_seconds:
+            requests.popleft()
 
         # Check if under limit
-        if len(self.requests[client_id]) >= self.max_requests:
+        if len(requests) >= self.max_requests:
             return False
 
         # Add current request
-        self.requests[client_id].append(now)
+        requests.append(now)
         return True
 
 
@@ -82,12 +115,128 @@ class NotificationServer:
         self.app = FastAPI(
             title="LLM Notify MCP",
             description="Local notification bridge for LLM agents",
-            version="0.1.0"
+            version="0.1.0",
+            lifespan=self._lifespan
         )
+        # Set by start_server to support restarts without downtime
+        self.handoff: Handoff | None = None
+        # Set by start_server; the ready file is withdrawn at shutdown
+        self.server_files: ServerFiles | None = None
         self.rate_limiter = RateLimiter(config.rate_limit)
         self.security = HTTPBearer(auto_error=False) if config.auth_token else None
+        self.speech_lock = (
+            SpeechLock(config.get_run_dir(), config.speech_lease_timeout)
+            if config.speech_lock else None
+        )
+        self.events = EventBroadcaster(config.event_buffer_size)
+        self.tracker = DeliveryTracker(config.status_table_size)
+        self.estimator = SpeechEstimator()
+        self.metrics = Metrics()
+        self.stats = UsageStats(config.stats_sources)
+        self.speech_text = (
+            SpeechTextPipeline(
+                config.speech_compaction_rules, config.speech_replacements
+            )
+            if config.speech_compaction else None
+        )
+        self.router = Router(config.routes)
+        self.backends: dict[str, BackendHealth] = {}
+        # Only a serving process records, so it is opened at startup
+        self.trace: TraceRecorder | None = None
+        self.dispatcher = NotificationDispatcher(
+            self._send_notification, config, self.events, self.tracker,
+            self.estimator, speaks=lambda request: "audio" in self._route(request)
+        )
+        self.relay = RelayForwarder(config) if config.relay_targets else None
         self._setup_routes()
 
+    @asynccontextmanager
+    async def _lifespan(self, app: FastAPI):
+        """Run startup and graceful shutdown around the app's lifetime."""
+        await self.startup()
+        yield
+        await self.shutdown()
+
+    async def startup(self):
+        """Restore notifications saved by a previous shutdown."""
+        if self.config.trace_file:
+            self.trace = TraceRecorder(Path(self.config.trace_file).expanduser())
+        if self.handoff is not None:
+            # The previous process saves its queue only after it is released
+            await self.handoff.start(self.restore_pending)
+        else:
+            await self.restore_pending()
+
+    async def shutdown(self):
+        """Drain the queue within the deadline, then save what is left.
+
+        Uvicorn has stopped accepting requests by the time this runs. After a
+        handoff nothing is drained; the new process picks up the queue.
+        """
+        if self.server_files is not None:
+            self.server_files.clear_ready()
+
+        released = self.handoff is not None and self.handoff.released
+        timeout = 0.0 if released else self.config.drain_timeout
+        await self.dispatcher.drain(timeout)
+
+        pending = self.dispatcher.snapshot()
+        if pending:
+            self._save_pending(pending)
+
+        if self.relay is not None:
+            await self.relay.close()
+        if self.trace is not None:
+            self.trace.close()
+            self.trace = None
+        if self.handoff is not None:
+            await self.handoff.finish()
+        if self.server_files is not None:
+            self.server_files.release()
+
+    def _pending_file(self) -> Path:
+        return self.config.get_run_dir() / "pending.json"
+
+    def _save_pending(self, pending: list[dict]):
+        """Persist undelivered notifications for the next server process."""
+        if not self.config.persist_pending:
+            logger.warning(f"Discarding {len(pending)} undelivered notifications")
+            return
+
+        path = self._pending_file()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so a crash never leaves a partial file
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(pending))
+            tmp.replace(path)
+        except OSError as e:
+            logger.error(f"Failed to save undelivered notifications: {e}")
+            return
+        logger.info(f"Saved {len(pending)} undelivered notifications to {path}")
+
+    async def restore_pending(self):
+        """Queue notifications saved by a previous server process."""
+        if not self.config.persist_pending:
+            return
+
+        path = self._pending_file()
+        try:
+            pending = json.loads(path.read_text())
+            path.unlink()
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load undelivered notifications: {e}")
+            return
+
+        try:
+            self.dispatcher.restore(pending)
+        except (KeyError, TypeError, ValidationError) as e:
+            logger.error(f"Ignoring invalid saved notifications: {e}")
+            return
+        logger.info(f"Restored {len(pending)} undelivered notifications")
+
     def _verify_token(
         self, credentials: HTTPAuthorizationCredentials | None = None
     ) -> bool:
@@ -98,7 +247,21 @@ class NotificationServer:
         if not credentials:
             return False
 
-        return credentials.credentials == self.config.auth_token
+        return hmac.compare_digest(
+            credentials.credentials.encode(), self.config.auth_token.encode()
+        )
+
+    def _verify_header(self, authorization: str | None) -> bool:
+        """Verify a raw Authorization header value if auth is required."""
+        if not self.config.auth_token:
+            return True
+
+        scheme, _, token = (authorization or "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return False
+
+        # Constant-time comparison so the token cannot be guessed by timing
+        return hmac.compare_digest(token.encode(), self.config.auth_token.encode())
 
     def _setup_routes(self):
         """Set up FastAPI routes."""
@@ -108,16 +271,32 @@ class NotificationServer:
                 return await self.security(req)
             return None
 
-        @self.app.post("/notify", response_model=NotificationResponse)
-        async def notify(
-            request: NotificationRequest,
-            req: Request,
-            credentials: HTTPAuthorizationCredentials | None = Depends(get_credentials)
-        ):
+        @self.app.post(
+            "/notify",
+            response_model=NotificationResponse,
+            openapi_extra=_NOTIFY_OPENAPI
+        )
+        async def notify(req: Request):
             """Send a notification."""
 
+            # Validate the raw body in one pass through pydantic-core,
+            # skipping FastAPI's dependency and body resolution
+            try:
+                request = NotificationRequest.model_validate_json(await req.body())
+            except ValidationError as e:
+                errors = e.errors(
+                    include_url=False, include_context=False, include_input=False
+                )
+                for error in errors:
+                    error["loc"] = ("body", *error["loc"])
+                return Response(
+                    _encode_json({"detail": errors}),
+                    status_code=422,
+                    media_type="application/json"
+                )
+
             # Check authentication
-            if not self._verify_token(credentials):
+            if not self._verify_header(req.headers.get("authorization")):
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Invalid authentication token"
@@ -125,72 +304,510 @@ class NotificationServer:
 
             # Get client IP for rate limiting
             client_ip = req.client.host
+            if self.trace is not None:
+                self.trace.record(request, client_ip)
 
             # Check rate limit
             if not self.rate_limiter.is_allowed(client_ip):
+                self.stats.record(request.source, rejected=True)
                 raise HTTPException(
                     status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                     detail="Rate limit exceeded"
                 )
 
-            # Send notification
+            # Queue notification; delivery happens on the dispatch worker
             try:
-                await self._send_notification(request)
-                return NotificationResponse(
-                    success=True,
-                    message="Notification sent successfully",
-                    timestamp=time.time()
+                entry = self._accept(request, RELAY_HEADER in req.headers)
+            except AdmissionRejectedError as e:
+                self.stats.record(request.source, rejected=True)
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=str(e),
+                    headers={"Retry-After": str(int(e.projected_delay) + 1)}
                 )
-            except Exception as e:
-                logger.error(f"Failed to send notification: {e}")
+
+            # Serialize directly rather than re-validating a response model
+            return Response(
+                _encode_json({
+                    "success": True,
+                    "message": ADMISSION_MESSAGES[
+                        entry.admission if entry else "relayed"
+                    ],
+                    "timestamp": time.time(),
+                    "id": entry.id if entry else None,
+                    "projected_delay": self.dispatcher.projected_delay(
+                        request.priority
+                    ),
+                }),
+                media_type="application/json"
+            )
+
+        @self.app.post("/notify/batch")
+        async def notify_batch(
+            batch: NotificationBatch,
+            req: Request,
+            credentials: HTTPAuthorizationCredentials | None = Depends(get_credentials)
+        ):
+            """Accept several notifications at once, as sent by relays."""
+
+            if not self._verify_token(credentials):
                 raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to send notification"
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid authentication token"
                 )
 
+            # Traced before rate limiting, like /notify, so replays see 429s
+            if self.trace is not None:
+                for request in batch.notifications:
+                    self.trace.record(request, req.client.host)
+
+            # Every notification counts against the rate limit; items over it
+            # get their own 429 so relays retry just those
+            allowed = [
+                self.rate_limiter.is_allowed(req.client.host)
+                for _ in batch.notifications
+            ]
+            if not any(allowed):
+                for request in batch.notifications:
+                    self.stats.record(request.source, rejected=True)
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Rate limit exceeded"
+                )
+
+            relayed = RELAY_HEADER in req.headers
+            results = []
+            for request, within_limit in zip(batch.notifications, allowed):
+                if not within_limit:
+                    self.stats.record(request.source, rejected=True)
+                    results.append({
+                        "success": False,
+                        "status": status.HTTP_429_TOO_MANY_REQUESTS,
+                        "detail": "Rate limit exceeded",
+                    })
+                    continue
+                try:
+                    entry = self._accept(request, relayed)
+                except AdmissionRejectedError as e:
+                    self.stats.record(request.source, rejected=True)
+                    results.append({
+                        "success": False,
+                        "status": status.HTTP_503_SERVICE_UNAVAILABLE,
+                        "detail": str(e),
+                    })
+                    continue
+                results.append({"success": True, "id": entry.id if entry else None})
+
+            return {"success": True, "timestamp": time.time(), "results": results}
+
+        @self.app.get("/notify/{notification_id}", response_model=NotificationStatus)
+        async def notification_status(
+            notification_id: str,
+            wait: float = 0,
+            credentials: HTTPAuthorizationCredentials | None = Depends(get_credentials)
+        ):
+            """Get delivery status, optionally long-polling for completion."""
+
+            if not self._verify_token(credentials):
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid authentication token"
+                )
+
+            timeout = min(max(wait, 0), MAX_STATUS_WAIT)
+            record = await self.tracker.wait(notification_id, timeout)
+            if record is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Unknown notification id"
+                )
+            return {**record, "position": self.dispatcher.position(notification_id)}
+
+        @self.app.websocket("/ws")
+        async def ingest(ws: WebSocket):
+            """Accept a stream of notification frames over one connection."""
+
+            await ws.accept()
+
+            # Authenticate once, via header or an initial auth frame
+            if not self._verify_header(ws.headers.get("authorization")):
+                try:
+                    frame = await ws.receive_json()
+                except (WebSocketDisconnect, ValueError):
+                    return
+                is_auth = isinstance(frame, dict) and frame.get("type") == "auth"
+                token = frame.get("token") if is_auth else None
+                if not token or not self._verify_header(f"Bearer {token}"):
+                    await ws.send_json({
+                        "type": "error",
+                        "status": status.HTTP_401_UNAUTHORIZED,
+                        "detail": "Invalid authentication token",
+                    })
+                    await ws.close(code=status.WS_1008_POLICY_VIOLATION)
+                    return
+                await ws.send_json({"type": "auth", "success": True})
+
+            client_id = ws.client.host if ws.client else "websocket"
+            try:
+                while True:
+                    frame = await ws.receive_json()
+                    seq = frame.get("seq") if isinstance(frame, dict) else None
+                    reply = self._admit_frame(frame, client_id)
+                    reply["seq"] = seq
+                    # Acks are sent as soon as a frame is queued, so clients
+                    # can keep many notifications in flight
+                    await ws.send_json(reply)
+            except (WebSocketDisconnect, ValueError):
+                pass
+
         @self.app.get("/health")
         async def health():
             """Health check endpoint."""
-            return {"status": "healthy", "timestamp": time.time()}
+            backends = {
+                name: health.state for name, health in self.backends.items()
+            }
+            return {
+                "status": "degraded" if OPEN in backends.values() else "healthy",
+                "timestamp": time.time(),
+                "backends": backends,
+            }
+
+        @self.app.get("/metrics")
+        async def metrics():
+            """Server metrics: speech rate, queue depth and counters."""
+            self.metrics.set("queue_depth", len(self.dispatcher))
+            self.metrics.set("scheduled", len(self.dispatcher.timers))
+            self.metrics.set("projected_drain", self.dispatcher.projected_delay())
+            snapshot = self.metrics.snapshot()
+            snapshot["backends"] = {
+                name: health.snapshot() for name, health in self.backends.items()
+            }
+            if self.relay is not None:
+                snapshot["relay"] = self.relay.stats()
+            return snapshot
+
+        @self.app.get("/stats")
+        async def stats(
+            window: str | None = None,
+            top: int = 10,
+            credentials: HTTPAuthorizationCredentials | None = Depends(get_credentials)
+        ):
+            """Per-source counts, rejection rates and speech time."""
 
-    async def _send_notification(self, request: NotificationRequest):
-        """Send the actual notification."""
+            if not self._verify_token(credentials):
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid authentication token"
+                )
+
+            try:
+                return self.stats.snapshot(window, max(top, 1))
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+                )
 
-        # Send audio notification
-        await self._send_audio_notification(request.message)
+        @self.app.get("/events")
+        async def events(
+            req: Request,
+            source: str | None = None,
+            priority: str | None = None,
+            credentials: HTTPAuthorizationCredentials | None = Depends(get_credentials)
+        ):
+            """Stream accepted and delivered notifications as Server-Sent Events."""
+
+            if not self._verify_token(credentials):
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid authentication token"
+                )
+
+            # Filters are comma-separated lists, applied before buffering
+            subscription = self.events.subscribe(
+                sources=set(source.split(",")) if source else None,
+                priorities=set(priority.split(",")) if priority else None
+            )
+            return StreamingResponse(
+                self.events.stream(subscription, req.is_disconnected),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache"}
+            )
+
+    def _admit_frame(self, frame, client_id: str) -> dict:
+        """Validate and rate-limit one WebSocket frame, returning the reply."""
+        try:
+            request = NotificationRequest.model_validate(frame)
+        except ValidationError as e:
+            return {
+                "type": "error",
+                "status": 422,
+                "detail": e.errors(
+                    include_url=False, include_context=False, include_input=False
+                ),
+            }
+
+        if self.trace is not None:
+            self.trace.record(request, client_id)
+
+        if not self.rate_limiter.is_allowed(client_id):
+            self.stats.record(request.source, rejected=True)
+            return {
+                "type": "error",
+                "status": status.HTTP_429_TOO_MANY_REQUESTS,
+                "detail": "Rate limit exceeded",
+            }
 
-        # Send visual notification if enabled
+        try:
+            entry = self._accept(request)
+        except AdmissionRejectedError as e:
+            self.stats.record(request.source, rejected=True)
+            return {
+                "type": "error",
+                "status": status.HTTP_503_SERVICE_UNAVAILABLE,
+                "detail": str(e),
+                "retry_after": int(e.projected_delay) + 1,
+            }
+        return {
+            "type": "ack",
+            "success": True,
+            "id": entry.id if entry else None,
+            "admission": entry.admission if entry else "relayed",
+        }
+
+    def _accept(
+        self, request: NotificationRequest, relayed: bool = False
+    ) -> PendingNotification | None:
+        """Relay and queue an admitted notification.
+
+        Returns the local queue entry, or None when this server only relays.
+        Raises AdmissionRejectedError if local delivery would miss the SLO.
+        """
+        fields = {
+            "message": request.message,
+            "priority": request.priority,
+            "source": request.source,
+        }
+
+        # Notifications that arrived through a relay are not relayed again
+        forward = self.relay is not None and not relayed
+
+        entry = None
+        if not forward or self.config.relay_local_delivery:
+            try:
+                entry = self.dispatcher.enqueue(request)
+            except AdmissionRejectedError as e:
+                self.events.publish("rejected", error=str(e), **fields)
+                raise
+
+        # Relayed only once admitted here, so a client retrying after a 503
+        # does not reach the relay targets twice
+        if forward:
+            self.relay.forward(request)
+        self.events.publish("accepted", **fields)
+        self.stats.record(request.source)
+        return entry
+
+    def _route(self, request: NotificationRequest) -> RouteMatch:
+        """Choose the channels for a notification."""
+        match = self.router.match(request.source, request.priority)
+        if match is not None:
+            return match
+
+        # No rule matched: speak, and show if visual notifications are on
+        channels = ["audio"]
         if self.config.visual_notifications:
-            await self._send_visual_notification(request.message, request.priority)
+            channels.append("visual")
+            if request.priority == "high":
+                channels.append("sound")
+        return RouteMatch(tuple(channels), None)
+
+    async def _send_notification(self, request: NotificationRequest):
+        """Send the actual notification."""
+        route = self._route(request)
+        fields = {
+            "message": request.message,
+            "priority": request.priority,
+            "source": request.source,
+            "channels": list(route.channels),
+            "route": route.rule,
+        }
+        logger.debug(
+            f"Routing {request.priority} notification from {request.source!r} "
+            f"to {', '.join(route.channels) or 'no channels'} "
+            f"({'default' if route.rule is None else f'rule {route.rule}'})"
+        )
 
-    async def _send_audio_notification(self, message: str):
-        """Send audio notification using macOS say command."""
         try:
-            cmd = ["say"]
-            
-            # Only add voice parameter if specified (empty string uses system default)
-            if self.config.voice:
-                cmd.extend(["-v", self.config.voice])
-            
-            # Add speech rate and message
-            cmd.extend(["-r", str(self.config.speech_rate), message])
-
-            # Run say command asynchronously
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+            visual = "visual" in route
+            if "audio" in route:
+                # Speak a compacted form; other channels keep the original
+                spoken = request.message
+                if self.speech_text is not None:
+                    spoken = self.speech_text.compact(request.message)
+                try:
+                    seconds = await self._send_audio_notification(
+                        spoken, request.priority
+                    )
+                except Exception as e:
+                    if not self.config.speech_failover_visual:
+                        raise
+                    logger.warning(f"Speech unavailable, showing visually: {e}")
+                    self.metrics.incr("speech_failovers")
+                    fields["failover"] = "visual"
+                    visual = True
+                else:
+                    self.stats.record_speech(request.source, seconds)
+
+            if visual:
+                await self._send_visual_notification(
+                    request.message, request.priority
+                )
+
+            if "sound" in route:
+                await self._play_sound()
+
+            if "history" in route:
+                await self._record_history(request)
+        except Exception as e:
+            self.events.publish("failed", error=str(e), **fields)
+            raise
+
+        self.events.publish("delivered", **fields)
+
+    async def _send_audio_notification(
+        self, message: str, priority: str = "normal"
+    ) -> float:
+        """Send audio notification using macOS say command.
+
+        Falls back to the configured alternate command when `say` fails or its
+        circuit is open, and raises if no speech backend succeeds. Returns the
+        seconds spent speaking.
+        """
+        token = None
+        if self.speech_lock is not None:
+            # Wait for other processes to finish speaking
+            token = await self.speech_lock.acquire(
+                priority, timeout=self.config.speech_lock_wait
             )
+            if token is None:
+                # Speaking anyway would talk over the process holding it
+                raise RuntimeError("Timed out waiting for the speech lock")
 
-            stdout, stderr = await process.communicate()
+        try:
+            rate = self._effective_rate(priority)
+            # Hard limit so a hung backend cannot stall the queue
+            timeout = (
+                self.config.speech_timeout
+                + 2 * self.estimator.estimate(message, rate)
+            )
 
-            if process.returncode != 0:
-                logger.error(f"Say command failed: {stderr.decode()}")
-                raise RuntimeError(f"Say command failed: {stderr.decode()}")
+            errors = []
+            for name, cmd in self._speech_commands(message, rate):
+                health = self._backend(name)
+                if not health.allow():
+                    errors.append(f"{name}: circuit open")
+                    continue
+
+                if token is not None and not self.speech_lock.renew(token, timeout):
+                    logger.warning("Speech lease expired while held")
+
+                started = time.monotonic()
+                try:
+                    await self._run_speech(cmd, timeout)
+                except Exception as e:
+                    health.record_failure()
+                    logger.warning(f"Speech backend {name} failed: {e}")
+                    errors.append(f"{name}: {e}")
+                    continue
+
+                # Calibrate the duration estimator against the real run time
+                elapsed = time.monotonic() - started
+                health.record_success(elapsed)
+                self.estimator.observe(message, rate, elapsed)
+                self.metrics.incr("speech_seconds", elapsed)
+                self.metrics.incr("utterances")
+                if name != "say":
+                    self.metrics.incr("speech_fallbacks")
+                return elapsed
+
+            raise RuntimeError(f"No speech backend succeeded ({'; '.join(errors)})")
 
         except Exception as e:
             logger.error(f"Audio notification failed: {e}")
             raise
+        finally:
+            if token is not None:
+                self.speech_lock.release(token)
+
+    def _speech_commands(self, message: str, rate: int) -> list[tuple[str, list[str]]]:
+        """Speech backends to try in order, with their command lines."""
+        cmd = ["say"]
+
+        # Only add voice parameter if specified (empty string uses system default)
+        if self.config.voice:
+            cmd.extend(["-v", self.config.voice])
+
+        # Add speech rate and message
+        cmd.extend(["-r", str(rate), message])
+        commands = [("say", cmd)]
+
+        if self.config.speech_fallback_command:
+            commands.append(("fallback", [
+                arg.replace("{rate}", str(rate)).replace("{message}", message)
+                for arg in self.config.speech_fallback_command
+            ]))
+        return commands
+
+    def _backend(self, name: str) -> BackendHealth:
+        """Health tracker for a speech backend."""
+        health = self.backends.get(name)
+        if health is None:
+            health = self.backends[name] = BackendHealth(
+                name,
+                failure_threshold=self.config.circuit_failure_threshold,
+                reset_timeout=self.config.circuit_reset_timeout
+            )
+        return health
+
+    async def _run_speech(self, cmd: list[str], timeout: float):
+        """Run a speech command, killing it if it outlives the timeout."""
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except (TimeoutError, asyncio.CancelledError) as e:
+            process.kill()
+            await process.wait()
+            if isinstance(e, TimeoutError):
+                raise TimeoutError(
+                    f"{cmd[0]} command timed out after {timeout:.0f}s"
+                ) from None
+            raise
+
+        if process.returncode != 0:
+            raise RuntimeError(f"{cmd[0]} command failed: {stderr.decode().strip()}")
+
+    def _effective_rate(self, priority: str) -> int:
+        """Speech rate for the next utterance, raised while a backlog waits."""
+        config = self.config
+        rate = config.speech_rate
+        backlog = len(self.dispatcher)
+        if (
+            config.adaptive_rate
+            and backlog
+            and priority in config.adaptive_rate_priorities
+        ):
+            rate += config.adaptive_rate_step * backlog
+            rate = min(max(rate, config.speech_rate_min), config.speech_rate_max)
+
+        self.metrics.set("speech_rate_applied", rate)
+        if rate != config.speech_rate:
+            self.metrics.incr("speech_rate_adapted")
+        return rate
 
     async def _send_visual_notification(self, message: str, priority: str):
         """Send visual notification using pync."""
@@ -206,8 +823,7 @@ class NotificationServer:
                     message,
                     title=title,
                     appIcon=None,
-                    contentImage=None,
-                    sound="default" if priority == "high" else None
+                    contentImage=None
                 )
             )
 
@@ -215,6 +831,36 @@ class NotificationServer:
             logger.error(f"Visual notification failed: {e}")
             # Don't raise - visual notifications are optional
 
+    async def _play_sound(self):
+        """Play the alert sound using macOS afplay."""
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "afplay", self.config.alert_sound,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            await process.wait()
+        except Exception as e:
+            logger.error(f"Alert sound failed: {e}")
+            # Don't raise - like visual notifications, sounds are optional
+
+    async def _record_history(self, request: NotificationRequest):
+        """Append a notification to the history file."""
+        path = self.config.get_history_file()
+        line = _encode_json({
+            "timestamp": time.time(),
+            "message": request.message,
+            "priority": request.priority,
+            "source": request.source,
+        }) + "\n"
+
+        def append():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a") as f:
+                f.write(line)
+
+        await asyncio.get_running_loop().run_in_executor(None, append)
+
     async def demo(self):
         """Send a demo notification."""
         demo_request = NotificationRequest(
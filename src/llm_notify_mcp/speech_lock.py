@@ -0,0 +1,153 @@
+"""Machine-wide speech arbitration for LLM Notify MCP."""
+
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+
+from .daemon import pid_alive
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_RANK = {"low": 0, "normal": 1, "high": 2}
+
+
+class SpeechLock:
+    """File-based lease that serializes audio output across processes.
+
+    The current holder is recorded in a lease file guarded by a short flock.
+    Waiters register themselves so a free lease goes to the highest priority
+    waiter first. Leases held by dead processes, or held past their timeout,
+    are treated as free.
+    """
+
+    def __init__(
+        self,
+        lock_dir: Path,
+        lease_timeout: float = 30.0,
+        poll_interval: float = 0.05
+    ):
+        self.lock_dir = lock_dir
+        self.lease_timeout = lease_timeout
+        self.poll_interval = poll_interval
+        self.lease_path = lock_dir / "speech.lease"
+        self.mutex_path = lock_dir / "speech.mutex"
+        self.waiters_dir = lock_dir / "speech-waiters"
+
+    def _read_lease(self) -> dict | None:
+        """Read the current lease, if any."""
+        try:
+            return json.loads(self.lease_path.read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _lease_active(self, lease: dict | None, now: float) -> bool:
+        """Check whether a lease is still held by a live, non-expired holder."""
+        if lease is None:
+            return False
+        pid = lease.get("pid", 0)
+        if lease.get("expires", 0) < now:
+            logger.warning(f"Recovering expired speech lease from pid {pid}")
+            return False
+        if not pid_alive(pid):
+            logger.warning(f"Recovering speech lease from dead pid {pid}")
+            return False
+        return True
+
+    def _outranked(self, token: str, priority: str) -> bool:
+        """Check for a live waiter with higher priority than ours."""
+        rank = PRIORITY_RANK.get(priority, 1)
+        for path in self.waiters_dir.glob("*"):
+            if path.name == token:
+                continue
+            try:
+                waiter = json.loads(path.read_text())
+            except (FileNotFoundError, ValueError):
+                continue
+            if not pid_alive(waiter.get("pid", 0)):
+                path.unlink(missing_ok=True)
+                continue
+            if PRIORITY_RANK.get(waiter.get("priority"), 1) > rank:
+                return True
+        return False
+
+    def _try_acquire(self, token: str, priority: str) -> bool:
+        """Attempt to take the lease once."""
+        with open(self.mutex_path, "a") as mutex:
+            fcntl.flock(mutex, fcntl.LOCK_EX)
+            try:
+                now = time.time()
+                if self._lease_active(self._read_lease(), now):
+                    return False
+                if self._outranked(token, priority):
+                    return False
+
+                lease = {
+                    "pid": os.getpid(),
+                    "token": token,
+                    "priority": priority,
+                    "expires": now + self.lease_timeout,
+                }
+                tmp_path = self.lease_path.with_suffix(".tmp")
+                tmp_path.write_text(json.dumps(lease))
+                os.replace(tmp_path, self.lease_path)
+                return True
+            finally:
+                fcntl.flock(mutex, fcntl.LOCK_UN)
+
+    async def acquire(
+        self, priority: str = "normal", timeout: float | None = None
+    ) -> str | None:
+        """Wait for the speech lease and return its token, or None on timeout."""
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        self.waiters_dir.mkdir(exist_ok=True)
+
+        token = uuid.uuid4().hex
+        waiter_path = self.waiters_dir / token
+        waiter_path.write_text(json.dumps({"pid": os.getpid(), "priority": priority}))
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while True:
+                if self._try_acquire(token, priority):
+                    return token
+                if deadline is not None and time.monotonic() >= deadline:
+                    logger.warning("Timed out waiting for the speech lease")
+                    return None
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            waiter_path.unlink(missing_ok=True)
+
+    def renew(self, token: str, duration: float) -> bool:
+        """Extend our lease to cover `duration` more seconds of speech.
+
+        Returns False if the lease is no longer ours.
+        """
+        with open(self.mutex_path, "a") as mutex:
+            fcntl.flock(mutex, fcntl.LOCK_EX)
+            try:
+                lease = self._read_lease()
+                if lease is None or lease.get("token") != token:
+                    return False
+                lease["expires"] = time.time() + max(duration, self.lease_timeout)
+                tmp_path = self.lease_path.with_suffix(".tmp")
+                tmp_path.write_text(json.dumps(lease))
+                os.replace(tmp_path, self.lease_path)
+                return True
+            finally:
+                fcntl.flock(mutex, fcntl.LOCK_UN)
+
+    def release(self, token: str):
+        """Release the lease if we still hold it."""
+        with open(self.mutex_path, "a") as mutex:
+            fcntl.flock(mutex, fcntl.LOCK_EX)
+            try:
+                lease = self._read_lease()
+                if lease is not None and lease.get("token") == token:
+                    self.lease_path.unlink(missing_ok=True)
+            finally:
+                fcntl.flock(mutex, fcntl.LOCK_UN)
@@ -0,0 +1,138 @@
+"""Speech text compaction for LLM Notify MCP."""
+
+import logging
+import re
+from collections.abc import Callable
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+Rule = tuple[re.Pattern, str | Callable[[re.Match], str]]
+
+_SPACES = re.compile(r"\s{2,}")
+
+
+def _basename(path: str) -> str:
+    """Last component of a path."""
+    return path.rstrip("/\\").replace("\\", "/").rsplit("/", 1)[-1] or path
+
+
+def _round_number(match: re.Match) -> str:
+    """Speak large or very precise numbers approximately."""
+    text = match.group(0).replace(",", "")
+    value = float(text)
+    if "." in text and abs(value) < 10000:
+        return f"{value:.1f}".rstrip("0").rstrip(".")
+    for limit, word in ((1e9, "billion"), (1e6, "million"), (1e3, "thousand")):
+        if abs(value) >= limit:
+            return f"{value / limit:.3g} {word}"
+    return text
+
+
+def _split_identifier(match: re.Match) -> str:
+    """Turn snake_case and camelCase identifiers into words."""
+    words = match.group(0).replace("_", " ")
+    return re.sub(r"(?<=[a-z0-9])(?=[A-Z])", " ", words).lower()
+
+
+# Rules run in this order; earlier rules keep later ones from mangling tokens
+RULES: dict[str, list[Rule]] = {
+    "stack_traces": [
+        (
+            re.compile(r'File "([^"]+)", line (\d+)(?:, in (\w+))?'),
+            lambda m: f"{_basename(m.group(1))} line {m.group(2)}"
+            + (f" in {m.group(3)}" if m.group(3) else ""),
+        ),
+        (re.compile(r"\b0x[0-9a-fA-F]{4,}\b"), "address"),
+    ],
+    "urls": [
+        (re.compile(r"\bhttps?://([\w.-]+)[^\s]*"), r"link to \1"),
+    ],
+    "paths": [
+        (
+            # Whole tokens (optionally quoted or bracketed), but not all-digit
+            # runs like dates or ratios
+            re.compile(
+                r"(?<![^\s(\"'])(?!\d+(?:[/\\]\d+)+(?![\w/\\]))"
+                r"(?:[A-Za-z]:)?[\w.~@+-]*(?:[/\\][\w.@+-]+){2,}[/\\]?"
+            ),
+            lambda m: _basename(m.group(0)),
+        ),
+    ],
+    "uuids": [
+        (
+            re.compile(
+                r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}"
+                r"-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"
+            ),
+            "an ID",
+        ),
+    ],
+    "hashes": [
+        # Hex runs with both digits and letters, like commit shas
+        (re.compile(r"\b(?=[0-9a-f]*[a-f])(?=[0-9a-f]*\d)[0-9a-f]{7,64}\b"), "hash"),
+    ],
+    "numbers": [
+        # Grouped or 5+ digit numbers, and decimals with 3+ places, but not
+        # parts of dotted sequences like IP addresses and versions
+        (
+            re.compile(
+                r"(?<![\d.])(?:"
+                r"\b\d{1,3}(?:,\d{3})+(?:\.\d+)?\b"
+                r"|\b\d{5,}(?:\.\d+)?\b"
+                r"|\b\d+\.\d{3,}\b"
+                r")(?!\.\d)"
+            ),
+            _round_number,
+        ),
+    ],
+    "identifiers": [
+        (
+            re.compile(
+                r"\b[A-Za-z][a-z0-9]*(?:_[A-Za-z0-9]+)+\b"
+                r"|\b[a-z]+(?:[A-Z][a-z0-9]+)+\b"
+            ),
+            _split_identifier,
+        ),
+    ],
+}
+
+
+class SpeechTextPipeline:
+    """Compiled, memoized text normalization applied before speaking.
+
+    `say` reads paths, hashes, UUIDs and identifiers character by character,
+    so these are rewritten into something short to hear. Rules are compiled
+    once and results are cached, since agents repeat the same messages.
+    """
+
+    def __init__(
+        self,
+        rules: list[str] | None = None,
+        replacements: dict[str, str] | None = None,
+        cache_size: int = 512
+    ):
+        names = list(RULES) if rules is None else rules
+        unknown = [name for name in names if name not in RULES]
+        if unknown:
+            logger.warning(f"Ignoring unknown speech compaction rules: {unknown}")
+
+        # Custom replacements run first so they can pre-empt built-in rules
+        self.rules: list[Rule] = []
+        for pattern, replacement in (replacements or {}).items():
+            try:
+                self.rules.append((re.compile(pattern), replacement))
+            except re.error as e:
+                logger.warning(f"Ignoring invalid speech replacement {pattern!r}: {e}")
+        for name in names:
+            self.rules.extend(RULES.get(name, []))
+
+        self.compact = lru_cache(maxsize=cache_size)(self._compact)
+
+    def _compact(self, message: str) -> str:
+        """Apply every rule to a message."""
+        text = message
+        for pattern, replacement in self.rules:
+            text = pattern.sub(replacement, text)
+        text = _SPACES.sub(" ", text).strip()
+        return text or message
@@ -0,0 +1,230 @@
+"""Per-source usage statistics over rolling windows for LLM Notify MCP.
+
+Each window is a ring of fixed time buckets, and each bucket keeps exact
+totals plus a Space-Saving summary (Metwally et al.) of at most `capacity`
+sources. Memory is therefore bounded by the number of buckets times
+`capacity`, however many distinct sources agents send.
+
+Space-Saving never misses a source that is heavy within a bucket. When a
+new source replaces the least counted one, it inherits that count, so a
+source's count may be overestimated by up to its reported `error`. Its
+rejections and speech time are only counted while it is tracked. Whatever
+is not attributed to a listed source is reported as "other".
+"""
+
+import time
+
+# Window name -> (bucket width in seconds, number of buckets)
+WINDOWS = {
+    "1m": (1, 60),
+    "1h": (60, 60),
+    "24h": (900, 96),
+}
+
+UNKNOWN_SOURCE = "unknown"
+
+
+class _Counts:
+    """Counters for one source, or a bucket's totals."""
+
+    __slots__ = ("count", "error", "rejected", "speech")
+
+    def __init__(self, count: int = 0, error: int = 0):
+        self.count = count
+        self.error = error  # upper bound on how much `count` is overestimated
+        self.rejected = 0
+        self.speech = 0.0
+
+    def add(self, other: "_Counts"):
+        self.count += other.count
+        self.error += other.error
+        self.rejected += other.rejected
+        self.speech += other.speech
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "rejected": self.rejected,
+            "rejection_rate": self.rejected / self.count if self.count else 0.0,
+            "speech_seconds": round(self.speech, 3),
+        }
+
+
+class SpaceSaving:
+    """Approximate per-source counts, tracking at most `capacity` sources."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.entries: dict[str, _Counts] = {}
+
+    def clear(self):
+        self.entries.clear()
+
+    def _entry(self, source: str, evict: bool) -> _Counts | None:
+        """The source's counters, making room for it if allowed."""
+        entry = self.entries.get(source)
+        if entry is not None:
+            return entry
+        if len(self.entries) < self.capacity:
+            entry = self.entries[source] = _Counts()
+            return entry
+        if not evict:
+            return None
+
+        # Replace the least counted source; the newcomer inherits its count
+        victim = min(self.entries, key=lambda key: self.entries[key].count)
+        floor = self.entries.pop(victim).count
+        entry = self.entries[source] = _Counts(floor, floor)
+        return entry
+
+    def record(self, source: str, rejected: bool):
+        """Count one notification from a source."""
+        entry = self._entry(source, evict=True)
+        entry.count += 1
+        if rejected:
+            entry.rejected += 1
+
+    def record_speech(self, source: str, seconds: float):
+        """Attribute speech time, unless the source is not tracked.
+
+        Speech does not count towards the ranking, so it never evicts.
+        """
+        entry = self._entry(source, evict=False)
+        if entry is not None:
+            entry.speech += seconds
+
+
+class _Bucket:
+    __slots__ = ("index", "totals", "sources")
+
+    def __init__(self, capacity: int):
+        self.index = -1
+        self.totals = _Counts()
+        self.sources = SpaceSaving(capacity)
+
+
+class RollingWindow:
+    """Totals and per-source counts over the last `width * size` seconds.
+
+    Buckets are reused as time moves on, so the window covers between
+    `size - 1` and `size` whole buckets plus the current one's elapsed part.
+    """
+
+    def __init__(self, width: float, size: int, capacity: int):
+        self.width = width
+        self.size = size
+        self._buckets = [_Bucket(capacity) for _ in range(size)]
+
+    def _bucket(self, now: float) -> _Bucket:
+        index = int(now // self.width)
+        bucket = self._buckets[index % self.size]
+        if bucket.index != index:
+            # The slot last held a bucket that has left the window
+            bucket.index = index
+            bucket.totals = _Counts()
+            bucket.sources.clear()
+        return bucket
+
+    def record(self, source: str, rejected: bool, now: float):
+        bucket = self._bucket(now)
+        bucket.totals.count += 1
+        if rejected:
+            bucket.totals.rejected += 1
+        bucket.sources.record(source, rejected)
+
+    def record_speech(self, source: str, seconds: float, now: float):
+        bucket = self._bucket(now)
+        bucket.totals.speech += seconds
+        bucket.sources.record_speech(source, seconds)
+
+    def snapshot(self, now: float, top: int) -> dict:
+        """Totals, the `top` busiest sources and the unattributed rest."""
+        current = int(now // self.width)
+        totals = _Counts()
+        merged: dict[str, _Counts] = {}
+        for bucket in self._buckets:
+            if current - self.size < bucket.index <= current:
+                totals.add(bucket.totals)
+                for source, counts in bucket.sources.entries.items():
+                    merged.setdefault(source, _Counts()).add(counts)
+
+        ranked = sorted(merged.items(), key=lambda item: -item[1].count)[:top]
+        other = _Counts()
+        other.add(totals)
+        sources = []
+        for source, counts in ranked:
+            # Only the guaranteed part of a listed count is taken from "other"
+            other.count -= counts.count - counts.error
+            other.rejected -= counts.rejected
+            other.speech -= counts.speech
+            sources.append(
+                {"source": source, **counts.as_dict(), "error": counts.error}
+            )
+        other.count = max(other.count, 0)
+        other.speech = max(other.speech, 0.0)
+        return {
+            "total": totals.as_dict(),
+            "sources": sources,
+            "other": other.as_dict(),
+        }
+
+
+class UsageStats:
+    """Per-source notification counts, rejections and speech time."""
+
+    def __init__(self, capacity: int = 32):
+        self.windows = {
+            name: RollingWindow(width, size, capacity)
+            for name, (width, size) in WINDOWS.items()
+        }
+
+    def record(self, source: str | None, rejected: bool = False):
+        """Count an incoming notification, rejected by rate limit or admission."""
+        now = time.time()
+        for window in self.windows.values():
+            window.record(source or UNKNOWN_SOURCE, rejected, now)
+
+    def record_speech(self, source: str | None, seconds: float):
+        """Attribute time spent speaking a source's notification."""
+        now = time.time()
+        for window in self.windows.values():
+            window.record_speech(source or UNKNOWN_SOURCE, seconds, now)
+
+    def snapshot(self, window: str | None = None, top: int = 10) -> dict:
+        """Statistics for one window, or all of them, as plain data."""
+        if window is not None and window not in self.windows:
+            raise ValueError(f"Window must be one of {', '.join(self.windows)}")
+        now = time.time()
+        names = [window] if window is not None else list(self.windows)
+        return {
+            "timestamp": now,
+            "windows": {
+                name: self.windows[name].snapshot(now, top) for name in names
+            },
+        }
+
+
+def format_stats(snapshot: dict) -> str:
+    """Human-readable statistics, one table per window."""
+    lines = []
+    for name, window in snapshot["windows"].items():
+        total = window["total"]
+        lines.append(
+            f"=== Last {name}: {total['count']} notifications, "
+            f"{100 * total['rejection_rate']:.1f}% rejected, "
+            f"{total['speech_seconds']:.1f}s spoken ==="
+        )
+        rows = list(window["sources"])
+        if window["other"]["count"] or window["other"]["speech_seconds"]:
+            rows.append({"source": "(other)", **window["other"], "error": 0})
+        for row in rows:
+            # Counts that may be overestimated are marked approximate
+            count = f"{'~' if row['error'] else ''}{row['count']}"
+            lines.append(
+                f"{row['source'][:24]:<24} {count:>12}  "
+                f"{100 * row['rejection_rate']:5.1f}% rejected  "
+                f"{row['speech_seconds']:8.1f}s spoken"
+            )
+        if not rows:
+            lines.append("No notifications")
+    return "\n".join(lines)
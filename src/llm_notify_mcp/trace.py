@@ -0,0 +1,89 @@
+"""Traffic trace capture for LLM Notify MCP.
+
+A trace is a JSON-lines file: a header object followed by one compact
+`[offset, client, priority, source, message, deliver_at, expires_at]` array
+per incoming notification, where offset is seconds since the header's start
+time and deliver_at and expires_at are Unix times or null. Rows recorded
+before the last two fields were added are still read.
+
+Each server start appends a new header and its rows, so restarts and
+takeovers extend the trace instead of overwriting it.
+"""
+
+import json
+import time
+from pathlib import Path
+
+from .models import NotificationRequest
+
+TRACE_VERSION = 1
+
+
+class TraceRecorder:
+    """Appends incoming notifications to a trace file."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.started = time.time()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Line buffered so the trace survives the server being killed, and
+        # appended so another server writing the same file loses nothing
+        self._file = open(path, "a", buffering=1)
+        self._file.write(json.dumps(
+            {"trace": TRACE_VERSION, "started": self.started}
+        ) + "\n")
+
+    def record(self, request: NotificationRequest, client: str):
+        """Record one incoming notification."""
+        self._file.write(json.dumps(
+            [
+                round(time.time() - self.started, 3),
+                client,
+                request.priority,
+                request.source,
+                request.message,
+                request.deliver_at,
+                request.expires_at,
+            ],
+            separators=(",", ":")
+        ) + "\n")
+
+    def close(self):
+        """Close the trace file."""
+        self._file.close()
+
+
+def read_trace(path: Path) -> tuple[float, list[tuple[float, str, dict]]]:
+    """Read a trace, returning its start time and (offset, client, frame) rows.
+
+    Offsets of later server starts are made relative to the first one.
+    """
+    started = None
+    shift = 0.0
+    rows = []
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            if isinstance(row, dict):
+                if row.get("trace") != TRACE_VERSION:
+                    raise ValueError(f"Unsupported trace format in {path}")
+                if started is None:
+                    started = row["started"]
+                shift = row["started"] - started
+                continue
+            if started is None:
+                raise ValueError(f"Missing trace header in {path}")
+
+            offset, client, priority, source, message, *times = row
+            frame = {"message": message, "priority": priority, "source": source}
+            for field, value in zip(("deliver_at", "expires_at"), times):
+                if value is not None:
+                    frame[field] = value
+            rows.append((offset + shift, client, frame))
+    if started is None:
+        raise ValueError(f"Missing trace header in {path}")
+    # Servers that overlapped during a takeover interleave their rows
+    rows.sort(key=lambda row: row[0])
+    return started, rows
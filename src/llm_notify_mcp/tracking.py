@@ -0,0 +1,85 @@
+"""Delivery status tracking for LLM Notify MCP."""
+
+import asyncio
+import time
+from collections import OrderedDict
+
+# Delivery lifecycle: [scheduled ->] queued -> speaking -> delivered | failed,
+# or dropped when it expires first
+SCHEDULED = "scheduled"
+QUEUED = "queued"
+SPEAKING = "speaking"
+DELIVERED = "delivered"
+FAILED = "failed"
+DROPPED = "dropped"
+
+TERMINAL_STATES = frozenset({DELIVERED, FAILED, DROPPED})
+
+
+class DeliveryTracker:
+    """Bounded table of notification delivery states with long-poll waits."""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self.records: OrderedDict[str, dict] = OrderedDict()
+        self._waiters: dict[str, asyncio.Event] = {}
+
+    def add(
+        self,
+        notification_id: str,
+        message: str,
+        priority: str,
+        source: str | None,
+        state: str = QUEUED
+    ) -> dict:
+        """Start tracking a newly accepted notification."""
+        now = time.time()
+        record = {
+            "id": notification_id,
+            "state": state,
+            "message": message,
+            "priority": priority,
+            "source": source,
+            "created": now,
+            "updated": now,
+            "error": None,
+            "digest_id": None,
+        }
+        self.records[notification_id] = record
+
+        # Evict the oldest records once the table is full
+        while len(self.records) > self.max_entries:
+            evicted, _ = self.records.popitem(last=False)
+            waiter = self._waiters.pop(evicted, None)
+            if waiter is not None:
+                waiter.set()
+        return record
+
+    def update(self, notification_id: str, state: str, **fields):
+        """Move a notification to a new state."""
+        record = self.records.get(notification_id)
+        if record is None:
+            return
+
+        record.update(fields, state=state, updated=time.time())
+        if state in TERMINAL_STATES:
+            waiter = self._waiters.pop(notification_id, None)
+            if waiter is not None:
+                waiter.set()
+
+    def get(self, notification_id: str) -> dict | None:
+        """Get the current record for a notification."""
+        return self.records.get(notification_id)
+
+    async def wait(self, notification_id: str, timeout: float) -> dict | None:
+        """Wait until a notification reaches a final state or the timeout ends."""
+        record = self.records.get(notification_id)
+        if record is None or record["state"] in TERMINAL_STATES or timeout <= 0:
+            return record
+
+        waiter = self._waiters.setdefault(notification_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(waiter.wait(), timeout)
+        except TimeoutError:
+            pass
+        return self.records.get(notification_id)
@@ -1,6 +1,6 @@
 """Tests for the notification client."""
 
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
@@ -81,3 +81,27 @@ def test_notify_function_message_too_long():
             mock_send.assert_called_once()
             args = mock_send.call_args[0]
             assert len(args[0]) == 140
+
+
+@pytest.mark.asyncio
+async def test_client_reuses_session():
+    """Test that the client pools one session across calls."""
+    client = NotificationClient()
+
+    first = await client._get_session()
+    second = await client._get_session()
+    assert first is second
+
+    await client.close()
+    assert first.closed
+
+
+@pytest.mark.asyncio
+async def test_websocket_ack_without_id_counts_as_sent():
+    """Test an ack with no id (e.g. a relay-only server) is still a success."""
+    client = NotificationClient(transport="websocket")
+    reply = {"type": "ack", "success": True, "id": None, "admission": "relayed"}
+
+    with patch.object(client, "_send_ws", AsyncMock(return_value=reply)):
+        assert await client.submit_with_status("Hello") == (200, "")
+        assert await client.send_notification("Hello") is True
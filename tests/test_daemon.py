@@ -0,0 +1,161 @@
+"""Tests for the daemon's pid and readiness files."""
+
+import asyncio
+import os
+import socket
+import subprocess
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import uvicorn
+
+from llm_notify_mcp.cli import ReadyServer
+from llm_notify_mcp.client import NotificationClient
+from llm_notify_mcp.config import Config
+from llm_notify_mcp.daemon import (
+    READY,
+    STARTING,
+    STOPPED,
+    AlreadyRunningError,
+    ServerFiles,
+)
+from llm_notify_mcp.server import NotificationServer
+
+
+def _dead_pid() -> int:
+    process = subprocess.Popen(["true"])
+    process.wait()
+    return process.pid
+
+
+def test_server_files_lifecycle(tmp_path):
+    """Test the state moves from stopped to starting to ready and back."""
+    files = ServerFiles(tmp_path)
+    assert files.state() == STOPPED
+
+    files.claim()
+    assert files.running_pid() == os.getpid()
+    assert files.state() == STARTING
+
+    files.mark_ready("127.0.0.1", 8765)
+    assert files.state(8765) == READY
+    assert files.state(9999) == STOPPED
+    assert files.ready_info()["pid"] == os.getpid()
+
+    files.release()
+    assert files.state() == STOPPED
+    assert not files.pid_path.exists()
+    assert not files.ready_path.exists()
+
+
+def test_single_instance(tmp_path):
+    """Test a live server's pid file blocks a second one, unless taking over."""
+    files = ServerFiles(tmp_path)
+    # The parent process stands in for another running server
+    files.pid_path.write_text(f"{os.getppid()}\n")
+
+    with pytest.raises(AlreadyRunningError) as exc:
+        files.claim()
+    assert exc.value.pid == os.getppid()
+
+    files.claim(takeover=True)
+    assert files.running_pid() == os.getpid()
+
+
+def test_stale_files_are_ignored(tmp_path):
+    """Test files left by a killed server neither block nor advertise it."""
+    files = ServerFiles(tmp_path)
+    pid = _dead_pid()
+    files.pid_path.write_text(f"{pid}\n")
+    files.ready_path.write_text(f'{{"pid": {pid}, "port": 8765}}')
+    assert files.state(8765) == STOPPED
+
+    files.claim()
+    assert files.running_pid() == os.getpid()
+
+
+def test_release_keeps_successor_files(tmp_path):
+    """Test a process never removes files a successor has taken over."""
+    files = ServerFiles(tmp_path)
+    files.claim()
+    files.pid_path.write_text(f"{os.getppid()}\n")
+    files.ready_path.write_text(f'{{"pid": {os.getppid()}, "port": 8765}}')
+
+    files.release()
+    assert files.pid_path.exists()
+    assert files.ready_path.exists()
+
+
+@pytest.mark.asyncio
+async def test_client_fails_fast_when_stopped(tmp_path):
+    """Test the client does not try to connect when no server is running."""
+    client = NotificationClient(run_dir=tmp_path)
+    get_session = AsyncMock()
+
+    with patch.object(client, "_get_session", get_session):
+        assert not client.is_ready()
+        assert await client.submit_with_status("Build finished") == (0, None)
+        assert not await client.health_check()
+
+    get_session.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_client_waits_for_starting_server(tmp_path):
+    """Test the client waits for a starting server before its first request."""
+    files = ServerFiles(tmp_path)
+    files.claim()
+    client = NotificationClient(port=8765, run_dir=tmp_path)
+    get_session = AsyncMock(side_effect=ConnectionError)
+
+    async def become_ready():
+        await asyncio.sleep(0.1)
+        files.mark_ready("127.0.0.1", 8765)
+
+    with patch.object(client, "_get_session", get_session):
+        ready = asyncio.create_task(become_ready())
+        await client.health_check()
+        assert ready.done()
+
+    get_session.assert_awaited_once()
+    files.release()
+
+
+@pytest.mark.asyncio
+async def test_server_announces_readiness(tmp_path, monkeypatch):
+    """Test readiness is announced once listening and withdrawn on exit."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    config = Config(visual_notifications=False, port=port)
+    server = NotificationServer(config)
+    files = ServerFiles(config.get_run_dir())
+    files.claim()
+    server.server_files = files
+
+    # The lifespan runs before uvicorn listens, so it must not announce yet
+    states = []
+    startup = server.startup
+
+    async def record_state():
+        states.append(files.state(port))
+        await startup()
+
+    server.startup = record_state
+    listener = ReadyServer(uvicorn.Config(
+        server.app, host="127.0.0.1", port=port, log_level="warning"
+    ), files)
+    task = asyncio.create_task(listener.serve())
+    while not listener.started:
+        await asyncio.sleep(0.01)
+
+    assert states == [STARTING]
+    assert files.state(port) == READY
+    _, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.close()
+
+    listener.should_exit = True
+    await task
+    assert files.state(port) == STOPPED
+    assert not files.pid_path.exists()
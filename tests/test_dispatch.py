@@ -0,0 +1,403 @@
+"""Tests for the dispatch queue and digest stage."""
+
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+import pytest
+
+from llm_notify_mcp.config import Config
+from llm_notify_mcp.dispatch import (
+    AdmissionRejectedError,
+    NotificationDispatcher,
+    PendingNotification,
+    format_digest,
+)
+from llm_notify_mcp.models import NotificationRequest
+from llm_notify_mcp.tracking import DeliveryTracker
+
+
+def make_dispatcher(**overrides):
+    """Create a dispatcher that records delivered requests."""
+    delivered = []
+
+    async def deliver(request):
+        delivered.append(request)
+
+    config = Config(**overrides)
+    return NotificationDispatcher(deliver, config), delivered
+
+
+async def drain(dispatcher):
+    """Let the worker deliver everything queued."""
+    for _ in range(100):
+        if len(dispatcher) == 0:
+            break
+        await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    await dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_high_priority_first():
+    """Test high priority notifications jump the queue."""
+    dispatcher, delivered = make_dispatcher(digest_enabled=False)
+
+    dispatcher.enqueue(NotificationRequest(message="low", priority="low"))
+    dispatcher.enqueue(NotificationRequest(message="normal"))
+    dispatcher.enqueue(NotificationRequest(message="high", priority="high"))
+    await drain(dispatcher)
+
+    assert [r.message for r in delivered] == ["high", "normal", "low"]
+
+
+@pytest.mark.asyncio
+async def test_burst_is_digested_per_source():
+    """Test a backlog of one source is folded into a single utterance."""
+    dispatcher, delivered = make_dispatcher(digest_backlog=5)
+
+    for i in range(5):
+        dispatcher.enqueue(NotificationRequest(message=f"step {i}", source="backup"))
+    dispatcher.enqueue(NotificationRequest(message="lone", priority="low", source="ci"))
+    dispatcher.enqueue(NotificationRequest(message="urgent", priority="high"))
+    await drain(dispatcher)
+
+    assert [r.message for r in delivered] == [
+        "urgent",
+        "5 updates from backup, latest: step 4",
+        "lone",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_digest_keeps_members():
+    """Test a digest records every notification it replaced."""
+    dispatcher, _ = make_dispatcher(digest_backlog=2)
+
+    first = dispatcher.enqueue(NotificationRequest(message="a", source="job"))
+    second = dispatcher.enqueue(NotificationRequest(message="b", source="job"))
+    dispatcher._digest()
+    await dispatcher.stop()
+
+    digest = dispatcher.queues["normal"][0]
+    assert digest.members == [first, second]
+
+
+@pytest.mark.asyncio
+async def test_digest_keeps_place_in_queue():
+    """Test a digest does not jump ahead of older entries from other sources."""
+    dispatcher, delivered = make_dispatcher(digest_backlog=4)
+
+    dispatcher.enqueue(NotificationRequest(message="first", source="ci"))
+    for i in range(3):
+        dispatcher.enqueue(NotificationRequest(message=f"step {i}", source="job"))
+    dispatcher.enqueue(NotificationRequest(message="after", source="deploy"))
+    await drain(dispatcher)
+
+    assert [r.message for r in delivered] == [
+        "first",
+        "3 updates from job, latest: step 2",
+        "after",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stale_arrivals_do_not_digest():
+    """Test the arrival rate only counts the last minute."""
+    dispatcher, _ = make_dispatcher(digest_backlog=100, digest_rate=3)
+
+    for _ in range(3):
+        dispatcher.enqueue(NotificationRequest(message="burst", source="job"))
+    assert dispatcher._should_digest()
+
+    # The burst was over a minute ago and nothing has arrived since
+    dispatcher._arrivals = deque(t - 61 for t in dispatcher._arrivals)
+    assert not dispatcher._should_digest()
+    await dispatcher.stop()
+
+
+def test_format_digest_truncates():
+    """Test digest text stays within the message limit."""
+    entries = [
+        PendingNotification(NotificationRequest(message="x" * 140, source="agent"))
+        for _ in range(3)
+    ]
+
+    text = format_digest("agent", entries)
+    assert len(text) <= 140
+    assert text.startswith("3 updates from agent, latest: ")
+
+
+def fill_backlog(dispatcher, count=10):
+    """Queue enough distinct-source speech to blow a tight SLO."""
+    for i in range(count):
+        dispatcher.enqueue(
+            NotificationRequest(message=f"long running step {i} done", source=str(i))
+        )
+
+
+@pytest.mark.asyncio
+async def test_slo_reject():
+    """Test low/normal notifications past the SLO are rejected."""
+    dispatcher, _ = make_dispatcher(
+        latency_slo=5, slo_action="reject", digest_enabled=False
+    )
+
+    with pytest.raises(AdmissionRejectedError) as excinfo:
+        fill_backlog(dispatcher)
+    assert excinfo.value.projected_delay > 5
+
+    # High priority is always admitted
+    entry = dispatcher.enqueue(NotificationRequest(message="fire", priority="high"))
+    assert entry.admission == "queued"
+    assert dispatcher.projected_delay("high") < 5
+    await dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_slo_defer():
+    """Test deferred notifications speak after everything else."""
+    dispatcher, delivered = make_dispatcher(
+        latency_slo=5, slo_action="defer", digest_enabled=False
+    )
+
+    fill_backlog(dispatcher)
+    assert dispatcher.queues["deferred"]
+    assert dispatcher.queues["deferred"][0].admission == "deferred"
+
+    deferred = dispatcher.queues["deferred"][0].request.message
+
+    # Deferred entries do not count against later arrivals' SLO
+    late = dispatcher.enqueue(NotificationRequest(message="late", priority="low"))
+    assert late.admission == "queued"
+
+    await drain(dispatcher)
+    messages = [r.message for r in delivered]
+    assert messages.index("late") < messages.index(deferred)
+
+
+@pytest.mark.asyncio
+async def test_slo_digest():
+    """Test SLO pressure folds the backlog into digests."""
+    dispatcher, _ = make_dispatcher(
+        latency_slo=5, slo_action="digest", digest_backlog=100
+    )
+
+    for i in range(10):
+        dispatcher.enqueue(NotificationRequest(message=f"step {i} done", source="job"))
+
+    assert len(dispatcher.queues["normal"]) < 10
+    assert any(entry.members for entry in dispatcher.queues["normal"])
+    await dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_slo_digest_defers_when_digests_disabled():
+    """Test the digest action falls back to deferring without digests."""
+    dispatcher, _ = make_dispatcher(
+        latency_slo=5, slo_action="digest", digest_enabled=False
+    )
+
+    entries = [
+        dispatcher.enqueue(NotificationRequest(message=f"step {i} done", source="job"))
+        for i in range(10)
+    ]
+
+    assert entries[-1].admission == "deferred"
+    assert not any(entry.admission == "digested" for entry in entries)
+    assert len(dispatcher.queues["normal"]) + len(dispatcher.queues["deferred"]) == 10
+    await dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_slo_digest_tracks_every_member():
+    """Test the entry that triggers an SLO digest reports the digest's id."""
+    dispatcher, _ = make_dispatcher(
+        latency_slo=3, slo_action="digest", digest_backlog=100
+    )
+    dispatcher.tracker = DeliveryTracker()
+
+    first = dispatcher.enqueue(NotificationRequest(
+        message="Build 1 finished successfully", source="ci"
+    ))
+    second = dispatcher.enqueue(NotificationRequest(
+        message="Build 2 finished successfully", source="ci"
+    ))
+
+    assert second.admission == "digested"
+    digest_id = dispatcher.queues["normal"][0].id
+    assert dispatcher.tracker.get(first.id)["digest_id"] == digest_id
+    assert dispatcher.tracker.get(second.id)["digest_id"] == digest_id
+    await dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_slo_digest_defers_lone_sources():
+    """Test over-SLO entries that no digest absorbs are deferred instead."""
+    dispatcher, _ = make_dispatcher(
+        latency_slo=3, slo_action="digest", digest_backlog=100
+    )
+
+    entries = [
+        dispatcher.enqueue(NotificationRequest(
+            message=f"Build {i} finished successfully", source=f"agent-{i}"
+        ))
+        for i in range(4)
+    ]
+
+    assert entries[0].admission == "queued"
+    assert [entry.admission for entry in entries[1:]] == ["deferred"] * 3
+    assert len(dispatcher.queues["deferred"]) == 3
+    await dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_deliver_at_schedules_release():
+    """Test a future deliver_at holds the entry until it is due."""
+    dispatcher, delivered = make_dispatcher(
+        digest_enabled=False, latency_slo=0
+    )
+    dispatcher.tracker = DeliveryTracker()
+
+    entry = dispatcher.enqueue(NotificationRequest(
+        message="later", deliver_at=time.time() + 0.05
+    ))
+    dispatcher.enqueue(NotificationRequest(message="now"))
+    assert entry.admission == "scheduled"
+    assert dispatcher.tracker.get(entry.id)["state"] == "scheduled"
+
+    await asyncio.sleep(0.01)
+    assert [r.message for r in delivered] == ["now"]
+    await asyncio.sleep(0.1)
+    assert [r.message for r in delivered] == ["now", "later"]
+    await dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_dropped():
+    """Test entries past expires_at are dropped, not delivered."""
+    dispatcher, delivered = make_dispatcher(digest_enabled=False)
+    dispatcher.tracker = DeliveryTracker()
+
+    stale = dispatcher.enqueue(NotificationRequest(
+        message="stale", expires_at=time.time() - 1
+    ))
+    late = dispatcher.enqueue(NotificationRequest(
+        message="late", deliver_at=time.time() + 10, expires_at=time.time() + 20
+    ))
+    queued = dispatcher.enqueue(NotificationRequest(
+        message="queued", priority="low", expires_at=time.time() + 60
+    ))
+    # Expires while waiting in the queue
+    queued.request.expires_at = time.time() - 1
+    dispatcher.enqueue(NotificationRequest(message="fresh", priority="high"))
+    await drain(dispatcher)
+
+    assert stale.admission == "expired"
+    assert dispatcher.tracker.get(stale.id)["state"] == "dropped"
+    assert late.admission == "scheduled"
+    assert dispatcher.tracker.get(queued.id)["state"] == "dropped"
+    assert [r.message for r in delivered] == ["fresh"]
+
+
+@pytest.mark.asyncio
+async def test_quiet_hours_hold_and_digest():
+    """Test only high priority speaks in quiet hours; the rest is digested."""
+    now = datetime.now()
+    start = (now - timedelta(hours=1)).strftime("%H:%M")
+    end = (now + timedelta(hours=1)).strftime("%H:%M")
+    dispatcher, delivered = make_dispatcher(quiet_hours=f"{start}-{end}")
+
+    held = [
+        dispatcher.enqueue(NotificationRequest(message=f"step {i}", source="job"))
+        for i in range(3)
+    ]
+    dispatcher.enqueue(NotificationRequest(message="outage", priority="high"))
+    await drain(dispatcher)
+    assert [r.message for r in delivered] == ["outage"]
+    assert {entry.admission for entry in held} == {"held"}
+    assert len(dispatcher.timers) == 3
+
+    # Quiet hours end: everything held is released at once and digested
+    dispatcher.quiet_hours = None
+    dispatcher._release(dispatcher.timers.pop_due(time.time() + 7200))
+    await drain(dispatcher)
+    assert [r.message for r in delivered] == [
+        "outage", "3 updates from job, latest: step 2"
+    ]
+
+
+def test_expiry_must_follow_delivery():
+    """Test requests cannot expire before they are due."""
+    with pytest.raises(ValueError):
+        NotificationRequest(message="x", deliver_at=100.0, expires_at=50.0)
+
+
+@pytest.mark.asyncio
+async def test_snapshot_and_restore_keep_ids():
+    """Test undelivered entries, including digest members, survive a restart."""
+    dispatcher, _ = make_dispatcher(digest_backlog=2)
+    first = dispatcher.enqueue(NotificationRequest(message="a", source="job"))
+    second = dispatcher.enqueue(NotificationRequest(message="b", source="job"))
+    later = dispatcher.enqueue(NotificationRequest(
+        message="later", deliver_at=time.time() + 3600
+    ))
+    dispatcher._digest()
+    saved = dispatcher.snapshot()
+    await dispatcher.stop()
+
+    assert [item["id"] for item in saved] == [first.id, second.id, later.id]
+
+    restored, delivered = make_dispatcher(digest_enabled=False, latency_slo=0.01)
+    restored.tracker = DeliveryTracker()
+    restored.restore(saved)
+    assert restored.tracker.get(later.id)["state"] == "scheduled"
+    await drain(restored)
+    assert [r.message for r in delivered] == ["a", "b"]
+    assert restored.tracker.get(first.id)["state"] == "delivered"
+
+
+@pytest.mark.asyncio
+async def test_drain_stops_at_deadline():
+    """Test draining finishes the current utterance and leaves the rest."""
+    delivered = []
+
+    async def deliver(request):
+        await asyncio.sleep(0.05)
+        delivered.append(request.message)
+
+    dispatcher = NotificationDispatcher(
+        deliver, Config(digest_enabled=False, latency_slo=0)
+    )
+    for i in range(10):
+        dispatcher.enqueue(NotificationRequest(message=f"step {i}"))
+
+    await dispatcher.drain(0.12)
+
+    assert 2 <= len(delivered) <= 4
+    assert len(dispatcher.snapshot()) == 10 - len(delivered)
+
+
+@pytest.mark.asyncio
+async def test_drain_requeues_unfinished_utterance():
+    """Test an utterance cut off after the grace period is saved, not lost."""
+    async def deliver(request):
+        await asyncio.sleep(60)
+
+    dispatcher = NotificationDispatcher(
+        deliver, Config(digest_enabled=False, latency_slo=0, speech_timeout=0.1)
+    )
+    dispatcher.tracker = DeliveryTracker()
+    dispatcher._estimate = lambda request: 0.0
+    stuck = dispatcher.enqueue(NotificationRequest(message="stuck"))
+    dispatcher.enqueue(NotificationRequest(message="waiting"))
+    await asyncio.sleep(0.01)
+    assert dispatcher.tracker.get(stuck.id)["state"] == "speaking"
+
+    await dispatcher.drain(0)
+
+    saved = dispatcher.snapshot()
+    assert [item["request"]["message"] for item in saved] == ["stuck", "waiting"]
+    assert saved[0]["id"] == stuck.id
+    assert dispatcher.tracker.get(stuck.id)["state"] == "queued"
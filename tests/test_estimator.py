@@ -0,0 +1,26 @@
+"""Tests for speech duration estimation."""
+
+from llm_notify_mcp.estimator import SpeechEstimator
+
+
+def test_estimate_scales_with_length_and_rate():
+    """Test longer messages and slower rates take longer."""
+    estimator = SpeechEstimator()
+    short = estimator.estimate("Build done", 180)
+    long = estimator.estimate("Build done with three warnings in module", 180)
+
+    assert long > short
+    assert estimator.estimate("Build done", 90) > short
+
+
+def test_observe_calibrates_towards_actual():
+    """Test observed run times pull the estimate towards reality."""
+    estimator = SpeechEstimator(alpha=0.5)
+    message = "Deployment finished successfully"
+    before = estimator.estimate(message, 180)
+
+    for _ in range(10):
+        estimator.observe(message, 180, before * 2)
+
+    assert abs(estimator.estimate(message, 180) - before * 2) < 0.05 * before
+    assert estimator.samples == 10
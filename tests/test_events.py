@@ -0,0 +1,55 @@
+"""Tests for the live event stream."""
+
+import json
+
+import pytest
+
+from llm_notify_mcp.events import EventBroadcaster
+
+
+def test_subscriber_filters():
+    """Test subscribers only receive matching events."""
+    broadcaster = EventBroadcaster()
+    ci = broadcaster.subscribe(sources={"ci"})
+    urgent = broadcaster.subscribe(priorities={"high"})
+
+    broadcaster.publish("accepted", message="a", priority="normal", source="ci")
+    broadcaster.publish("accepted", message="b", priority="high", source="backup")
+
+    assert [e["message"] for e in ci.buffer] == ["a"]
+    assert [e["message"] for e in urgent.buffer] == ["b"]
+
+
+def test_slow_subscriber_drops_oldest():
+    """Test a full buffer drops the oldest events instead of blocking."""
+    broadcaster = EventBroadcaster(buffer_size=3)
+    slow = broadcaster.subscribe()
+
+    for i in range(5):
+        broadcaster.publish("accepted", message=str(i), priority="low", source=None)
+
+    assert [e["message"] for e in slow.buffer] == ["2", "3", "4"]
+    assert slow.dropped == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_formats_sse():
+    """Test the stream emits SSE frames and reports drops."""
+    broadcaster = EventBroadcaster(buffer_size=1)
+    subscription = broadcaster.subscribe()
+    broadcaster.publish("accepted", message="old", priority="low", source=None)
+    broadcaster.publish("delivered", message="new", priority="low", source=None)
+
+    async def connected():
+        return False
+
+    stream = broadcaster.stream(subscription, connected, keepalive=0.01)
+    dropped = await anext(stream)
+    frame = await anext(stream)
+    await stream.aclose()
+
+    assert dropped.startswith("event: dropped")
+    assert "event: delivered" in frame
+    data = json.loads(frame.split("data: ", 1)[1])
+    assert data["message"] == "new"
+    assert subscription not in broadcaster.subscribers
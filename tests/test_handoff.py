@@ -0,0 +1,54 @@
+"""Tests for handing the listening socket to a new server process."""
+
+import asyncio
+import socket
+
+import pytest
+
+from llm_notify_mcp.handoff import Handoff, take_over
+
+
+@pytest.mark.asyncio
+async def test_listening_socket_handoff(tmp_path):
+    """Test a successor receives the same socket and releases the old server."""
+    path = tmp_path / "control.sock"
+    listener = socket.create_server(("127.0.0.1", 0))
+    exits = []
+    old = Handoff(path, listener, lambda: exits.append(True))
+    await old.start(on_predecessor_done=None)
+
+    inherited, control = await asyncio.to_thread(take_over, path)
+    assert inherited.getsockname() == listener.getsockname()
+    assert not old.released
+
+    restored = asyncio.Event()
+
+    async def on_done():
+        restored.set()
+
+    new = Handoff(path, inherited, lambda: None, predecessor=control)
+    await new.start(on_done)
+    for _ in range(100):
+        if old.released:
+            break
+        await asyncio.sleep(0.01)
+    assert exits == [True]
+
+    # The successor only picks up the queue once the old server has saved it
+    await asyncio.sleep(0.05)
+    assert not restored.is_set()
+    await old.finish()
+    await asyncio.wait_for(restored.wait(), 1)
+
+    # The control socket path now belongs to the successor
+    assert path.exists()
+    await new.finish()
+    assert not path.exists()
+    listener.close()
+    inherited.close()
+
+
+def test_take_over_without_server(tmp_path):
+    """Test taking over fails cleanly when no server is running."""
+    with pytest.raises(OSError):
+        take_over(tmp_path / "control.sock", timeout=0.5)
@@ -0,0 +1,50 @@
+"""Tests for backend health tracking."""
+
+from unittest.mock import patch
+
+from llm_notify_mcp.health import CLOSED, HALF_OPEN, OPEN, BackendHealth
+
+
+def test_circuit_opens_after_consecutive_failures():
+    """Test the circuit opens at the threshold and a success resets the count."""
+    health = BackendHealth("say", failure_threshold=2)
+
+    health.record_failure()
+    health.record_success(1.0)
+    health.record_failure()
+    assert health.state == CLOSED
+
+    health.record_failure()
+    assert health.state == OPEN
+    assert not health.allow()
+    assert health.failures == 3
+
+
+def test_half_open_probe_closes_or_reopens():
+    """Test a single probe is allowed after the reset timeout."""
+    health = BackendHealth("say", failure_threshold=1, reset_timeout=30.0)
+    with patch("llm_notify_mcp.health.time.monotonic", return_value=100.0):
+        health.record_failure()
+
+    with patch("llm_notify_mcp.health.time.monotonic", return_value=131.0):
+        assert health.allow()
+        assert health.state == HALF_OPEN
+        assert not health.allow()  # Only one probe at a time
+        health.record_failure()
+        assert health.state == OPEN
+
+    with patch("llm_notify_mcp.health.time.monotonic", return_value=162.0):
+        assert health.allow()
+        health.record_success(2.0)
+    assert health.state == CLOSED
+    assert health.consecutive_failures == 0
+
+
+def test_latency_ewma():
+    """Test latency is an exponentially weighted average of successes."""
+    health = BackendHealth("say", alpha=0.5)
+    health.record_success(2.0)
+    health.record_success(4.0)
+
+    assert health.latency == 3.0
+    assert health.snapshot()["successes"] == 2
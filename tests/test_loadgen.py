@@ -0,0 +1,66 @@
+"""Tests for the multi-agent load generator."""
+
+import asyncio
+import itertools
+import random
+
+import pytest
+import uvicorn
+
+from llm_notify_mcp.config import Config
+from llm_notify_mcp.loadgen import arrival_intervals, format_summary, run_load_test
+from llm_notify_mcp.server import NotificationServer
+
+
+@pytest.mark.parametrize("arrival", ["constant", "poisson", "burst"])
+def test_arrival_patterns_average_the_rate(arrival):
+    """Test every arrival pattern sends at the requested mean rate."""
+    intervals = arrival_intervals(arrival, rate=4.0, burst_size=5, rng=random.Random(1))
+    gaps = list(itertools.islice(intervals, 2000))
+
+    assert sum(gaps) / len(gaps) == pytest.approx(0.25, rel=0.1)
+    if arrival == "burst":
+        assert gaps[:5] == [1.25, 0.0, 0.0, 0.0, 0.0]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("transport", ["http", "websocket"])
+async def test_load_test_against_server(transport):
+    """Test simulated agents report accepted and rate-limited notifications."""
+    server = NotificationServer(Config(
+        rate_limit=5, visual_notifications=False, persist_pending=False
+    ))
+
+    async def deliver(request):
+        pass
+
+    server.dispatcher.deliver = deliver
+    listener = uvicorn.Server(uvicorn.Config(
+        server.app, host="127.0.0.1", port=0, log_level="warning"
+    ))
+    task = asyncio.create_task(listener.serve())
+    while not listener.started:
+        await asyncio.sleep(0.01)
+    port = listener.servers[0].sockets[0].getsockname()[1]
+
+    try:
+        summary = await run_load_test(
+            port=port,
+            transport=transport,
+            agents=3,
+            rate=20.0,
+            duration=0.5,
+            arrival="constant",
+            report_interval=None,
+            seed=7
+        )
+    finally:
+        listener.should_exit = True
+        await task
+
+    # All agents share one address, so the per-client limit caps acceptance
+    assert summary["accepted"] == 5
+    assert summary["rate_limited"] == summary["sent"] - 5
+    assert summary["errors"] == 0
+    assert summary["latency_p50"] <= summary["latency_max"]
+    assert "got 429" in format_summary(summary)
@@ -0,0 +1,159 @@
+"""Tests for the MCP server tools."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from llm_notify_mcp import mcp_server
+from llm_notify_mcp.config import Config
+from llm_notify_mcp.models import NotificationRequest
+from llm_notify_mcp.server import NotificationServer
+
+
+@pytest.fixture
+def forwarding_server(tmp_path, monkeypatch):
+    """Install a forwarding-mode notification server for the MCP tools."""
+    # The forward client checks the run directory for a ready daemon
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config = Config(visual_notifications=False, mcp_forward=True)
+    mcp_server._notification_server = NotificationServer(config)
+    mcp_server._forward_client = None
+    yield mcp_server._notification_server
+    mcp_server._notification_server = None
+    mcp_server._forward_client = None
+
+
+@pytest.mark.asyncio
+async def test_notify_forwards_to_daemon(forwarding_server):
+    """Test notify tool forwards to a healthy daemon."""
+    client = mcp_server.get_forward_client()
+
+    with patch.object(client, "health_check", AsyncMock(return_value=True)), \
+            patch.object(client, "submit_with_status",
+                         AsyncMock(return_value=(200, "abc123"))) as mock_submit:
+        result = await mcp_server.notify("Build finished", "high", "ci")
+
+    assert "via daemon (id: abc123)" in result
+    mock_submit.assert_awaited_once_with("Build finished", "high", "ci")
+
+
+@pytest.mark.asyncio
+async def test_notify_reports_daemon_refusal(forwarding_server):
+    """Test a daemon 503 or 429 gets an explicit try-later reply."""
+    client = mcp_server.get_forward_client()
+    submit = AsyncMock(side_effect=[(503, None), (429, None)])
+
+    with patch.object(client, "health_check", AsyncMock(return_value=True)), \
+            patch.object(client, "submit_with_status", submit):
+        rejected = await mcp_server.notify("Build finished")
+        limited = await mcp_server.notify("Build finished")
+
+    assert "Try again later or use high priority" in rejected
+    assert "rate limit" in limited
+
+
+@pytest.mark.asyncio
+async def test_notify_starts_missing_daemon(forwarding_server):
+    """Test notify tool auto-starts the daemon when it is not running."""
+    client = mcp_server.get_forward_client()
+    health = AsyncMock(side_effect=[False, False, True])
+
+    with patch.object(client, "health_check", health), \
+            patch.object(client, "submit_with_status",
+                         AsyncMock(return_value=(200, "abc123"))), \
+            patch("llm_notify_mcp.mcp_server._spawn_daemon") as mock_spawn:
+        result = await mcp_server.notify("Build finished")
+
+    assert "via daemon" in result
+    mock_spawn.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_notify_falls_back_to_local(forwarding_server):
+    """Test notify tool delivers locally when the daemon is unavailable."""
+    forwarding_server.config.daemon_autostart = False
+    client = mcp_server.get_forward_client()
+
+    mock_local = AsyncMock()
+    forwarding_server.dispatcher.deliver = mock_local
+
+    with patch.object(client, "health_check", AsyncMock(return_value=False)):
+        result = await mcp_server.notify("Build finished", wait=True)
+
+    assert "was delivered" in result
+    assert "locally" in result
+    mock_local.assert_awaited_once()
+
+
+@pytest.fixture
+def local_server(tmp_path, monkeypatch):
+    """Install an in-process notification server for the MCP tools."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config = Config(visual_notifications=False)
+    mcp_server._notification_server = NotificationServer(config)
+    yield mcp_server._notification_server
+    mcp_server._notification_server = None
+
+
+@pytest.mark.asyncio
+async def test_notify_returns_before_speaking(local_server):
+    """Test notify queues and returns an id without waiting for speech."""
+    spoken = asyncio.Event()
+
+    async def slow_delivery(request):
+        await spoken.wait()
+
+    local_server.dispatcher.deliver = slow_delivery
+    result = await mcp_server.notify("Long job done")
+    notification_id = result.split("id: ")[1].split(")")[0]
+
+    await asyncio.sleep(0)
+    status = await mcp_server.notification_status(notification_id)
+    assert "being spoken" in status
+
+    spoken.set()
+    await local_server.tracker.wait(notification_id, 1)
+    status = await mcp_server.notification_status(notification_id)
+    assert "was delivered" in status
+    await local_server.dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_local_notify_is_accepted_like_http(local_server):
+    """Test MCP notifications are published and relayed like HTTP ones."""
+    local_server.dispatcher.deliver = AsyncMock()
+    local_server.relay = Mock()
+    subscription = local_server.events.subscribe()
+
+    await mcp_server.notify("Build finished", source="ci")
+
+    local_server.relay.forward.assert_called_once()
+    assert [event["type"] for event in subscription.buffer] == ["accepted"]
+    await local_server.dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_notification_status_reports_position(local_server):
+    """Test status reports how many notifications are ahead."""
+    local_server.dispatcher.enqueue(NotificationRequest(message="first"))
+    entry = local_server.dispatcher.enqueue(NotificationRequest(message="second"))
+    await local_server.dispatcher.stop()
+
+    status = await mcp_server.notification_status(entry.id)
+    assert "queued (1 ahead of it)" in status
+    assert "Unknown" in await mcp_server.notification_status("missing")
+
+
+@pytest.mark.asyncio
+async def test_usage_stats_reports_sources(local_server):
+    """Test the usage_stats tool lists sources and their speech time."""
+    local_server._send_audio_notification = AsyncMock(return_value=2.5)
+    await mcp_server.notify("Build finished", source="ci", wait=True)
+
+    report = await mcp_server.usage_stats("1m")
+    assert "Last 1m: 1 notifications" in report
+    assert "ci" in report
+    assert "2.5s spoken" in report
+    assert "Error" in await mcp_server.usage_stats("1w")
+    await local_server.dispatcher.stop()
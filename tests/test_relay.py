@@ -0,0 +1,197 @@
+"""Tests for relaying notifications to downstream servers."""
+
+import asyncio
+import socket
+from unittest.mock import AsyncMock, Mock
+
+import aiohttp
+import pytest
+import uvicorn
+
+from llm_notify_mcp.config import Config
+from llm_notify_mcp.dispatch import AdmissionRejectedError
+from llm_notify_mcp.models import NotificationRequest
+from llm_notify_mcp.relay import RELAY_HEADER, RelayForwarder
+from llm_notify_mcp.server import NotificationServer
+
+
+class Downstream:
+    """A notification server on a free local port that records deliveries."""
+
+    def __init__(self, **overrides):
+        self.delivered: list[NotificationRequest] = []
+        # Never restores or saves the real run directory's pending queue
+        self.notifier = NotificationServer(Config(
+            visual_notifications=False,
+            rate_limit=1000,
+            persist_pending=False,
+            **overrides
+        ))
+        self.notifier.dispatcher.deliver = self._deliver
+        self.uvicorn = uvicorn.Server(uvicorn.Config(
+            self.notifier.app, host="127.0.0.1", port=0, log_level="warning"
+        ))
+        self.task: asyncio.Task | None = None
+
+    async def _deliver(self, request: NotificationRequest):
+        self.delivered.append(request)
+
+    async def __aenter__(self):
+        self.task = asyncio.create_task(self.uvicorn.serve())
+        while not self.uvicorn.started:
+            await asyncio.sleep(0.01)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.uvicorn.should_exit = True
+        await self.task
+
+    @property
+    def url(self) -> str:
+        port = self.uvicorn.servers[0].sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+
+def _unused_url() -> str:
+    """URL of a local port nothing is listening on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+async def _wait_for(condition, timeout: float = 5.0):
+    """Poll until a condition holds."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.02)
+
+
+@pytest.mark.asyncio
+async def test_relay_fans_out_to_every_target():
+    """Test that one notification reaches every downstream server."""
+    async with Downstream() as first, Downstream() as second:
+        relay = RelayForwarder(Config(relay_targets=[first.url, second.url]))
+        try:
+            relay.forward(NotificationRequest(message="Build done", source="ci"))
+            await _wait_for(lambda: first.delivered and second.delivered)
+        finally:
+            await relay.close()
+
+    assert first.delivered[0].message == "Build done"
+    assert second.delivered[0].source == "ci"
+    assert [target["sent"] for target in relay.stats()] == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_dead_target_does_not_delay_others():
+    """Test that retries against a dead target leave live targets unaffected."""
+    async with Downstream() as live:
+        relay = RelayForwarder(Config(
+            relay_targets=[_unused_url(), live.url],
+            relay_retry_delay=10.0
+        ))
+        try:
+            for i in range(3):
+                relay.forward(NotificationRequest(message=f"Step {i}"))
+            await _wait_for(lambda: len(live.delivered) == 3, timeout=2.0)
+        finally:
+            await relay.close()
+
+    dead, alive = relay.stats()
+    assert dead["failures"] >= 1
+    assert alive["sent"] == 3
+    assert alive["failures"] == 0
+
+
+@pytest.mark.asyncio
+async def test_rejected_batch_is_dropped_without_retry():
+    """Test that a downstream auth failure drops the batch immediately."""
+    async with Downstream(auth_token="secret") as secured:
+        relay = RelayForwarder(Config(relay_targets=[secured.url]))
+        try:
+            relay.forward(NotificationRequest(message="Hello"))
+            await _wait_for(lambda: relay.stats()[0]["dropped"] == 1)
+        finally:
+            await relay.close()
+
+    assert relay.stats()[0]["failures"] == 0
+    assert secured.delivered == []
+
+
+@pytest.mark.asyncio
+async def test_server_relays_accepted_notifications():
+    """Test that a relaying server forwards once and is not relayed back."""
+    async with Downstream() as downstream:
+        upstream = Downstream(
+            relay_targets=[downstream.url], relay_local_delivery=False
+        )
+        async with upstream, aiohttp.ClientSession() as session:
+            async with session.post(
+                f"{upstream.url}/notify",
+                json={"message": "Tests passed"},
+                headers={RELAY_HEADER: "1"}
+            ) as response:
+                # Already-relayed requests are delivered locally, not forwarded
+                assert response.status == 200
+
+            async with session.post(
+                f"{upstream.url}/notify/batch",
+                json={"notifications": [{"message": "A"}, {"message": "B"}]}
+            ) as response:
+                assert response.status == 200
+                results = (await response.json())["results"]
+
+            await _wait_for(lambda: len(downstream.delivered) == 2)
+            await upstream.notifier.relay.close()
+
+    assert results == [{"success": True, "id": None}] * 2
+    assert [r.message for r in downstream.delivered] == ["A", "B"]
+    assert [r.message for r in upstream.delivered] == ["Tests passed"]
+
+
+@pytest.mark.asyncio
+async def test_locally_rejected_notification_is_not_relayed():
+    """Test a notification refused with 503 here never reaches the relay."""
+    server = NotificationServer(Config(
+        visual_notifications=False,
+        relay_targets=[_unused_url()],
+        speech_lock=False,
+        latency_slo=1,
+        slo_action="reject"
+    ))
+    server.dispatcher.deliver = AsyncMock()
+    server.relay.forward = Mock()
+
+    with pytest.raises(AdmissionRejectedError):
+        server._accept(NotificationRequest(
+            message="This is a fairly long message that takes a while to speak"
+        ))
+    server.relay.forward.assert_not_called()
+
+    server._accept(NotificationRequest(message="Done", priority="high"))
+    server.relay.forward.assert_called_once()
+    await server.dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_items_refused_downstream_are_retried_then_dropped():
+    """Test per-item 503s in a batch response are not counted as sent."""
+    async with Downstream(latency_slo=1, slo_action="reject") as busy:
+        relay = RelayForwarder(Config(
+            relay_targets=[busy.url], relay_retry_delay=0.01, relay_max_retries=2
+        ))
+        try:
+            relay.forward(NotificationRequest(message="Done", priority="high"))
+            relay.forward(NotificationRequest(
+                message="This is a fairly long message that takes a while to speak"
+            ))
+            await _wait_for(lambda: relay.stats()[0]["dropped"] == 1)
+        finally:
+            await relay.close()
+
+    stats = relay.stats()[0]
+    assert stats["sent"] == 1
+    assert stats["failures"] == 3  # every attempt refused it
+    assert [r.message for r in busy.delivered] == ["Done"]
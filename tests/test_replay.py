@@ -0,0 +1,135 @@
+"""Tests for trace capture and replay."""
+
+import json
+from unittest.mock import AsyncMock
+
+from fastapi.testclient import TestClient
+
+from llm_notify_mcp.config import Config
+from llm_notify_mcp.replay import replay_trace
+from llm_notify_mcp.server import NotificationServer
+from llm_notify_mcp.trace import TRACE_VERSION, read_trace
+
+
+def _write_trace(path, rows):
+    with open(path, "w") as f:
+        f.write(json.dumps({"trace": TRACE_VERSION, "started": 1000.0}) + "\n")
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+
+
+def test_server_records_trace(tmp_path, monkeypatch):
+    """Test incoming notifications are recorded, including rate-limited ones."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    trace = tmp_path / "trace.jsonl"
+    server = NotificationServer(Config(
+        trace_file=str(trace),
+        rate_limit=1,
+        visual_notifications=False,
+        speech_lock=False
+    ))
+    server.dispatcher.deliver = AsyncMock()
+
+    with TestClient(server.app) as client:
+        client.post("/notify", json={"message": "One", "source": "ci"})
+        client.post("/notify", json={
+            "message": "Two", "priority": "high", "expires_at": 4e9
+        })
+        response = client.post(
+            "/notify/batch", json={"notifications": [{"message": "Three"}]}
+        )
+        assert response.status_code == 429
+
+    _, rows = read_trace(trace)
+    assert [row[2] for row in rows] == [
+        {"message": "One", "priority": "normal", "source": "ci"},
+        {"message": "Two", "priority": "high", "source": None, "expires_at": 4e9},
+        {"message": "Three", "priority": "normal", "source": None},
+    ]
+    assert rows[0][1] == "testclient"
+    assert 0 <= rows[0][0] <= rows[1][0]
+
+
+def test_trace_survives_other_servers(tmp_path, monkeypatch):
+    """Test only serving processes record, appending to an existing trace."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    trace = tmp_path / "trace.jsonl"
+    config = Config(
+        trace_file=str(trace), visual_notifications=False, speech_lock=False
+    )
+
+    for message in ("One", "Two"):
+        server = NotificationServer(config)
+        server.dispatcher.deliver = AsyncMock()
+        with TestClient(server.app) as client:
+            # A server that never serves leaves the trace alone
+            NotificationServer(config)
+            client.post("/notify", json={"message": message})
+
+    _, rows = read_trace(trace)
+    assert [row[2]["message"] for row in rows] == ["One", "Two"]
+    assert rows[0][0] <= rows[1][0]
+
+
+def test_virtual_clock_replay(tmp_path):
+    """Test an hour of traffic replays instantly with consistent timing."""
+    trace = tmp_path / "trace.jsonl"
+    _write_trace(trace, [
+        [0.0, "a", "normal", "ci", "Build started"],
+        [0.5, "a", "normal", "ci", "Build finished"],
+        [1800.0, "b", "high", None, "Deploy failed"],
+        [3600.0, "a", "low", "ci", "Cleanup done"],
+        [3600.0, "a", "low", "ci", "Over the limit"],
+    ])
+    config = Config(rate_limit=1, digest_enabled=False)
+
+    report = replay_trace(trace, config, virtual=True)
+
+    assert report["notifications"] == 5
+    assert report["rate_limited"] == 2
+    assert report["delivered"] == 3
+    assert report["dropped"] == report["expired"] == 0
+    assert report["utterances"] == 3
+    # Nothing queued behind anything else, so latency is the speech time
+    assert 0.5 < report["latency_max"] < 5
+    assert 3600 < report["duration"] < 3610
+    assert report["wall_seconds"] < 5
+
+
+def test_replay_applies_delivery_window(tmp_path):
+    """Test recorded deliver_at and expires_at hold and expire notifications."""
+    trace = tmp_path / "trace.jsonl"
+    _write_trace(trace, [
+        [0.0, "a", "normal", "ci", "Step finished successfully", None, 1000.5]
+        for _ in range(4)
+    ] + [
+        [10.0, "a", "normal", "deploy", "Deploy window opened", 1100.0, None],
+        # Rows recorded without the delivery window still replay
+        [20.0, "a", "normal", "ci", "Old format"],
+    ])
+    config = Config(rate_limit=100, digest_enabled=False)
+
+    report = replay_trace(trace, config, virtual=True)
+
+    # The first is spoken; the rest expire while it plays
+    assert report["expired"] == report["dropped"] == 3
+    assert report["delivered"] == 3
+    # The scheduled one waits 90s for its deliver_at
+    assert report["latency_max"] > 90
+
+
+def test_accelerated_replay_builds_backlog(tmp_path):
+    """Test a burst queues up behind speech at N-times speed."""
+    trace = tmp_path / "trace.jsonl"
+    _write_trace(trace, [
+        [i * 0.1, "a", "normal", "ci", "Step finished successfully"]
+        for i in range(4)
+    ])
+    config = Config(rate_limit=100, digest_enabled=False, adaptive_rate=False)
+
+    report = replay_trace(trace, config, speed=20)
+
+    assert report["delivered"] == 4
+    # Each one waits for the ones before it to be spoken
+    assert report["latency_max"] > report["latency_p50"] + 2
+    assert report["wall_seconds"] < report["speech_seconds"]
@@ -0,0 +1,54 @@
+"""Tests for channel routing rules."""
+
+from llm_notify_mcp.config import Route
+from llm_notify_mcp.routing import Router
+
+
+def test_first_matching_rule_wins():
+    """Test exact and glob rules are matched in configuration order."""
+    router = Router([
+        Route(source="*-debug", channels=["history"]),
+        Route(source="ci", channels=["visual"]),
+        Route(priority="high", channels=["audio", "visual", "sound"]),
+        Route(source="ci", priority="high", channels=["audio"]),
+    ])
+
+    assert router.match("build-debug", "high").channels == ("history",)
+    assert router.match("ci", "high").channels == ("visual",)
+    assert router.match("ci", "high").rule == 1
+    assert router.match("deploy", "high").rule == 2
+    assert router.match("deploy", "low") is None
+
+
+def test_glob_rule_before_exact_rule():
+    """Test an earlier glob rule takes precedence over a later exact rule."""
+    router = Router([
+        Route(source="c*", priority="low", channels=["history"]),
+        Route(source="ci", channels=["visual"]),
+    ])
+
+    assert router.match("ci", "low").channels == ("history",)
+    assert router.match("ci", "normal").channels == ("visual",)
+
+
+def test_priority_globs_and_missing_source():
+    """Test priority patterns expand and a missing source matches '*'."""
+    router = Router([
+        Route(priority="[ln]*", channels=["visual"]),
+        Route(channels=["audio"]),
+    ])
+
+    assert router.match(None, "low").channels == ("visual",)
+    assert router.match(None, "normal").channels == ("visual",)
+    assert router.match(None, "high").channels == ("audio",)
+
+
+def test_many_rules_index_exact_sources():
+    """Test literal sources are looked up without scanning other rules."""
+    router = Router([
+        Route(source=f"agent-{i}", channels=["visual"]) for i in range(500)
+    ])
+
+    assert len(router.exact) == 1500
+    assert router.match("agent-499", "normal").rule == 499
+    assert router.match("agent-500", "normal") is None
@@ -0,0 +1,67 @@
+"""Tests for timed release and quiet hours."""
+
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+
+from llm_notify_mcp.scheduler import TimerHeap, parse_quiet_hours, quiet_until
+
+
+def _at(hour: int, minute: int = 0) -> float:
+    return datetime(2026, 3, 10, hour, minute).timestamp()
+
+
+def test_quiet_hours_spanning_midnight():
+    """Test quiet periods that wrap around midnight end the next morning."""
+    night = parse_quiet_hours("22:00-07:00")
+    assert night == (22 * 60, 7 * 60)
+    assert quiet_until(night, _at(23, 30)) == datetime(
+        2026, 3, 11, 7, 0
+    ).timestamp()
+    assert quiet_until(night, _at(6, 59)) == _at(7)
+    assert quiet_until(night, _at(7)) is None
+
+    lunch = parse_quiet_hours("12:00-13:00")
+    assert quiet_until(lunch, _at(12, 30)) == _at(13)
+    assert quiet_until(lunch, _at(21)) is None
+
+
+def test_invalid_quiet_hours():
+    """Test malformed quiet hours are rejected."""
+    with pytest.raises(ValueError):
+        parse_quiet_hours("late evening")
+
+
+@pytest.mark.asyncio
+async def test_timer_heap_releases_in_order():
+    """Test items are released by time, earliest first, by one task."""
+    released = []
+    timers = TimerHeap(released.extend)
+    now = time.time()
+
+    timers.push(now + 0.10, "later")
+    timers.push(now + 0.05, "sooner")
+    timers.push(now - 1, "overdue")
+    assert [item for _, item in timers.items()] == ["overdue", "sooner", "later"]
+
+    await asyncio.sleep(0.01)
+    assert released == ["overdue"]
+    await asyncio.sleep(0.2)
+    assert released == ["overdue", "sooner", "later"]
+    assert len(timers) == 0
+    await timers.stop()
+
+
+@pytest.mark.asyncio
+async def test_timer_heap_scales_without_tasks():
+    """Test thousands of held items share a single timer task."""
+    timers = TimerHeap(lambda items: None)
+    tasks_before = len(asyncio.all_tasks())
+    for i in range(10000):
+        timers.push(time.time() + 3600 + i, i)
+
+    assert len(asyncio.all_tasks()) == tasks_before + 1
+    assert timers.pop_due(time.time() + 3600.5) == [0]
+    await timers.stop()
@@ -1,11 +1,14 @@
 """Tests for the notification server."""
 
-from unittest.mock import patch
+import asyncio
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
 from llm_notify_mcp.config import Config
+from llm_notify_mcp.dispatch import PendingNotification
+from llm_notify_mcp.models import NotificationRequest
 from llm_notify_mcp.server import NotificationServer
 
 
@@ -150,3 +153,299 @@ def test_auth_valid_token(mock_audio):
     }, headers={"Authorization": "Bearer secret-token"})
 
     assert response.status_code == 200
+
+
+@patch("llm_notify_mcp.server.NotificationServer._send_audio_notification")
+def test_websocket_ingest_acks(mock_audio, client):
+    """Test pipelined frames on the WebSocket are each acknowledged."""
+    mock_audio.return_value = None
+
+    with client.websocket_connect("/ws") as ws:
+        ws.send_json({"seq": 1, "message": "First", "priority": "normal"})
+        ws.send_json({"seq": 2, "message": "", "priority": "normal"})
+        ws.send_json({"seq": 3, "message": "Third", "priority": "high"})
+
+        replies = [ws.receive_json() for _ in range(3)]
+
+    assert [r["seq"] for r in replies] == [1, 2, 3]
+    assert replies[0]["type"] == "ack"
+    assert replies[1]["status"] == 422
+    assert replies[2]["type"] == "ack"
+
+
+def test_websocket_rate_limit():
+    """Test rate limiting is reported on the WebSocket connection."""
+    server = NotificationServer(Config(visual_notifications=False, rate_limit=1))
+    client = TestClient(server.app)
+
+    with patch.object(NotificationServer, "_send_audio_notification"):
+        with client.websocket_connect("/ws") as ws:
+            ws.send_json({"seq": 1, "message": "One"})
+            ws.send_json({"seq": 2, "message": "Two"})
+            first, second = ws.receive_json(), ws.receive_json()
+
+    assert first["type"] == "ack"
+    assert second["status"] == 429
+
+
+def test_batch_items_count_against_rate_limit():
+    """Test each notification in a batch is charged to the rate limit."""
+    server = NotificationServer(Config(
+        visual_notifications=False, speech_lock=False, rate_limit=2
+    ))
+    server.dispatcher.deliver = AsyncMock()
+    client = TestClient(server.app)
+
+    response = client.post("/notify/batch", json={
+        "notifications": [{"message": f"Step {i}"} for i in range(3)]
+    })
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["success"] for result in results] == [True, True, False]
+    assert results[2]["status"] == 429
+
+    response = client.post("/notify/batch", json={
+        "notifications": [{"message": "Over the limit"}]
+    })
+    assert response.status_code == 429
+    assert client.post("/notify", json={"message": "Also over"}).status_code == 429
+
+
+def test_websocket_auth_frame():
+    """Test a WebSocket authenticates once with an auth frame."""
+    server = NotificationServer(Config(
+        auth_token="secret-token", visual_notifications=False, speech_lock=False
+    ))
+    # The dispatcher holds its own reference to the delivery callable
+    server.dispatcher.deliver = AsyncMock()
+    client = TestClient(server.app)
+
+    with client.websocket_connect("/ws") as ws:
+        ws.send_json({"type": "auth", "token": "wrong-token"})
+        assert ws.receive_json()["status"] == 401
+
+    with client.websocket_connect("/ws") as ws:
+        ws.send_json({"type": "auth", "token": "secret-token"})
+        assert ws.receive_json()["success"] is True
+        ws.send_json({"seq": 1, "message": "Hello"})
+        assert ws.receive_json()["type"] == "ack"
+
+
+@patch("llm_notify_mcp.server.NotificationServer._send_audio_notification")
+def test_notification_status_long_poll(mock_audio, server, tmp_path, monkeypatch):
+    """Test a queued notification can be long-polled until delivered."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    mock_audio.return_value = 1.0  # seconds spoken
+
+    with TestClient(server.app) as client:
+        response = client.post("/notify", json={"message": "Track me"})
+        notification_id = response.json()["id"]
+
+        response = client.get(f"/notify/{notification_id}", params={"wait": 2})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["state"] == "delivered"
+    assert data["message"] == "Track me"
+
+
+def test_notification_status_unknown(client):
+    """Test status lookup for an unknown id."""
+    response = client.get("/notify/does-not-exist")
+    assert response.status_code == 404
+
+
+def test_notify_rejected_over_slo():
+    """Test /notify returns 503 with Retry-After when the SLO would be missed."""
+    config = Config(
+        visual_notifications=False,
+        rate_limit=100,
+        latency_slo=1,
+        slo_action="reject"
+    )
+    server = NotificationServer(config)
+    subscription = server.events.subscribe()
+    client = TestClient(server.app)
+
+    response = client.post("/notify", json={
+        "message": "This is a fairly long message that takes a while to speak"
+    })
+
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+    # Subscribers never see a rejected notification as accepted
+    assert [event["type"] for event in subscription.buffer] == ["rejected"]
+
+
+def test_adaptive_speech_rate(server):
+    """Test the speech rate rises with the backlog and stays bounded."""
+    assert server._effective_rate("normal") == server.config.speech_rate
+
+    for _ in range(3):
+        entry = PendingNotification(NotificationRequest(message="queued"))
+        server.dispatcher.queues["normal"].append(entry)
+
+    assert server._effective_rate("normal") == 180 + 3 * 15
+    assert server._effective_rate("high") == 180
+    assert server.metrics.gauges["speech_rate_applied"] == 180
+
+    for _ in range(20):
+        entry = PendingNotification(NotificationRequest(message="queued"))
+        server.dispatcher.queues["normal"].append(entry)
+
+    assert server._effective_rate("low") == server.config.speech_rate_max
+
+
+def test_metrics_endpoint(client):
+    """Test metrics expose queue depth and counters."""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["gauges"]["queue_depth"] == 0
+    assert "counters" in data
+
+
+@pytest.mark.asyncio
+async def test_compacted_speech_original_toast():
+    """Test speech is compacted while the visual toast keeps the original."""
+    server = NotificationServer(Config())
+    server._send_audio_notification = AsyncMock()
+    server._send_visual_notification = AsyncMock()
+    message = "Wrote /Users/me/project/build/report.csv"
+
+    await server._send_notification(NotificationRequest(message=message))
+
+    audio, visual = server._send_audio_notification, server._send_visual_notification
+    audio.assert_awaited_once_with("Wrote report.csv", "normal")
+    visual.assert_awaited_once_with(message, "normal")
+
+
+def test_notify_validation_error_shape(client):
+    """Test the fast ingest path reports errors like FastAPI does."""
+    response = client.post("/notify", json={"message": "Hi", "priority": "urgent"})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "priority"]
+
+    response = client.post(
+        "/notify",
+        content=b"{not json",
+        headers={"Content-Type": "application/json"}
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_routes_select_channels(tmp_path):
+    """Test routing rules pick channels and show up in delivered events."""
+    server = NotificationServer(Config(
+        history_file=str(tmp_path / "history.jsonl"),
+        routes=[
+            {"source": "*-debug", "channels": ["history"]},
+            {"priority": "high", "channels": ["audio", "visual"]},
+        ]
+    ))
+    server._send_audio_notification = AsyncMock()
+    server._send_visual_notification = AsyncMock()
+    subscription = server.events.subscribe()
+
+    debug = NotificationRequest(message="Cache warm", source="build-debug")
+    await server._send_notification(debug)
+    await server._send_notification(NotificationRequest(message="Up", priority="high"))
+
+    server._send_audio_notification.assert_awaited_once_with("Up", "high")
+    server._send_visual_notification.assert_awaited_once_with("Up", "high")
+    assert "Cache warm" in (tmp_path / "history.jsonl").read_text()
+
+    delivered = [event for event in subscription.buffer if event["type"] == "delivered"]
+    assert delivered[0]["channels"] == ["history"]
+    assert delivered[0]["route"] == 0
+    assert delivered[1]["route"] == 1
+
+    # Notifications that are not spoken take no time in the speech queue
+    assert server.dispatcher._estimate(debug) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_hung_speech_is_killed_and_fails_over():
+    """Test a hung backend times out, opens its circuit and is skipped."""
+    server = NotificationServer(Config(
+        speech_lock=False,
+        speech_timeout=0.2,
+        circuit_failure_threshold=1
+    ))
+    server.estimator.estimate = lambda message, rate: 0.0
+    commands = [("say", ["sleep", "30"]), ("fallback", ["true"])]
+
+    with patch.object(server, "_speech_commands", return_value=commands):
+        await server._send_audio_notification("Build done")
+        assert server.backends["say"].state == "open"
+
+        # The open circuit skips the hung backend without waiting
+        with patch.object(server, "_run_speech", wraps=server._run_speech) as run:
+            await server._send_audio_notification("Tests passed")
+        run.assert_awaited_once_with(["true"], 0.2)
+
+    assert server.metrics.counters["speech_fallbacks"] == 2
+    assert server.backends["fallback"].successes == 2
+
+
+@pytest.mark.asyncio
+async def test_speech_failure_falls_back_to_visual():
+    """Test notifications are shown visually when no speech backend works."""
+    server = NotificationServer(
+        Config(speech_lock=False, visual_notifications=False)
+    )
+    server._send_visual_notification = AsyncMock()
+    subscription = server.events.subscribe()
+
+    with patch.object(server, "_speech_commands", return_value=[("say", ["false"])]):
+        await server._send_notification(NotificationRequest(message="Deployed"))
+
+    server._send_visual_notification.assert_awaited_once_with("Deployed", "normal")
+    event = subscription.buffer[-1]
+    assert event["type"] == "delivered"
+    assert event["failover"] == "visual"
+
+
+@pytest.mark.asyncio
+async def test_speech_lock_timeout_does_not_speak(tmp_path, monkeypatch):
+    """Test a lock wait timeout shows the notification instead of speaking."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    server = NotificationServer(
+        Config(visual_notifications=False, speech_lock_wait=0.05)
+    )
+    server.speech_lock.acquire = AsyncMock(return_value=None)
+    server._send_visual_notification = AsyncMock()
+    server._run_speech = AsyncMock()
+
+    await server._send_notification(NotificationRequest(message="Deployed"))
+
+    server._run_speech.assert_not_awaited()
+    server._send_visual_notification.assert_awaited_once_with("Deployed", "normal")
+
+
+def test_shutdown_saves_and_startup_restores(tmp_path, monkeypatch):
+    """Test notifications left at shutdown are picked up by the next server."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config = Config(
+        speech_lock=False, drain_timeout=0, latency_slo=0, digest_enabled=False
+    )
+
+    async def slow_delivery(request):
+        await asyncio.sleep(1)
+
+    first = NotificationServer(config)
+    first.dispatcher.deliver = slow_delivery
+
+    with TestClient(first.app) as client:
+        ids = [
+            client.post("/notify", json={"message": f"step {i}"}).json()["id"]
+            for i in range(3)
+        ]
+    assert (tmp_path / ".llm-notify-mcp" / "run" / "pending.json").exists()
+
+    second = NotificationServer(config)
+    second.dispatcher.deliver = slow_delivery
+    with TestClient(second.app) as client:
+        states = [client.get(f"/notify/{i}").json()["state"] for i in ids[1:]]
+    assert set(states) <= {"queued", "speaking"}
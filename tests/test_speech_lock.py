@@ -0,0 +1,73 @@
+"""Tests for cross-process speech arbitration."""
+
+import json
+import os
+import time
+
+import pytest
+
+from llm_notify_mcp.speech_lock import SpeechLock
+
+
+@pytest.fixture
+def lock(tmp_path):
+    """Create a speech lock in a temporary directory."""
+    return SpeechLock(tmp_path, lease_timeout=5.0, poll_interval=0.01)
+
+
+@pytest.mark.asyncio
+async def test_acquire_and_release(lock):
+    """Test the lease is exclusive until released."""
+    token = await lock.acquire("normal")
+    assert token is not None
+
+    assert await lock.acquire("normal", timeout=0.05) is None
+
+    lock.release(token)
+    second = await lock.acquire("normal", timeout=0.05)
+    assert second is not None
+
+
+@pytest.mark.asyncio
+async def test_renew_extends_only_our_lease(lock, tmp_path):
+    """Test renewing covers long speech and fails once the lease is gone."""
+    token = await lock.acquire("normal")
+
+    assert lock.renew(token, 120.0)
+    lease = json.loads((tmp_path / "speech.lease").read_text())
+    assert lease["expires"] > time.time() + 100
+
+    lock.release(token)
+    assert not lock.renew(token, 120.0)
+
+
+@pytest.mark.asyncio
+async def test_recovers_lease_from_dead_process(lock, tmp_path):
+    """Test a lease left by a crashed holder is reclaimed."""
+    lease = {"pid": 2**22 + 1, "token": "stale", "expires": time.time() + 60}
+    (tmp_path / "speech.lease").write_text(json.dumps(lease))
+
+    assert await lock.acquire("normal", timeout=0.1) is not None
+
+
+@pytest.mark.asyncio
+async def test_recovers_expired_lease(lock, tmp_path):
+    """Test a lease held past its timeout is reclaimed."""
+    lease = {"pid": os.getpid(), "token": "hung", "expires": time.time() - 1}
+    (tmp_path / "speech.lease").write_text(json.dumps(lease))
+
+    assert await lock.acquire("normal", timeout=0.1) is not None
+
+
+@pytest.mark.asyncio
+async def test_yields_to_higher_priority_waiter(lock, tmp_path):
+    """Test a free lease goes to a waiting higher-priority holder first."""
+    waiters = tmp_path / "speech-waiters"
+    waiters.mkdir()
+    high = waiters / "other"
+    high.write_text(json.dumps({"pid": os.getpid(), "priority": "high"}))
+
+    assert await lock.acquire("low", timeout=0.05) is None
+
+    high.unlink()
+    assert await lock.acquire("low", timeout=0.05) is not None
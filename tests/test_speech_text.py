@@ -0,0 +1,74 @@
+"""Tests for speech text compaction."""
+
+from llm_notify_mcp.speech_text import SpeechTextPipeline
+
+
+def test_compacts_agent_tokens():
+    """Test paths, ids, hashes and identifiers are shortened."""
+    pipeline = SpeechTextPipeline()
+
+    assert pipeline.compact(
+        "Tests failed in /Users/me/project/src/server_utils.py"
+    ) == "Tests failed in server utils.py"
+    assert pipeline.compact(
+        "Job 123e4567-e89b-12d3-a456-426614174000 done"
+    ) == "Job an ID done"
+    assert pipeline.compact("Merged 3f9a2b7c1d") == "Merged hash"
+    assert pipeline.compact("Processed 1234567 rows") == "Processed 1.23 million rows"
+    assert pipeline.compact("Set maxRetryCount") == "Set max retry count"
+
+
+def test_compacts_whole_paths():
+    """Test relative and absolute paths are reduced to their basename."""
+    pipeline = SpeechTextPipeline()
+
+    assert pipeline.compact("Edited src/foo/bar.py") == "Edited bar.py"
+    assert pipeline.compact("Wrote /var/log/app/out.log") == "Wrote out.log"
+    assert pipeline.compact("Saved (~/proj/notes/a.md)") == "Saved (a.md)"
+
+
+def test_digit_runs_are_not_paths():
+    """Test dates and ratios with slashes are left alone."""
+    pipeline = SpeechTextPipeline()
+
+    assert pipeline.compact("Build done on 10/18/2026") == "Build done on 10/18/2026"
+    assert pipeline.compact("ratio 1/2/3 ok") == "ratio 1/2/3 ok"
+
+
+def test_dotted_numbers_are_kept():
+    """Test IP addresses and versions are not rounded as decimals."""
+    pipeline = SpeechTextPipeline()
+
+    assert pipeline.compact("IP 192.168.1.100 is down") == "IP 192.168.1.100 is down"
+    assert pipeline.compact("Upgraded to 3.12.100") == "Upgraded to 3.12.100"
+    assert pipeline.compact("Build 10.0.12345.1 ready") == "Build 10.0.12345.1 ready"
+    assert pipeline.compact("Took 1.23456 seconds.") == "Took 1.2 seconds."
+
+
+def test_plain_text_unchanged():
+    """Test ordinary sentences and short numbers pass through."""
+    pipeline = SpeechTextPipeline()
+    message = "Version 3.12 released with 42 fixes"
+
+    assert pipeline.compact(message) == message
+
+
+def test_rule_selection_and_replacements():
+    """Test rules can be limited and custom replacements added."""
+    pipeline = SpeechTextPipeline(
+        rules=["paths"], replacements={r"\bCI\b": "continuous integration"}
+    )
+
+    assert pipeline.compact("CI wrote /tmp/out/run_log.txt") == (
+        "continuous integration wrote run_log.txt"
+    )
+
+
+def test_results_are_memoized():
+    """Test repeated messages are served from the cache."""
+    pipeline = SpeechTextPipeline()
+
+    pipeline.compact("Build finished in /tmp/build/out")
+    pipeline.compact("Build finished in /tmp/build/out")
+
+    assert pipeline.compact.cache_info().hits == 1
@@ -0,0 +1,116 @@
+"""Tests for per-source usage statistics."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from llm_notify_mcp.config import Config
+from llm_notify_mcp.server import NotificationServer
+from llm_notify_mcp.stats import RollingWindow, SpaceSaving, UsageStats, format_stats
+
+
+def test_space_saving_keeps_heavy_hitters():
+    """Test memory stays bounded and a heavy source is never lost."""
+    summary = SpaceSaving(capacity=4)
+    for i in range(1000):
+        summary.record("noisy", rejected=False)
+        summary.record(f"agent-{i}", rejected=False)
+
+    assert len(summary.entries) == 4
+    noisy = summary.entries["noisy"]
+    # The reported count never underestimates, and error bounds the excess
+    assert noisy.count >= 1000
+    assert noisy.count - noisy.error <= 1000
+
+
+def test_speech_does_not_evict():
+    """Test speech time for an untracked source does not displace others."""
+    summary = SpaceSaving(capacity=1)
+    summary.record("ci", rejected=False)
+    summary.record_speech("other", 2.0)
+    assert list(summary.entries) == ["ci"]
+
+
+def test_rolling_window_expires_old_buckets():
+    """Test counts leave the window once their bucket is out of range."""
+    window = RollingWindow(width=1, size=60, capacity=8)
+    window.record("ci", rejected=False, now=1000.0)
+    window.record("ci", rejected=True, now=1030.0)
+    window.record_speech("ci", 1.5, now=1030.5)
+
+    snapshot = window.snapshot(now=1059.0, top=10)
+    assert snapshot["total"]["count"] == 2
+    assert snapshot["sources"][0]["rejection_rate"] == 0.5
+    assert snapshot["sources"][0]["speech_seconds"] == 1.5
+
+    snapshot = window.snapshot(now=1070.0, top=10)
+    assert snapshot["total"]["count"] == 1
+
+    # Reusing the first bucket's slot starts it from zero
+    window.record("deploy", rejected=False, now=1060.0)
+    snapshot = window.snapshot(now=1060.0, top=10)
+    assert [row["source"] for row in snapshot["sources"]] == ["ci", "deploy"]
+    assert snapshot["total"]["count"] == 2
+
+
+def test_usage_stats_top_and_other():
+    """Test sources beyond `top` are reported together as other."""
+    stats = UsageStats(capacity=8)
+    for _ in range(5):
+        stats.record("ci")
+    stats.record("deploy", rejected=True)
+    stats.record(None)
+
+    snapshot = stats.snapshot("1m", top=1)
+    window = snapshot["windows"]["1m"]
+    assert window["total"]["count"] == 7
+    assert window["sources"] == [{
+        "source": "ci",
+        "count": 5,
+        "rejected": 0,
+        "rejection_rate": 0.0,
+        "speech_seconds": 0.0,
+        "error": 0,
+    }]
+    assert window["other"]["count"] == 2
+    assert window["other"]["rejected"] == 1
+
+    assert set(stats.snapshot()["windows"]) == {"1m", "1h", "24h"}
+    assert "ci" in format_stats(snapshot)
+    with pytest.raises(ValueError):
+        stats.snapshot("1w")
+
+
+def test_stats_endpoint(tmp_path, monkeypatch):
+    """Test /stats reports accepted and rate-limited notifications per source."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config = Config(visual_notifications=False, speech_lock=False, rate_limit=2)
+    server = NotificationServer(config)
+    server.dispatcher.deliver = AsyncMock()
+    client = TestClient(server.app)
+
+    for _ in range(3):
+        client.post("/notify", json={"message": "Done", "source": "ci"})
+
+    response = client.get("/stats", params={"window": "1h"})
+    assert response.status_code == 200
+    (ci,) = response.json()["windows"]["1h"]["sources"]
+    assert ci["source"] == "ci"
+    assert ci["count"] == 3
+    assert ci["rejected"] == 1
+
+    assert client.get("/stats", params={"window": "1w"}).status_code == 400
+
+
+def test_stats_requires_auth(tmp_path, monkeypatch):
+    """Test /stats is protected by the auth token."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config = Config(
+        visual_notifications=False, speech_lock=False, auth_token="secret"
+    )
+    client = TestClient(NotificationServer(config).app)
+
+    assert client.get("/stats").status_code == 401
+    response = client.get("/stats", headers={"Authorization": "Bearer secret"})
+    assert response.status_code == 200
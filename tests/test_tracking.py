@@ -0,0 +1,43 @@
+"""Tests for delivery status tracking."""
+
+import asyncio
+
+import pytest
+
+from llm_notify_mcp.tracking import DELIVERED, QUEUED, DeliveryTracker
+
+
+def test_table_is_bounded():
+    """Test the oldest records are evicted once the table is full."""
+    tracker = DeliveryTracker(max_entries=2)
+
+    for notification_id in ("a", "b", "c"):
+        tracker.add(notification_id, "message", "normal", None)
+
+    assert tracker.get("a") is None
+    assert list(tracker.records) == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_wait_returns_on_final_state():
+    """Test a long-poll wakes as soon as delivery completes."""
+    tracker = DeliveryTracker()
+    tracker.add("a", "message", "normal", None)
+
+    waiter = asyncio.create_task(tracker.wait("a", timeout=5))
+    await asyncio.sleep(0)
+    tracker.update("a", DELIVERED)
+
+    record = await asyncio.wait_for(waiter, 1)
+    assert record["state"] == DELIVERED
+
+
+@pytest.mark.asyncio
+async def test_wait_times_out_with_current_state():
+    """Test a long-poll returns the current record when it times out."""
+    tracker = DeliveryTracker()
+    tracker.add("a", "message", "normal", None)
+
+    record = await tracker.wait("a", timeout=0.01)
+    assert record["state"] == QUEUED
+    assert await tracker.wait("missing", timeout=0.01) is None